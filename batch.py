@@ -0,0 +1,287 @@
+# batch.py
+import csv
+import json
+import logging
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from typing import Any, Iterable, Iterator, TextIO
+import evaluate
+from cache import ResultCache, result_key
+from sensitivity import OBJECTIVES
+
+"""
+This module evaluates streams of scenarios in bulk.
+
+Scenarios are JSON objects, one per line:
+    {"champion": "Ahri", "level": 18, "build": ["3089", "3020"], "metric": "dps"}
+    {"champion": "Ahri", "level": 18, "build": [], "metric": "duel", "opponent": {"champion": "Zed", "level": 18}}
+
+Metrics are `stats`, `build`, `duel` and the `sensitivity.OBJECTIVES` (`dps`, `ehp`, `ehp_magic`).
+Scenarios are read lazily and dispatched in chunks to a process pool with a bounded number of chunks in
+flight. Workers open the version with `evaluate.Snapshot.open`, memory-mapping its stat arrays instead of
+each parsing the champion and item data. Within a chunk, scenarios sharing a champion, level and build are grouped so the champion is set
+up once, and only if some of their results are not already in the result cache. Results are written in
+input order.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CSV_COLUMNS: tuple[str, ...] = ("index", "champion", "level", "build", "metric", "value", "result", "error")
+
+_snapshot: evaluate.Snapshot | None = None
+_cache: ResultCache | None = None
+
+def init_worker(version: str, cache_file: str | None = None) -> None:
+    """Open the snapshot (memory-mapping its stat arrays) and the result cache once per worker process."""
+    global _snapshot, _cache
+    _snapshot = evaluate.Snapshot.open(version)
+    _cache = ResultCache(cache_file) if cache_file else None
+
+def read_scenarios(stream: TextIO) -> Iterator[dict[str, Any]]:
+    """
+    Read scenarios from JSON lines, skipping blank lines. Invalid lines become scenarios with an `error`.
+
+    :param stream: The input stream (e.g. a file or `sys.stdin`).
+    :type stream: TextIO
+
+    :return: The scenarios, each with its input `index`.
+    :rtype: Iterator[dict[str, Any]]
+    """
+    index = 0
+    for line in stream:
+        if not line.strip():
+            continue
+
+        try:
+            scenario = json.loads(line)
+            if not isinstance(scenario, dict):
+                raise ValueError("Scenario must be a JSON object")
+        except ValueError as e:
+            scenario = {"error": f"Invalid scenario: {e}"}
+
+        scenario["index"] = index
+        index += 1
+        yield scenario
+
+def setup_key(scenario: dict[str, Any]) -> tuple[str, int, tuple[str, ...]]:
+    """Champion, level and build of a scenario, with the build in canonical order."""
+    build = scenario.get("build", ())
+    if not isinstance(build, (list, tuple)) or not all(isinstance(item, str) for item in build):
+        raise ValueError("Build must be a list of item IDs")
+
+    return (
+        str(scenario.get("champion", "")),
+        int(scenario.get("level", 1)),
+        tuple(evaluate.normalize_build(build))
+    )
+
+def evaluate_chunk(chunk: list[dict[str, Any]], snapshot: evaluate.Snapshot | None = None, cache: ResultCache | None = None) -> list[dict[str, Any]]:
+    """
+    Evaluate a chunk of scenarios, setting each champion, level and build up once.
+
+    :param chunk: The scenarios.
+    :type chunk: list[dict[str, Any]]
+
+    :param snapshot: The loaded game version (defaults to the worker's snapshot).
+    :type snapshot: evaluate.Snapshot | None, optional
+
+    :param cache: Result cache (defaults to the worker's cache, if any).
+    :type cache: ResultCache | None, optional
+
+    :return: The results, in the order of `chunk`.
+    :rtype: list[dict[str, Any]]
+    """
+    snapshot = snapshot or _snapshot
+    cache = cache or _cache
+    results: dict[int, dict[str, Any]] = {}
+    pending: dict[str, Any] = {} # Computed results, written to the cache in one commit per chunk
+
+    valid = []
+    for scenario in chunk:
+        try:
+            setup_key(scenario)
+            if "error" not in scenario:
+                valid.append(scenario)
+                continue
+            error = scenario["error"]
+        except (TypeError, ValueError) as e:
+            error = f"Invalid scenario: {e}"
+        results[scenario["index"]] = {"index": scenario["index"], "error": error}
+
+    for (champion, level, build), group in groupby(sorted(valid, key=setup_key), key=setup_key):
+        group = list(group)
+        try:
+            champ_id = snapshot.resolve(champion, "champion")
+            item_ids = evaluate.normalize_build(snapshot.resolve(item, "item") for item in build)
+        except KeyError as e:
+            for scenario in group:
+                results[scenario["index"]] = {"index": scenario["index"], "error": f"Unknown value: {e.args[0]}"}
+            continue
+
+        setup, columns = None, None
+        for scenario in group:
+            metric = scenario.get("metric", "dps")
+            result = {"index": scenario["index"], "champion": champ_id, "level": level, "build": item_ids, "metric": metric}
+            try:
+                opponent = evaluate.normalize_fighter(snapshot, scenario["opponent"]) if metric == "duel" else None
+                key = result_key(snapshot.version, metric, champ_id, level, item_ids, opponent, ranks=scenario.get("ranks"))
+                found, value = (key in pending, pending.get(key))
+                if not found and cache:
+                    found, value = cache.get(key)
+                if not found:
+                    if setup is None:
+                        setup = snapshot.champion(champ_id, level, item_ids)
+                        columns = evaluate.objective_columns(setup)
+                    value = evaluate_metric(snapshot, setup, columns, scenario)
+                    pending[key] = value
+                result.update(value)
+            except (KeyError, TypeError, ValueError) as e:
+                result["error"] = f"Failed to evaluate: {e}"
+            results[scenario["index"]] = result
+
+    if cache and pending:
+        cache.put_many((key, value, snapshot.version) for key, value in pending.items())
+
+    return [results[scenario["index"]] for scenario in chunk]
+
+def evaluate_metric(snapshot: evaluate.Snapshot, setup: Any, columns: dict[str, list[float]], scenario: dict[str, Any]) -> dict[str, Any]:
+    """
+    Evaluate the metric of one scenario on an already set up champion.
+
+    :return: The `value` (a scalar summary) and full `result` of the metric.
+    :rtype: dict[str, Any]
+    """
+    metric = scenario.get("metric", "dps")
+    if metric in OBJECTIVES:
+        return {"value": OBJECTIVES[metric](columns)[0]}
+
+    if metric == "stats":
+        return {"result": setup.as_dict()["stats"]}
+
+    if metric == "build":
+        result = evaluate.evaluate_build(snapshot, setup.name, setup.level, scenario.get("build", ()))
+        return {"value": result["gold_efficiency"], "result": result}
+
+    if metric == "duel":
+        opponent = scenario["opponent"]
+        opponent = {"champion": opponent} if isinstance(opponent, str) else opponent
+        first = {"champion": setup.name, "level": setup.level, "build": scenario.get("build", ()), "ranks": scenario.get("ranks", (0, 0, 0, 0))}
+        result = evaluate.duel(snapshot, first, opponent)
+        return {"value": result["winner"], "result": result}
+
+    raise ValueError(f"Unknown metric: {metric}")
+
+def log_cache() -> None:
+    """Log the hit and miss counts of this process's result cache."""
+    if _cache:
+        logging.info(f"Result cache: {_cache.info()}")
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Split an iterable into lists of up to `size` items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+def run(scenarios: Iterable[dict[str, Any]], version: str, processes: int | None = None, chunk_size: int = 1000, cache_file: str | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Evaluate scenarios across a process pool, keeping at most two chunks per worker in flight.
+
+    :param scenarios: The scenarios, e.g. from `read_scenarios`.
+    :type scenarios: Iterable[dict[str, Any]]
+
+    :param version: The game version.
+    :type version: str
+
+    :param processes: Number of worker processes; `1` evaluates in this process, `None` uses one per CPU (defaults to `None`).
+    :type processes: int | None, optional
+
+    :param chunk_size: Scenarios per chunk (defaults to `1000`).
+    :type chunk_size: int
+
+    :param cache_file: SQLite result cache shared by the workers, `None` to disable caching (defaults to `None`).
+    :type cache_file: str | None, optional
+
+    :return: The results, in input order.
+    :rtype: Iterator[dict[str, Any]]
+    """
+    chunks = chunked(scenarios, chunk_size)
+    evaluate.prepare(version) # Workers only open the shared files
+
+    if processes == 1:
+        init_worker(version, cache_file)
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk)
+        log_cache()
+        return
+
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(version, cache_file)) as executor:
+        in_flight = deque()
+        limit = 2 * processes
+
+        for chunk in chunks:
+            in_flight.append(executor.submit(evaluate_chunk, chunk))
+            if len(in_flight) >= limit:
+                yield from in_flight.popleft().result()
+
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def write_results(results: Iterable[dict[str, Any]], stream: TextIO, output_format: str = "jsonl") -> int:
+    """
+    Stream results to JSON lines or CSV.
+
+    :param results: The results.
+    :type results: Iterable[dict[str, Any]]
+
+    :param stream: The output stream.
+    :type stream: TextIO
+
+    :param output_format: `"jsonl"` or `"csv"`; CSV stores nested results as JSON (defaults to `"jsonl"`).
+    :type output_format: str
+
+    :return: The number of results written.
+    :rtype: int
+    """
+    count = 0
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            row = dict(result)
+            row["build"] = "|".join(row.get("build", []))
+            if "result" in row:
+                row["result"] = json.dumps(row["result"])
+            writer.writerow(row)
+            count += 1
+    else:
+        for result in results:
+            stream.write(json.dumps(result) + "\n")
+            count += 1
+
+    return count
+
+def run_file(version: str, input_path: str = "-", output_path: str = "-", output_format: str = "jsonl", processes: int | None = None, chunk_size: int = 1000, cache_file: str | None = None) -> int:
+    """
+    Evaluate a scenario file (or stdin) and write the results to a file (or stdout).
+
+    :return: The number of results written.
+    :rtype: int
+    """
+    input_stream = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+    output_stream = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8", newline="")
+
+    try:
+        results = run(read_scenarios(input_stream), version, processes, chunk_size, cache_file)
+        count = write_results(results, output_stream, output_format)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    logging.info(f"Evaluated {count} scenarios (version {version}).")
+    return count
@@ -0,0 +1,246 @@
+# cache.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+import store
+from constants import RESULT_CACHE_FILE, RESULT_CACHE_SIZE
+
+"""
+This module caches evaluation results in two tiers: an in-process LRU and a SQLite file on disk.
+
+Results are keyed by a hash of the game version, the formula code version, the operation and its inputs
+(with builds reduced to their sorted, distinct item IDs). A new patch or any change to the modules in
+`CODE_MODULES` therefore yields new keys, so stale results are never returned; `prune` removes them.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Modules whose source determines evaluation results
+CODE_MODULES: tuple[str, ...] = ("formulas", "models", "recipes", "sensitivity", "spells", "tables", "teamfight", "evaluate", "batch")
+
+def code_version(modules: Iterable[str] = CODE_MODULES) -> str:
+    """
+    Hash the source of the modules evaluation results depend on.
+
+    :param modules: Module names, resolved next to this file (defaults to `CODE_MODULES`).
+    :type modules: Iterable[str]
+
+    :return: The SHA-256 hex digest.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in modules:
+        digest.update(module.encode("utf-8"))
+        with open(os.path.join(directory, f"{module}.py"), "rb") as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+CODE_VERSION: str = code_version()
+
+def result_key(version: str, operation: str, champion: str, level: int, build: Iterable[str] = (), opponent: Any = None, **params) -> str:
+    """
+    Canonical key of an evaluation.
+
+    :param version: The game version.
+    :type version: str
+
+    :param operation: The evaluation, e.g. `"stats"`, `"build"`, `"dps"` or `"duel"`.
+    :type operation: str
+
+    :param champion: The champion ID.
+    :type champion: str
+
+    :param level: The champion level.
+    :type level: int
+
+    :param build: Item IDs; order and duplicates are ignored (defaults to none).
+    :type build: Iterable[str]
+
+    :param opponent: JSON-compatible description of the opponent, if any (defaults to `None`).
+    :type opponent: Any
+
+    :param params: Any other JSON-compatible inputs.
+
+    :return: The key.
+    :rtype: str
+    """
+    return store.record_hash({
+        "version": version,
+        "code": CODE_VERSION,
+        "operation": operation,
+        "champion": champion,
+        "level": int(level),
+        "build": sorted(set(build)),
+        "opponent": opponent,
+        "params": params,
+    })
+
+class ResultCache:
+    """Thread-safe two-tier result cache with hit and miss counters."""
+
+    def __init__(self, filename: str | None = RESULT_CACHE_FILE, size: int = RESULT_CACHE_SIZE):
+        """
+        :param filename: SQLite file of the disk tier, `None` for memory only (defaults to `RESULT_CACHE_FILE`).
+        :type filename: str | None, optional
+
+        :param size: Maximum entries in the memory tier (defaults to `RESULT_CACHE_SIZE`).
+        :type size: int
+        """
+        self.size = size
+        self.memory: OrderedDict[str, Any] = OrderedDict()
+        self.stats: dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._db = None
+
+        if filename:
+            try:
+                self._db = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL") # Concurrent readers alongside one writer (e.g. batch workers)
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, version TEXT, code TEXT, value TEXT)")
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to open result cache {filename}, using memory only: {e}")
+                self._db = None
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a result, promoting disk hits to the memory tier.
+
+        :param key: The key (see `result_key`).
+        :type key: str
+
+        :return: Whether the key was found, and its value.
+        :rtype: tuple[bool, Any]
+        """
+        with self._lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return True, self.memory[key]
+
+            row = None
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error as e:
+                    logging.error(f"Failed to read result cache: {e}")
+
+            if row is None:
+                self.stats["misses"] += 1
+                return False, None
+
+            value = json.loads(row[0])
+            self.stats["disk_hits"] += 1
+            self._remember(key, value)
+            return True, value
+
+    def put(self, key: str, value: Any, version: str = "") -> None:
+        """
+        Store a JSON-compatible result in both tiers.
+
+        :param key: The key (see `result_key`).
+        :type key: str
+
+        :param value: The result.
+        :type value: Any
+
+        :param version: The game version, recorded for `prune` (defaults to `""`).
+        :type version: str
+        """
+        self.put_many([(key, value, version)])
+
+    def put_many(self, entries: Iterable[tuple[str, Any, str]]) -> None:
+        """
+        Store several JSON-compatible results in both tiers, with one disk commit.
+
+        :param entries: The key, result and game version of each entry (see `put`).
+        :type entries: Iterable[tuple[str, Any, str]]
+        """
+        entries = list(entries)
+        with self._lock:
+            for key, value, _ in entries:
+                self._remember(key, value)
+            if self._db is None or not entries:
+                return
+
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    [(key, version, CODE_VERSION, json.dumps(value)) for key, value, version in entries]
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.error(f"Failed to write result cache: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], version: str = "") -> Any:
+        """
+        Return a cached result, computing and storing it on a miss.
+
+        :param key: The key (see `result_key`).
+        :type key: str
+
+        :param compute: Computes the result.
+        :type compute: Callable[[], Any]
+
+        :param version: The game version, recorded for `prune` (defaults to `""`).
+        :type version: str
+
+        :return: The result.
+        :rtype: Any
+        """
+        found, value = self.get(key)
+        if not found:
+            value = compute()
+            self.put(key, value, version)
+        return value
+
+    def prune(self, keep_versions: Iterable[str] = ()) -> int:
+        """
+        Delete disk results from older formula code, and from versions not in `keep_versions` if given.
+
+        :param keep_versions: Game versions to keep (defaults to all).
+        :type keep_versions: Iterable[str]
+
+        :return: The number of deleted results.
+        :rtype: int
+        """
+        keep_versions = list(keep_versions)
+        with self._lock:
+            self.memory.clear()
+            if self._db is None:
+                return 0
+
+            query, params = "DELETE FROM results WHERE code != ?", [CODE_VERSION]
+            if keep_versions:
+                query += f" OR version NOT IN ({', '.join('?' * len(keep_versions))})"
+                params += keep_versions
+
+            deleted = self._db.execute(query, params).rowcount
+            self._db.commit()
+            return deleted
+
+    def info(self) -> dict[str, Any]:
+        """Hit and miss counts, hit rate and memory tier size."""
+        with self._lock:
+            lookups = sum(self.stats.values())
+            hits = lookups - self.stats["misses"]
+            return {**self.stats, "hit_rate": hits / lookups if lookups else 0.0, "size": len(self.memory)}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, value: Any) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
@@ -1,16 +1,47 @@
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
+import manifest
+import projection
+import spells
+import store
 import utils
 import logging
-from constants import LINKS
+from constants import CHECKPOINTS, FETCH_WORKERS, FILES, LINKS
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+DDRAGON_CHAMPS_PROJECTION = projection.compile_projection({
+    "fields": {
+        "key": ("key", ""),
+        "name": ("name", ""),
+        "partype": ("partype", ""),
+        "stats": ("stats", {})
+    }
+})
+
+CDRAGON_RECORDS_STATS_PROJECTION = projection.compile_projection({
+    "fields": {
+        "rangeidentity": ("purchaseIdentities", []),
+        "attackspeedratio": ("attackSpeedRatio", 0)
+    }
+})
+
+CDRAGON_RECORDS_SPELLS_PROJECTION = projection.compile_projection({
+    "fields": {
+        "spellNames": ("spellNames", []),
+        "mAbilities": ("mAbilities", [])
+    }
+})
+
 def fetch_ddragon_champs(version: str, value: Any = None) -> dict[str, Any]:
     """
     TODO
     """
     url = LINKS["ddragon_champs"].format(version)
-    champ_data = utils.fetch_json(url)
+    champ_data = utils.fetch_json(url, priority="list")
 
     if not champ_data or champ_data.get("version") != version or "data" not in champ_data:
         logging.warning(f"Failed to fetch Data Dragon champion data (version {version}).")
@@ -31,22 +62,14 @@ def clean_ddragon_champs(ddragon: dict[str, Any]) -> dict[str, Any]:
         logging.warning("Unexpected format in champion data.")
         return {}
     
-    return {
-        name: {
-            "key": subdata.get("key", ""),
-            "name": subdata.get("name", ""),
-            "partype": subdata.get("partype", ""),
-            "stats": subdata.get("stats", {})
-        }
-        for name, subdata in ddragon.items()
-    }
+    return dict(projection.project_records(DDRAGON_CHAMPS_PROJECTION, ddragon.items()))
 
 def fetch_ddragon_champ(version: str, champ_name: str, value: Any = None) -> dict[str, Any]:
     """
     TODO
     """
     url = LINKS["ddragon_champ"].format(version, champ_name)
-    champ_data = utils.fetch_json(url)
+    champ_data = utils.fetch_json(url, priority="bulk")
 
     if not champ_data or champ_data.get("version") != version or "data" not in champ_data:
         logging.warning(f"Failed to fetch Data Dragon data for {champ_name} (version {version}).")
@@ -81,7 +104,7 @@ def fetch_cdragon_champ(version: str, champ_name: str, value: Any = None) -> dic
     TODO
     """
     url = LINKS["cdragon_champ"].format(version[:-2], champ_name.lower(), champ_name.lower())
-    champ_data = utils.fetch_json(url)
+    champ_data = utils.fetch_json(url, priority="bulk")
 
     if not champ_data:
         logging.warning(f"Failed to fetch Community Dragon data for {champ_name} (version {version}).")
@@ -95,17 +118,11 @@ def clean_cdragon_champ(cdragon: dict[str, Any], champ_name: str) -> tuple[dict[
     """
     if not cdragon or not isinstance(cdragon, dict):
         logging.warning("Invalid or empty Community Dragon data received.")
-        return {}, {}
+        return {}, {}, {}
     
     records = cdragon.get(f"Characters/{champ_name}/CharacterRecords/Root", {})
-    records_stats = {
-        "rangeidentity": records.get("purchaseIdentities", []),
-        "attackspeedratio": records.get("attackSpeedRatio", 0)
-    }
-    records_spells = {
-        "spellNames": records.get("spellNames", []),
-        "mAbilities": records.get("mAbilities", [])
-    }
+    records_stats = CDRAGON_RECORDS_STATS_PROJECTION(records)
+    records_spells = CDRAGON_RECORDS_SPELLS_PROJECTION(records)
 
     spells = {
         spell_name.split("Spells/")[1]: subdata
@@ -115,60 +132,231 @@ def clean_cdragon_champ(cdragon: dict[str, Any], champ_name: str) -> tuple[dict[
 
     return records_stats, records_spells, spells
 
-def merge_champs(version: str, ddragon: dict[str, Any]) -> dict[str, Any]:
+def merge_champ(version: str, ddragon_id: str, ddragon_subdata: dict[str, Any]) -> dict[str, Any] | None:
     """
-    TODO
+    Fetch and merge the Data Dragon and Community Dragon data of one champion.
+
+    :param version: The game version.
+    :type version: str
+
+    :param ddragon_id: The champion ID.
+    :type ddragon_id: str
+
+    :param ddragon_subdata: The champion's cleaned Data Dragon summary.
+    :type ddragon_subdata: dict[str, Any]
+
+    :return: The merged champion data if both sources were fetched, otherwise `None`.
+    :rtype: dict[str, Any] | None
+    """
+    ddragon_champ = fetch_ddragon_champ(version, ddragon_id, {})
+    cdragon_champ = fetch_cdragon_champ(version, ddragon_id, {})
+    if not ddragon_champ or not cdragon_champ:
+        logging.warning(f"Failed merging data for: {ddragon_id}")
+        return None
+
+    ddragon_spells = clean_ddragon_champ(ddragon_champ)
+    cdragon_records_stats, cdragon_records_spells, cdragon_spells = clean_cdragon_champ(cdragon_champ, ddragon_id)
+
+    ddragon_subdata["rangeidentity"] = cdragon_records_stats.get("rangeidentity", [])
+    ddragon_subdata["stats"]["attackspeedratio"] = cdragon_records_stats.get("attackspeedratio", 0)
+
+    logging.info(f"Complete merging data for: {ddragon_id}")
+    return {
+        "records_ddragon": ddragon_subdata,
+        "spells_ddragon": ddragon_spells,
+        "records_cdragon": cdragon_records_spells,
+        "spells_cdragon": cdragon_spells
+    }
+
+def read_checkpoints(version: str) -> dict[str, Any]:
+    """
+    Read the checkpoint manifest of a version's ingestion.
+
+    :param version: The game version.
+    :type version: str
+
+    :return: The manifest, with the `status` (`"done"` or `"failed"`) and `attempts` of each champion.
+    :rtype: dict[str, Any]
+    """
+    filename = CHECKPOINTS["manifest"].format(version)
+    checkpoints = utils.read_json(filename) if os.path.exists(filename) else None
+    if not isinstance(checkpoints, dict) or not isinstance(checkpoints.get("champions"), dict):
+        return {"version": version, "champions": {}}
+    return checkpoints
+
+def checkpoint_champs(version: str, ddragon: dict[str, Any], retry_failed: bool = True) -> dict[str, Any]:
+    """
+    Fetch and merge champions concurrently, durably checkpointing each one as it completes.
+    Champions already checkpointed are skipped, so an interrupted ingestion resumes where it stopped.
+
+    :param version: The game version.
+    :type version: str
+
+    :param ddragon: Cleaned Data Dragon champion summaries by ID.
+    :type ddragon: dict[str, Any]
+
+    :param retry_failed: Fetch champions that failed in a previous run again (defaults to `True`).
+    :type retry_failed: bool, optional
+
+    :return: The checkpoint manifest (see `read_checkpoints`).
+    :rtype: dict[str, Any]
+    """
+    os.makedirs(CHECKPOINTS["directory"].format(version), exist_ok=True)
+    checkpoints = read_checkpoints(version)
+    entries = checkpoints["champions"]
+
+    pending = []
+    for ddragon_id in ddragon:
+        entry = entries.get(ddragon_id, {})
+        if entry.get("status") == "done" and os.path.exists(CHECKPOINTS["champ"].format(version, ddragon_id)):
+            continue
+        if entry.get("status") == "failed" and not retry_failed:
+            continue
+        pending.append(ddragon_id)
+
+    if len(pending) < len(ddragon):
+        logging.info(f"Resuming champion ingestion: {len(ddragon) - len(pending)} checkpointed, {len(pending)} to fetch (version {version}).")
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fetch") as executor:
+        futures = {executor.submit(merge_champ, version, ddragon_id, ddragon[ddragon_id]): ddragon_id for ddragon_id in pending}
+        for future in as_completed(futures):
+            ddragon_id = futures[future]
+            champ = future.result()
+            status = "failed"
+            if champ is not None and utils.write_json(CHECKPOINTS["champ"].format(version, ddragon_id), champ, atomic=True):
+                status = "done"
+
+            entries[ddragon_id] = {"status": status, "attempts": entries.get(ddragon_id, {}).get("attempts", 0) + 1, "time": time.time()}
+            utils.write_json(CHECKPOINTS["manifest"].format(version), checkpoints, atomic=True)
+
+    return checkpoints
+
+def merge_champs(version: str, ddragon: dict[str, Any], retry_failed: bool = True) -> tuple[dict[str, Any], list[str]]:
+    """
+    Fetch and merge every champion, resuming from and checkpointing to `CHECKPOINTS`.
+
+    :param version: The game version.
+    :type version: str
+
+    :param ddragon: Cleaned Data Dragon champion summaries by ID.
+    :type ddragon: dict[str, Any]
+
+    :param retry_failed: Fetch champions that failed in a previous run again (defaults to `True`).
+    :type retry_failed: bool, optional
+
+    :return: The merged champion data by ID, and the IDs of champions that failed.
+    :rtype: tuple[dict[str, Any], list[str]]
     """
     if not isinstance(ddragon, dict):
         logging.warning("Invalid or empty Data Dragon data received.")
-        return {}
+        return {}, []
     
-    champ_data = {}
-    for ddragon_id, ddragon_subdata in ddragon.items():
-        ddragon_champ = fetch_ddragon_champ(version, ddragon_id, {})
-        ddragon_spells = clean_ddragon_champ(ddragon_champ)
-
-        cdragon_champ = fetch_cdragon_champ(version, ddragon_id, {})
-        cdragon_records_stats, cdragon_records_spells, cdragon_spells = clean_cdragon_champ(cdragon_champ, ddragon_id)
-
-        ddragon_subdata["rangeidentity"] = cdragon_records_stats.get("rangeidentity", [])
-        ddragon_subdata["stats"]["attackspeedratio"] = cdragon_records_stats.get("attackspeedratio", 0)
-
-        champ_data[ddragon_id] = {
-            "records_ddragon": ddragon_subdata,
-            "spells_ddragon": ddragon_spells,
-            "records_cdragon": cdragon_records_spells,
-            "spells_cdragon": cdragon_spells
-        }
-        logging.info(f"Complete merging data for: {ddragon_id}")
+    entries = checkpoint_champs(version, ddragon, retry_failed)["champions"]
+
+    champ_data, failed = {}, []
+    for ddragon_id in ddragon:
+        champ = None
+        if entries.get(ddragon_id, {}).get("status") == "done":
+            champ = utils.read_json(CHECKPOINTS["champ"].format(version, ddragon_id))
+        if champ is None:
+            failed.append(ddragon_id)
+            continue
+        champ_data[ddragon_id] = champ
+
+    return champ_data, failed
     
+def read_champs(filename: str, version: str, compact: bool = False) -> dict[str, Any]:
+    """
+    Read champion data from the record store, or from a full data file written before the store was primary,
+    moving that data into the store.
+
+    :param filename: The legacy champion data file.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param compact: Load with interned keys and shared read-only values, see `utils.read_json` (defaults to `False`).
+    :type compact: bool
+
+    :return: The champion data if valid (including data missing champions that failed to fetch),
+        otherwise an empty dictionary.
+    :rtype: dict[str, Any]
+    """
+    champ_data = store.read_version("champ", version, "champ_data", compact, partial=True)
+    if champ_data is None:
+        champ_data = manifest.read_artifact(version, "champ_data", filename, {}, compact=compact)
+        if champ_data and store.write_version("champ", version, "champ_data", champ_data):
+            logging.info(f"Moved champion data to the record store, {filename} is no longer used (version {version}).")
     return champ_data
-    
-def check_champs(filename: str, version: str, update: bool = False) -> dict[str, Any]:
+
+def check_champs(filename: str, version: str, update: bool = False, compact: bool = False, retry_failed: bool = False) -> dict[str, Any]:
     """
-    TODO
+    Read champion data, fetching it if missing. Fetching checkpoints each champion, so an interrupted run
+    resumes with only the missing champions; champions that failed are listed in the checkpoint manifest.
+    The spell table and champion list are rebuilt whenever the champion data is written.
+
+    :param filename: The legacy champion data file, read if the version is not in the record store yet.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param update: Fetch every champion again, discarding checkpoints (defaults to `False`).
+    :type update: bool
+
+    :param compact: Load with interned keys and shared read-only values, see `utils.read_json` (defaults to `False`).
+    :type compact: bool
+
+    :param retry_failed: Fetch only the champions that failed in the last run and add them (defaults to `False`).
+    :type retry_failed: bool
+
+    :return: The champion data.
+    :rtype: dict[str, Any]
     """
-    champ_data = utils.read_json(filename, {})
+    champ_data = read_champs(filename, version, compact) if not update else {}
+    failed = [
+        champ_id for champ_id, entry in read_checkpoints(version)["champions"].items()
+        if entry.get("status") == "failed"
+    ]
 
-    if not champ_data or update:
+    if not champ_data or (retry_failed and failed):
         logging.error(f"Fetching champ data for version {version}")
+        if update:
+            shutil.rmtree(CHECKPOINTS["directory"].format(version), ignore_errors=True)
+
         ddragon = fetch_ddragon_champs(version, {})
         ddragon = clean_ddragon_champs(ddragon)
+        if not ddragon:
+            return champ_data
 
-        champ_data = merge_champs(version, ddragon)
-        utils.write_json(filename, champ_data)
+        champ_data, failed = merge_champs(version, ddragon)
+        if not champ_data:
+            return {}
+
+        store.write_version("champ", version, "champ_data", champ_data, complete=not failed)
+        spells.check_spell_table(FILES["spell_table"].format(version), version, champ_data, update=True)
+        check_champ_list(FILES["champ_list"].format(version), filename, version, update=True, champ_data=champ_data)
+
+        if failed:
+            logging.warning(f"Failed to fetch {len(failed)} champions, retry with `retry_failed` (version {version}): {', '.join(failed)}")
+        else:
+            shutil.rmtree(CHECKPOINTS["directory"].format(version), ignore_errors=True)
     
     return champ_data
 
-def check_champ_list(filename_list: str, filename_data: str, version: str, update: bool = False) -> dict[str, Any]:
+def check_champ_list(filename_list: str, filename_data: str, version: str, update: bool = False, champ_data: dict[str, Any] | None = None) -> dict[str, Any]:
     """
     TODO
+
+    :param champ_data: Champion data already loaded, used instead of reading `filename_data` (defaults to `None`).
+    :type champ_data: dict[str, Any] | None, optional
     """
-    champ_list = utils.read_json(filename_list, {})
+    champ_list = manifest.read_artifact(version, "champ_list", filename_list, {}) if not update else {}
 
-    if not champ_list or update:
+    if not champ_list:
         logging.info(f"Fetching champ list (version {version}).")
-        champ_list = utils.read_json(filename_data, {})
+        champ_list = champ_data if champ_data is not None else read_champs(filename_data, version)
         champ_list = {
             champ_id: subdata.get("records_ddragon", {}).get("name", "")
             for champ_id, subdata in champ_list.items()
@@ -176,6 +364,6 @@ def check_champ_list(filename_list: str, filename_data: str, version: str, updat
         if not champ_list:
             logging.warning(f"Invalid or empty data received from {filename_data}.")
             return {}
-        utils.write_json(filename_list, champ_list)
+        manifest.write_artifact(version, "champ_list", filename_list, champ_list)
     
     return champ_list
\ No newline at end of file
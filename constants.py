@@ -19,9 +19,66 @@ FILES: dict[str, str] = {
     "item_data": "{}_Item_Data.json",
     "item_list": "{}_Item_List.json",
     "champ_data": "{}_Champ_Data.json",
-    "champ_list": "{}_Champ_list.json"
+    "champ_list": "{}_Champ_list.json",
+    "name_index": "{}_Name_Index.json",
+    "stat_arrays": "{}_Stat_Arrays.bin",
+    "spell_table": "{}_Spell_Table.json",
+    "manifest": "{}_Manifest.json"
 }
 
+# Version of the shape of the data files; files written under another schema are fetched again
+SCHEMA_VERSION: int = 1
+
+# Version of the recipe values derived from item data (e.g. stat gold values); stored item data and stat
+# arrays derived under another version are recomputed without fetching
+RECIPE_VERSION: int = 2
+
+# Resolved game version cache (seconds before a cached version is considered stale)
+VERSION_CACHE_FILE: str = "Version_Cache.json"
+VERSION_CACHE_TTL: int = 6 * 60 * 60
+
+# Content-addressed record store shared by all versions
+STORE: dict[str, str] = {
+    "objects": "Store/objects",
+    "manifest": "Store/{}_{}_Manifest.json" # version, kind
+}
+
+# Request scheduling per host: token bucket rate (requests per second) and burst, adaptive concurrency
+# bounds, the latency above which concurrency is reduced (seconds) and retries of throttled requests
+HOST_LIMITS: dict[str, float] = {
+    "rate": 50.0,
+    "burst": 50,
+    "initial_concurrency": 4,
+    "min_concurrency": 1,
+    "max_concurrency": 32,
+    "target_latency": 2.0,
+    "retries": 3
+}
+
+# Request priority classes, lowest value first
+PRIORITIES: dict[str, int] = {
+    "version": 0,
+    "list": 1,
+    "bulk": 2
+}
+
+# Threads fetching per-champion data
+FETCH_WORKERS: int = 16
+
+# Per-champion checkpoints of an ingestion in progress
+CHECKPOINTS: dict[str, str] = {
+    "directory": "Checkpoints/{}_Champs", # version
+    "champ": "Checkpoints/{}_Champs/{}.json", # version, champ_id
+    "manifest": "Checkpoints/{}_Champs/Manifest.json" # version
+}
+
+# Evaluation result cache (in-memory entries; on-disk results are keyed by version and formula code)
+RESULT_CACHE_FILE: str = "Result_Cache.sqlite"
+RESULT_CACHE_SIZE: int = 4096
+
+# Query service: seconds an idle keep-alive connection may hold a worker thread
+SERVER_IDLE_TIMEOUT: float = 5.0
+
 # Mapping for filtering or renaming item stats (with special cases noted)
 STAT_MAP: dict[str, str] = {
     "MoveSpeed": "mFlatMovementSpeedMod",
@@ -0,0 +1,227 @@
+# diff.py
+import hashlib
+import logging
+from collections.abc import Mapping
+from typing import Any
+import store
+
+"""
+This module reports structural differences between two snapshots of champion or item data.
+
+Every compared subtree is summarized by a hash of its children's hashes, computed once per subtree (and
+once for subtrees shared by compact loading), so unchanged branches (most of the bulky Community Dragon
+spell data) are skipped after a single comparison and the work beyond hashing is proportional to the
+changes. When both versions are in the content-addressed store, unchanged records are skipped by their
+stored hash without being loaded.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Subtrees compared for each record kind
+CHAMP_SCOPES: tuple[tuple[str, ...], ...] = (
+    ("records_ddragon", "stats"),
+    ("spells_cdragon",)
+)
+ITEM_SCOPES: tuple[tuple[str, ...], ...] = (
+    ("stats",),
+    ("mDataValues",),
+    ("mItemCalculations",)
+)
+
+MISSING = object()
+
+SEQUENCES: tuple[type, ...] = (list, tuple)
+
+def subtree_hash(node: Any, memo: dict[int, bytes]) -> bytes:
+    """
+    Hash a JSON subtree from the hashes of its children. Tuples hash as lists and any mapping as a
+    dictionary, so compact data (see `utils.read_json`) hashes as plain data.
+
+    :param node: JSON-compatible data.
+    :type node: Any
+
+    :param memo: Hashes already computed, keyed by `id` of mappings and sequences.
+    :type memo: dict[int, bytes]
+
+    :return: The subtree hash, or the encoded value of a leaf.
+    :rtype: bytes
+    """
+    if not isinstance(node, (Mapping, *SEQUENCES)):
+        return repr(node).encode("utf-8")
+
+    if id(node) not in memo:
+        if isinstance(node, Mapping):
+            kind = b"d"
+            children = [part for key in sorted(node) for part in (repr(key).encode("utf-8"), subtree_hash(node[key], memo))]
+        else:
+            kind = b"l"
+            children = [subtree_hash(child, memo) for child in node]
+        # Children are length-prefixed so that adjacent ones cannot run together
+        encoded = b"".join(len(child).to_bytes(4, "little") + child for child in children)
+        memo[id(node)] = b"#" + hashlib.blake2b(kind + encoded, digest_size=16).digest() # No value's `repr` starts with "#"
+    return memo[id(node)]
+
+def diff_tree(old: Any, new: Any, path: tuple, changes: list[dict[str, Any]], memo: dict[int, bytes]) -> None:
+    """
+    Append the differences between two subtrees to `changes`, skipping branches with equal hashes.
+
+    :param old: The old subtree (`MISSING` if absent).
+    :type old: Any
+
+    :param new: The new subtree (`MISSING` if absent).
+    :type new: Any
+
+    :param path: The keys and indices leading to this subtree.
+    :type path: tuple
+
+    :param changes: The list to append changes to.
+    :type changes: list[dict[str, Any]]
+
+    :param memo: Subtree hashes shared across the comparison.
+    :type memo: dict[int, bytes]
+    """
+    if old is MISSING or new is MISSING:
+        changes.append({
+            "path": list(path),
+            "change": "added" if old is MISSING else "removed",
+            "old": None if old is MISSING else old,
+            "new": None if new is MISSING else new
+        })
+        return
+
+    if old is new:
+        return
+
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        if subtree_hash(old, memo) == subtree_hash(new, memo):
+            return
+        for key in sorted(old.keys() | new.keys()):
+            diff_tree(old.get(key, MISSING), new.get(key, MISSING), path + (key,), changes, memo)
+        return
+
+    if isinstance(old, SEQUENCES) and isinstance(new, SEQUENCES) and len(old) == len(new):
+        if subtree_hash(old, memo) == subtree_hash(new, memo):
+            return
+        for index, (old_child, new_child) in enumerate(zip(old, new)):
+            diff_tree(old_child, new_child, path + (index,), changes, memo)
+        return
+
+    # Values (e.g. 1 and 1.0), or sequences of different lengths
+    if old == new:
+        return
+
+    changes.append({"path": list(path), "change": "changed", "old": old, "new": new})
+
+def get_path(record: Any, path: tuple[str, ...]) -> Any:
+    """Follow `path` into a record, returning `MISSING` if any key is absent."""
+    for key in path:
+        if not isinstance(record, Mapping) or key not in record:
+            return MISSING
+        record = record[key]
+    return record
+
+def diff_records(old: dict[str, Any], new: dict[str, Any], scopes: tuple[tuple[str, ...], ...], memo: dict[int, bytes] | None = None) -> list[dict[str, Any]]:
+    """
+    Report the differences between two versions of one champion or item record.
+
+    :param old: The old record.
+    :type old: dict[str, Any]
+
+    :param new: The new record.
+    :type new: dict[str, Any]
+
+    :param scopes: Paths of the subtrees to compare (e.g. `CHAMP_SCOPES` or `ITEM_SCOPES`).
+    :type scopes: tuple[tuple[str, ...], ...]
+
+    :param memo: Subtree hashes shared across comparisons (defaults to `None`).
+    :type memo: dict[int, bytes] | None, optional
+
+    :return: Changes with `path`, `change` (`"added"`, `"removed"` or `"changed"`), `old` and `new`.
+    :rtype: list[dict[str, Any]]
+    """
+    memo = {} if memo is None else memo
+    changes: list[dict[str, Any]] = []
+    for scope in scopes:
+        old_scope, new_scope = get_path(old, scope), get_path(new, scope)
+        if old_scope is MISSING and new_scope is MISSING:
+            continue
+        diff_tree(old_scope, new_scope, scope, changes, memo)
+
+    return changes
+
+def diff_data(old_data: dict[str, Any], new_data: dict[str, Any], scopes: tuple[tuple[str, ...], ...], old_hashes: dict[str, str] | None = None, new_hashes: dict[str, str] | None = None) -> dict[str, Any]:
+    """
+    Report the differences between two snapshots of champion or item data.
+
+    :param old_data: The old snapshot (ID -> record).
+    :type old_data: dict[str, Any]
+
+    :param new_data: The new snapshot (ID -> record).
+    :type new_data: dict[str, Any]
+
+    :param scopes: Paths of the subtrees to compare (e.g. `CHAMP_SCOPES` or `ITEM_SCOPES`).
+    :type scopes: tuple[tuple[str, ...], ...]
+
+    :param old_hashes: Known record hashes of the old snapshot, used to skip identical records (defaults to `None`).
+    :type old_hashes: dict[str, str] | None, optional
+
+    :param new_hashes: Known record hashes of the new snapshot, used to skip identical records (defaults to `None`).
+    :type new_hashes: dict[str, str] | None, optional
+
+    :return: The `added` and `removed` IDs, and the `changed` records with their changes.
+    :rtype: dict[str, Any]
+    """
+    old_hashes, new_hashes = old_hashes or {}, new_hashes or {}
+    memo: dict[int, bytes] = {} # Subtrees shared between records (e.g. by compact loading) are hashed once
+
+    changed = {}
+    for record_id in old_data.keys() & new_data.keys():
+        if record_id in old_hashes and old_hashes[record_id] == new_hashes.get(record_id):
+            continue
+
+        changes = diff_records(old_data[record_id], new_data[record_id], scopes, memo)
+        if changes:
+            changed[record_id] = changes
+
+    return {
+        "added": sorted(new_data.keys() - old_data.keys()),
+        "removed": sorted(old_data.keys() - new_data.keys()),
+        "changed": changed
+    }
+
+def diff_versions(kind: str, old_version: str, new_version: str) -> dict[str, Any]:
+    """
+    Report the differences between two stored game versions, loading only records whose hash changed.
+
+    :param kind: The record kind (`"champ"` or `"item"`).
+    :type kind: str
+
+    :param old_version: The old game version.
+    :type old_version: str
+
+    :param new_version: The new game version.
+    :type new_version: str
+
+    :return: The `added` and `removed` IDs, and the `changed` records with their changes.
+    :rtype: dict[str, Any]
+    """
+    scopes = CHAMP_SCOPES if kind == "champ" else ITEM_SCOPES
+    old_manifest = store.read_manifest(kind, old_version)
+    new_manifest = store.read_manifest(kind, new_version)
+    if not old_manifest or not new_manifest:
+        logging.warning(f"Missing stored {kind} data for version {old_version} or {new_version}.")
+        return {"added": [], "removed": [], "changed": {}}
+
+    cache: dict[str, Any] = {}
+    changed_ids = {
+        record_id
+        for record_id in old_manifest.keys() & new_manifest.keys()
+        if old_manifest[record_id] != new_manifest[record_id]
+    }
+    old_data = {record_id: store.get_object(old_manifest[record_id], cache) or {} for record_id in changed_ids}
+    new_data = {record_id: store.get_object(new_manifest[record_id], cache) or {} for record_id in changed_ids}
+
+    result = diff_data(old_data, new_data, scopes)
+    result["added"] = sorted(new_manifest.keys() - old_manifest.keys())
+    result["removed"] = sorted(old_manifest.keys() - new_manifest.keys())
+    return result
@@ -0,0 +1,295 @@
+# evaluate.py
+import logging
+from dataclasses import dataclass
+from typing import Any, Iterable
+import champions
+import items
+import lookup
+import manifest
+import spells
+import statarrays
+import teamfight
+import utils
+import versions
+from models import Champion
+from sensitivity import dps, ehp, ehp_magic
+
+"""
+This module loads a game version into memory once and answers stat, build and duel queries against it.
+
+Champion and item stats are read from the memory-mapped stat arrays of the version, so worker processes
+opening a snapshot share one copy and never parse the champion or item data.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+@dataclass
+class Snapshot:
+    """All derived tables of one game version, treated as read-only once loaded."""
+    version: str
+    name_index: lookup.NameIndex
+    spell_table: spells.SpellTable
+    stat_arrays: statarrays.StatArrays
+
+    @classmethod
+    def load(cls, version: str) -> "Snapshot":
+        """
+        Load a game version, fetching any missing data and building the files `open` reads.
+
+        :param version: The game version.
+        :type version: str
+
+        :return: The loaded snapshot.
+        :rtype: Snapshot
+
+        :raises ValueError: If the champion or item data is empty or not complete and valid in the manifest,
+            or the stat arrays could not be built.
+        """
+        files = versions.update_filenames(version)
+
+        item_data = items.check_items(files["item_data"], version)
+        item_list = items.check_item_list(files["item_list"], files["item_data"], version, item_data=item_data)
+
+        champ_data = champions.check_champs(files["champ_data"], version, compact=True)
+        champ_list = champions.check_champ_list(files["champ_list"], files["champ_data"], version, champ_data=champ_data)
+
+        if not champ_data or not item_data or not manifest.is_complete(version, ("item_data", "champ_data")):
+            raise ValueError(f"Incomplete data for version {version} ({len(champ_data)} champions, {len(item_data)} items).")
+
+        name_index = lookup.check_name_index(files["name_index"], champ_list, item_list, version)
+        spell_table = spells.check_spell_table(files["spell_table"], version, champ_data)
+        stat_arrays = statarrays.check_stat_arrays(files["stat_arrays"], version, champ_data, item_data)
+        if stat_arrays is None:
+            raise ValueError(f"Failed to build stat arrays for version {version}.")
+
+        logging.info(f"Loaded snapshot (version {version}).")
+        return cls(version=version, name_index=name_index, spell_table=spell_table, stat_arrays=stat_arrays)
+
+    @classmethod
+    def open(cls, version: str) -> "Snapshot":
+        """
+        Open a game version from the files built by `load`, without reading the champion or item data
+        (e.g. in worker processes).
+
+        :param version: The game version.
+        :type version: str
+
+        :return: The opened snapshot.
+        :rtype: Snapshot
+
+        :raises ValueError: If the data is not complete or any of the files is missing or invalid.
+        """
+        files = versions.update_filenames(version)
+
+        if not manifest.is_complete(version, ("item_data", "champ_data", "spell_table", "stat_arrays")):
+            raise ValueError(f"Missing or invalid data files for version {version}, load it first.")
+
+        index_data = utils.read_json(files["name_index"], {})
+        spell_data = manifest.read_artifact(version, "spell_table", files["spell_table"], {})
+        stat_arrays = statarrays.open_stat_arrays(files["stat_arrays"], version)
+        if not index_data or not spell_data or stat_arrays is None:
+            raise ValueError(f"Missing or invalid data files for version {version}, load it first.")
+
+        return cls(
+            version=version,
+            name_index=lookup.NameIndex.from_json(index_data),
+            spell_table=spells.SpellTable.from_json(spell_data),
+            stat_arrays=stat_arrays
+        )
+
+    def close(self) -> None:
+        """Unmap the stat arrays."""
+        self.stat_arrays.close()
+
+    def resolve(self, name: str, kind: str) -> str:
+        """
+        Resolve a champion or item name, alias or ID.
+
+        :param name: The user input.
+        :type name: str
+
+        :param kind: `"champion"` or `"item"`.
+        :type kind: str
+
+        :return: The champion or item ID.
+        :rtype: str
+
+        :raises KeyError: If nothing matches.
+        """
+        data = self.stat_arrays.champions if kind == "champion" else self.stat_arrays.items
+        if name in data:
+            return name
+
+        for match_kind, match_id in self.name_index.lookup(name):
+            if match_kind == kind:
+                return match_id
+
+        raise KeyError(f"Unknown {kind}: {name}")
+
+    def champion(self, name: str, level: int = 1, build: Iterable[str] = ()) -> Champion:
+        """
+        Create a champion at a level with a build applied.
+
+        :param name: Champion name, alias or ID.
+        :type name: str
+
+        :param level: The champion level (defaults to `1`).
+        :type level: int
+
+        :param build: Item names, aliases or IDs (defaults to none).
+        :type build: Iterable[str]
+
+        :return: The champion.
+        :rtype: Champion
+        """
+        champ_id = self.resolve(name, "champion")
+        item_ids = normalize_build(self.resolve(item, "item") for item in build)
+
+        return self.stat_arrays.champion(champ_id, level, item_ids)
+
+def prepare(version: str) -> None:
+    """Build the files `Snapshot.open` reads, loading the version only if any is missing or invalid."""
+    try:
+        snapshot = Snapshot.open(version)
+    except ValueError:
+        snapshot = Snapshot.load(version)
+    snapshot.close()
+
+def normalize_build(build: Iterable[str]) -> list[str]:
+    """Canonical form of a build: its distinct item IDs, sorted."""
+    return sorted(set(build))
+
+def normalize_fighter(snapshot: Snapshot, fighter: dict[str, Any] | str) -> dict[str, Any]:
+    """
+    Canonical form of a duel fighter, so equivalent fighters share result cache keys.
+
+    :param snapshot: The loaded game version.
+    :type snapshot: Snapshot
+
+    :param fighter: `champion`, `level`, optional `build` and optional `ranks`, or just a champion name.
+    :type fighter: dict[str, Any] | str
+
+    :return: The fighter with its champion and items resolved to IDs, the build in canonical order and
+        the defaults filled in.
+    :rtype: dict[str, Any]
+
+    :raises KeyError: If a champion or item is unknown.
+    :raises ValueError: If the build is not a list of items.
+    """
+    fighter = {"champion": fighter} if isinstance(fighter, str) else fighter
+    build = fighter.get("build", ())
+    if not isinstance(build, (list, tuple)):
+        raise ValueError("Build must be a list of items")
+
+    return {
+        "champion": snapshot.resolve(fighter["champion"], "champion"),
+        "level": int(fighter.get("level", 1)),
+        "build": normalize_build(snapshot.resolve(item, "item") for item in build),
+        "ranks": [int(rank) for rank in fighter.get("ranks", (0, 0, 0, 0))]
+    }
+
+def objective_columns(champion: Champion) -> dict[str, list[float]]:
+    """Single-row objective inputs of a champion, as used by the `sensitivity` objectives."""
+    s = champion.stats
+    return {
+        "attack_damage": [s.attack_damage],
+        "attack_speed": [s.attack_speed],
+        "crit_chance": [s.crit_chance_total],
+        "crit_damage": [s.crit_damage],
+        "health": [s.health],
+        "armor": [s.armor],
+        "magic_resist": [s.magic_resist],
+    }
+
+def stats_at_level(snapshot: Snapshot, champion: str, level: int, build: Iterable[str] = ()) -> dict[str, Any]:
+    """
+    Total stats of a champion at a level with a build.
+
+    :param snapshot: The loaded game version.
+    :type snapshot: Snapshot
+
+    :param champion: Champion name, alias or ID.
+    :type champion: str
+
+    :param level: The champion level.
+    :type level: int
+
+    :param build: Item names, aliases or IDs (defaults to none).
+    :type build: Iterable[str]
+
+    :return: The champion, level and stats.
+    :rtype: dict[str, Any]
+    """
+    result = snapshot.champion(champion, level, build)
+    return {"champion": result.name, "level": result.level, "stats": result.as_dict()["stats"]}
+
+def evaluate_build(snapshot: Snapshot, champion: str, level: int, build: Iterable[str]) -> dict[str, Any]:
+    """
+    Evaluate a build on a champion: cost, stat gold value and damage and durability objectives.
+
+    :param snapshot: The loaded game version.
+    :type snapshot: Snapshot
+
+    :param champion: Champion name, alias or ID.
+    :type champion: str
+
+    :param level: The champion level.
+    :type level: int
+
+    :param build: Item names, aliases or IDs.
+    :type build: Iterable[str]
+
+    :return: The build evaluation.
+    :rtype: dict[str, Any]
+    """
+    item_ids = normalize_build(snapshot.resolve(item, "item") for item in build)
+    result = snapshot.champion(champion, level, item_ids)
+    columns = objective_columns(result)
+
+    gold = sum(snapshot.stat_arrays.item_gold(item_id) for item_id in item_ids)
+    stat_gold = sum(snapshot.stat_arrays.item_stat_gold(item_id) for item_id in item_ids)
+    return {
+        "champion": result.name,
+        "level": level,
+        "build": item_ids,
+        "gold": gold,
+        "stat_gold": stat_gold,
+        "gold_efficiency": stat_gold / gold if gold > 0 else None,
+        "dps": dps(columns)[0],
+        "ehp": ehp(columns)[0],
+        "ehp_magic": ehp_magic(columns)[0],
+    }
+
+def duel(snapshot: Snapshot, first: dict[str, Any], second: dict[str, Any], max_time: float = 60.0) -> dict[str, Any]:
+    """
+    Simulate a one-on-one fight.
+
+    :param snapshot: The loaded game version.
+    :type snapshot: Snapshot
+
+    :param first: `champion`, `level`, optional `build` and optional `ranks` (Q, W, E, R) of the first fighter.
+    :type first: dict[str, Any]
+
+    :param second: The second fighter, as `first`.
+    :type second: dict[str, Any]
+
+    :param max_time: Time limit in seconds (defaults to `60.0`).
+    :type max_time: float
+
+    :return: The winner (`0`, `1` or `None`), duration, remaining health and damage dealt.
+    :rtype: dict[str, Any]
+    """
+    fighters = []
+    for spec in (first, second):
+        champion = snapshot.champion(spec["champion"], int(spec.get("level", 1)), spec.get("build", ()))
+        abilities = snapshot.spell_table.abilities(champion.name, spec.get("ranks", (0, 0, 0, 0)))
+        fighters.append(teamfight.Fighter(champion, abilities))
+
+    result = teamfight.simulate(fighters, max_time=max_time)
+    return {
+        "champions": [fighter.champion.name for fighter in fighters],
+        "winner": result.winner,
+        "duration": result.duration,
+        "health": result.health,
+        "damage_dealt": result.damage_dealt,
+    }
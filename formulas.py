@@ -1,15 +1,20 @@
 from math import prod
+from operator import mul
 from typing import Any
 
+PHYSICAL_DAMAGE, MAGIC_DAMAGE, TRUE_DAMAGE = 0, 1, 2
+
 # FIXME
-def max_value(values):
-    """Maximum value"""
-    return max(values) if hasattr(values, '__iter__') else values
+def max_value(values, *bounds):
+    """Maximum value, optionally bounded below by `bounds`"""
+    value = max(values) if hasattr(values, '__iter__') else values
+    return max(value, *bounds) if bounds else value
 
 # FIXME
-def min_value(values):
-    """Minimum value"""
-    return min(values) if hasattr(values, '__iter__') else values
+def min_value(values, *bounds):
+    """Minimum value, optionally bounded above by `bounds`"""
+    value = min(values) if hasattr(values, '__iter__') else values
+    return min(value, *bounds) if bounds else value
 
 # FIXME
 def add_stacking(values):
@@ -51,6 +56,12 @@ def attack_speed(base, growth, level, ratio, bonus) -> float:
     bonus = bonus + growth * (level - 1) * (0.7025 + 0.0175 * (level - 1))
     return min_value(base + bonus * ratio, 3)
 
+def ability_cooldown(base, haste) -> float:
+    """
+    Ability cooldown after ability haste (haste stacks additively)
+    """
+    return base * 100 / (100 + add_stacking(haste))
+
 # FIXME
 def move_speed(base, flat, percent, multi, slow, slow_res) -> float:
     """
@@ -60,7 +71,7 @@ def move_speed(base, flat, percent, multi, slow, slow_res) -> float:
     percent = add_stacking(percent)
     multi = multi_stacking(multi)
     slow = max_value(slow)
-    slow_res = multi_stacking(slow_res)
+    slow_res = 1 - remaining_stacking(slow_res)
 
     ms = (base + flat) * (1 + percent) * multi * (1 - (slow * (1 - slow_res)))
     return (
@@ -85,34 +96,49 @@ def damage_received_modifier(mods) -> float:
     """
     return multi_stacking(mods)
 
-# FIXME
+def remaining_stacking(values):
+    """Multiplicative stacking of reductions (fraction remaining)"""
+    return prod(1 - value for value in values) if hasattr(values, '__iter__') else 1 - values
+
+def damage_multiplier_resistances(resist) -> float:
+    """
+    Damage multiplier from a resistance value.
+
+    `100 / (100 + resist)` for non-negative resistance, otherwise `2 - 100 / (100 - resist)`.
+    """
+    return 100 / (100 + resist) if resist >= 0 else 2 - (100 / (100 - resist))
+
 def damage_reduction_resistances(resist) -> float:
     """
-    Champion damage reduction modifier from a resistance type.
+    Champion damage reduction modifier from a resistance type (negative for negative resistance).
     """
-    return 1 - 100 / (100 + resist) if resist > 0 else 2 - (100 / (100 + resist))
+    return 1 - damage_multiplier_resistances(resist)
 
-# FIXME
 def resistance_post_pen(base, bonus, flat_red, perc_red, perc_pen, flat_pen) -> tuple[float, float, float]:
     """
-    Champion resistance after reduction and penetration are applied
+    Champion resistance after reduction and penetration are applied, in order: flat reduction (split
+    between base and bonus resistance), percent reduction, percent penetration and flat penetration.
+    Percent reduction and penetration only apply to positive resistance, and flat penetration cannot
+    reduce it below zero.
     """
     base = add_stacking(base)
     bonus = add_stacking(bonus)
     flat_red = add_stacking(flat_red)
-    perc_red = 1 - multi_stacking(perc_red) - 1
-    perc_pen = 1 - multi_stacking(perc_pen) - 1
+    perc_red = remaining_stacking(perc_red)
+    perc_pen = remaining_stacking(perc_pen)
     flat_pen = add_stacking(flat_pen)
 
-    base_ratio = base / (base + bonus)
-    bonus_ratio = bonus / (base + bonus)
+    total = base + bonus
+    if flat_red and total > 0:
+        base -= flat_red * (base / total)
+        bonus -= flat_red * (bonus / total)
+    elif flat_red:
+        base -= flat_red
 
-    base -= (flat_red * base_ratio)
-    bonus -= (flat_red * bonus_ratio)
     total = base + bonus
     if total > 0:
         base *= perc_red * perc_pen
-        bonus *= bonus * perc_red * perc_pen
+        bonus *= perc_red * perc_pen
         total = max_value(base + bonus - flat_pen, 0)
     
     return base, bonus, total
@@ -146,19 +172,79 @@ def tenacity(group_1, group_2, group_3) -> float:
     
     
 
-# FIXME
-def post_mitigation_damage():
-    """
-    Post-mitigation damage
-    """
-    # The following effects influence damage as non-zero values, in no particular order of calculation.
-    # percent damage amplification
-    # percent damage reduction
-    # flat damage reduction
-    # resistances
-    # resistance reduction
-    # resistance penetration
-    # shielding
+def mitigated_damage(raw, damage_type, flat_red, perc_red, perc_pen, flat_pen, base_resist, bonus_resist, amp, perc_dr, flat_dr, shield) -> float:
+    """
+    Post-mitigation damage of a single hit (scalar reference for `post_mitigation_damage`).
+
+    Damage is multiplied by the resistance multiplier (skipped for true damage), then by percent
+    amplification and percent damage reduction, then reduced by flat damage reduction and finally
+    absorbed by shields. Returns the damage dealt to health.
+    """
+    if damage_type == TRUE_DAMAGE:
+        multiplier = 1.0
+    else:
+        resist = resistance_post_pen(base_resist, bonus_resist, flat_red, perc_red, perc_pen, flat_pen)[2]
+        multiplier = damage_multiplier_resistances(resist)
+
+    damage = raw * multiplier * (1 + amp) * (1 - perc_dr)
+    damage = max(damage - flat_dr, 0.0)
+    return max(damage - shield, 0.0)
+
+def post_mitigation_damage(raw, damage_type, flat_red, perc_red, perc_pen, flat_pen, base_resist, bonus_resist, amp, perc_dr, flat_dr, shield) -> list[float]:
+    """
+    Post-mitigation damage of many hits at once.
+
+    Every argument is a sequence with one entry per hit: raw damage, damage type (`PHYSICAL_DAMAGE`,
+    `MAGIC_DAMAGE` or `TRUE_DAMAGE`), the attacker's flat/percent resistance reduction and percent/flat
+    penetration, and the defender's base and bonus resistance of the matching type, percent damage
+    amplification, percent damage reduction, flat damage reduction and shield. Results are identical to
+    `mitigated_damage` applied to each hit.
+
+    This is plain Python: the resistance multiplier is computed once per distinct combination of damage
+    type, resistances, reduction and penetration (e.g. once per attacker and target), and the remaining
+    steps run column by column, skipping columns that are all zeros (e.g. no amplification or shields).
+    """
+    # Mostly repeated combinations are computed once each, otherwise once per hit
+    keys = list(zip(damage_type, base_resist, bonus_resist, flat_red, perc_red, perc_pen, flat_pen))
+    unique = set(keys)
+    combinations = list(unique) if 2 * len(unique) <= len(keys) else keys
+
+    scale = []
+    for kind, base, bonus, flat_red_hit, perc_red_hit, perc_pen_hit, flat_pen_hit in combinations:
+        # Same operations, in the same order, as resistance_post_pen and damage_multiplier_resistances
+        if kind == TRUE_DAMAGE:
+            scale.append(1.0)
+            continue
+
+        total = base + bonus
+        if flat_red_hit and total > 0:
+            base -= flat_red_hit * (base / total)
+            bonus -= flat_red_hit * (bonus / total)
+        elif flat_red_hit:
+            base -= flat_red_hit
+
+        total = base + bonus
+        if total > 0:
+            factor = (1 - perc_red_hit) * (1 - perc_pen_hit)
+            total = max(base * factor + bonus * factor - flat_pen_hit, 0)
+
+        scale.append(100 / (100 + total) if total >= 0 else 2 - (100 / (100 - total)))
+
+    if combinations is not keys:
+        scale = map(dict(zip(combinations, scale)).__getitem__, keys)
+    damage = list(map(mul, raw, scale))
+
+    if any(amp):
+        damage = [hit * (1 + amp_hit) for hit, amp_hit in zip(damage, amp)]
+    if any(perc_dr):
+        damage = [hit * (1 - perc_dr_hit) for hit, perc_dr_hit in zip(damage, perc_dr)]
+    if any(flat_dr):
+        damage = [hit - flat_dr_hit for hit, flat_dr_hit in zip(damage, flat_dr)]
+    damage = [hit if hit > 0.0 else 0.0 for hit in damage]
+    if any(shield):
+        damage = [hit - shield_hit if hit > shield_hit else 0.0 for hit, shield_hit in zip(damage, shield)]
+
+    return damage
 
 # FIXME
 def avg_damage_per_attack(attack_damage, crit_chance, crit_mod) -> float:
@@ -1,9 +1,32 @@
 # items.py
 import logging
 from typing import Any
+import manifest
+import projection
+import recipes
+import store
 import utils
 from constants import LINKS, REMOVE_KEYS, SAVE_KEYS, STAT_MAP
 
+DDRAGON_ITEM_PROJECTION = projection.compile_projection({
+    "fields": {
+        "name": ("name", ""),
+        "description": ("description", ""),
+        "gold": (("gold", "total"), -1),
+        "tags": ("tags", []),
+        "from": ("from", []),
+        "into": ("into", [])
+    }
+})
+
+CDRAGON_ITEM_PROJECTION = projection.compile_projection({
+    "keep": SAVE_KEYS,
+    "drop": REMOVE_KEYS,
+    "rest": "stats"
+})
+
+TOOLTIP_STATS: frozenset[str] = frozenset(STAT_MAP) - {"GoldPer10"}
+
 def fetch_ddragon_items(version: str, value: Any = None) -> dict[str, Any]:
     """
     Fetch data for all items from Data Dragon.
@@ -18,7 +41,7 @@ def fetch_ddragon_items(version: str, value: Any = None) -> dict[str, Any]:
     :rtype:
     """
     url = LINKS["ddragon_items"].format(version)
-    item_data = utils.fetch_json(url, {})
+    item_data = utils.fetch_json(url, {}, priority="list")
 
     if not item_data or item_data.get("version") != version or "data" not in item_data:
         logging.warning(f"Failed to fetch data for all items from Data Dragon (v{version}).")
@@ -74,12 +97,7 @@ def clean_ddragon_items(ddragon: dict[str, Any]) -> dict[str, Any]:
             continue
 
         # Add to filtered data if all conditions are met!
-        filtered_data[item_id] = {
-            "name": subdata.get("name", ""),
-            "description": subdata.get("description", ""),
-            "gold": gold.get("total", -1),
-            "tags": tags
-        }
+        filtered_data[item_id] = DDRAGON_ITEM_PROJECTION(subdata)
 
     return filtered_data
 
@@ -97,7 +115,7 @@ def fetch_cdragon_items(version: str, value: Any = None) -> dict[str, Any]:
     :rtype: dict[str, Any]
     """
     url = LINKS["cdragon_items"].format(version[:-2])
-    item_data = utils.fetch_json(url, {})
+    item_data = utils.fetch_json(url, {}, priority="list")
 
     if not item_data:
         logging.warning(f"Failed to fetch data for all items from Community Dragon (v{version}).")
@@ -124,19 +142,14 @@ def clean_cdragon_items(cdragon: dict[str, Any]) -> dict[str, Any]:
         if not isinstance(subdata, dict):
             continue
         
-        base_keys = set(subdata.keys()).intersection(SAVE_KEYS)
-        filtered_keys = set(subdata.keys()).difference(REMOVE_KEYS)
-        stat_keys = filtered_keys.difference(SAVE_KEYS)
-
-        structured_item = {key: subdata[key] for key in base_keys}
-        structured_item["stats"] = {key: subdata[key] for key in stat_keys}
+        structured_item = CDRAGON_ITEM_PROJECTION(subdata)
 
         tooltip = subdata.get("mItemDataClient", {}).get("mTooltipData", {})
         stats = tooltip.get("mLists", {}).get("Stats", {}).get("elements")
 
         if isinstance(stats, list):
             stat_types = {stat["type"] for stat in stats if isinstance(stat, dict) and "type" in stat}
-            filtered_stats = stat_types.intersection(set(STAT_MAP.keys()) - {"GoldPer10"})
+            filtered_stats = stat_types.intersection(TOOLTIP_STATS)
 
             structured_item["stats"].update({
                 STAT_MAP[stat]: subdata.get(STAT_MAP[stat])
@@ -188,11 +201,32 @@ def merge_items(ddragon: dict[str, Any], cdragon: dict[str, Any]) -> dict[str, A
     
     return item_data
 
+def read_items(filename: str, version: str) -> dict[str, Any]:
+    """
+    Read item data from the record store, or from a full data file written before the store was primary,
+    moving that data into the store.
+
+    :param filename: The legacy item data file.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :return: The item data if valid, otherwise an empty dictionary.
+    :rtype: dict[str, Any]
+    """
+    item_data = store.read_version("item", version, "item_data")
+    if item_data is None:
+        item_data = manifest.read_artifact(version, "item_data", filename, {})
+        if item_data and store.write_version("item", version, "item_data", item_data):
+            logging.info(f"Moved item data to the record store, {filename} is no longer used (version {version}).")
+    return item_data
+
 def check_items(filename: str, version: str, update: bool = False) -> dict[str, Any]:
     """
     Check if the item data file is correct, and update if not.
 
-    :param filename: The item data file to read.
+    :param filename: The legacy item data file, read if the version is not in the record store yet.
     :type filename: str
 
     :param version: The game version.
@@ -204,9 +238,13 @@ def check_items(filename: str, version: str, update: bool = False) -> dict[str,
     :return: Combined item data from Data Dragon and Community Dragon.
     :rtype: dict[str, Any]
     """
-    item_data = utils.read_json(filename, {})
+    item_data = read_items(filename, version) if not update else {}
+    if item_data and not recipes.is_current(item_data):
+        logging.info(f"Updating item recipes (version {version}).")
+        item_data = recipes.build_recipe_graph(item_data)
+        store.write_version("item", version, "item_data", item_data)
 
-    if not item_data or update:
+    if not item_data:
         logging.info(f"Fetching item data (version {version}).")
         ddragon = fetch_ddragon_items(version, {})
         ddragon = clean_ddragon_items(ddragon)
@@ -215,11 +253,12 @@ def check_items(filename: str, version: str, update: bool = False) -> dict[str,
         cdragon = clean_cdragon_items(cdragon)
         
         item_data = merge_items(ddragon, cdragon)
-        utils.write_json(filename, item_data)
+        item_data = recipes.build_recipe_graph(item_data)
+        store.write_version("item", version, "item_data", item_data)
     
     return item_data
 
-def check_item_list(filename_list: str, filename_data: str, version: str, update: bool = False) -> dict[str, Any]:
+def check_item_list(filename_list: str, filename_data: str, version: str, update: bool = False, item_data: dict[str, Any] | None = None) -> dict[str, Any]:
     """
     Check if the item list file is correct, and update if not.
 
@@ -235,14 +274,17 @@ def check_item_list(filename_list: str, filename_data: str, version: str, update
     :param update: Debug flag to force update item list (defaults to `False`).
     :type update: bool
 
+    :param item_data: Item data already loaded, used instead of reading `filename_data` (defaults to `None`).
+    :type item_data: dict[str, Any] | None, optional
+
     :return: Item list.
     :rtype: dict[str, Any]
     """
-    item_list = utils.read_json(filename_list, {})
+    item_list = manifest.read_artifact(version, "item_list", filename_list, {}) if not update else {}
 
-    if not item_list or update:
+    if not item_list:
         logging.info(f"Fetching item list (version {version}).")
-        item_list = utils.read_json(filename_data, {})
+        item_list = item_data if item_data is not None else read_items(filename_data, version)
         item_list = {
             item_id: subdata.get("name", "")
             for item_id, subdata in item_list.items()
@@ -250,6 +292,6 @@ def check_item_list(filename_list: str, filename_data: str, version: str, update
         if not item_list:
             logging.warning(f"Invalid or empty data received from {filename_data}.")
             return {}
-        utils.write_json(filename_list, item_list)
+        manifest.write_artifact(version, "item_list", filename_list, item_list)
     
     return item_list
@@ -0,0 +1,299 @@
+# lookup.py
+import logging
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+import utils
+
+"""
+This module provides a name index for resolving user input to champion and item IDs.
+
+Names and aliases are normalized (lowercase, accents and punctuation removed) and stored in a sorted
+key list for exact and prefix lookup, with a trigram index over the same keys for typo-tolerant lookup.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for lookup (e.g. `"Kai'Sa"` -> `"kaisa"`).
+
+    :param name: The name to normalize.
+    :type name: str
+
+    :return: The lowercase name with accents, whitespace and punctuation removed.
+    :rtype: str
+    """
+    name = unicodedata.normalize("NFKD", str(name))
+    return "".join(char for char in name.lower() if char.isalnum())
+
+def name_aliases(entry_id: str, name: str) -> set[str]:
+    """
+    Generate the normalized aliases of a champion or item.
+    Aliases are the ID, the full name, and each word of the name with at least three characters.
+
+    :param entry_id: The champion or item ID.
+    :type entry_id: str
+
+    :param name: The display name.
+    :type name: str
+
+    :return: The normalized aliases.
+    :rtype: set[str]
+    """
+    aliases = {normalize_name(entry_id), normalize_name(name)}
+    aliases.update(
+        normalize_name(word)
+        for word in name.replace("-", " ").split()
+        if len(normalize_name(word)) >= 3
+    )
+    aliases.discard("")
+    return aliases
+
+def trigrams(key: str) -> set[str]:
+    """
+    Split a normalized key into padded trigrams.
+
+    :param key: The normalized key.
+    :type key: str
+
+    :return: The set of trigrams.
+    :rtype: set[str]
+    """
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(source: str, target: str, limit: int) -> int:
+    """
+    Optimal string alignment distance between two strings, stopping early once `limit` is exceeded.
+
+    :param source: The first string.
+    :type source: str
+
+    :param target: The second string.
+    :type target: str
+
+    :param limit: The largest distance of interest.
+    :type limit: int
+
+    :return: The edit distance, or `limit + 1` if it exceeds `limit`.
+    :rtype: int
+    """
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+
+    previous2: list[int] = []
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i] + [0] * len(target)
+        for j, target_char in enumerate(target, 1):
+            cost = source_char != target_char
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and source_char == target[j - 2] and source[i - 2] == target_char:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+class NameIndex:
+    """Exact, prefix and typo-tolerant lookup of champion and item names."""
+
+    def __init__(self, entries: dict[str, list[list[str]]], grams: dict[str, list[int]] | None = None):
+        """
+        Create a name index from normalized keys.
+
+        :param entries: Mapping of normalized key to its `[kind, id]` targets.
+        :type entries: dict[str, list[list[str]]]
+
+        :param grams: Mapping of trigram to key positions in sorted key order, built if not given.
+        :type grams: dict[str, list[int]] | None, optional
+        """
+        self.keys = sorted(entries)
+        self.entries = {key: [tuple(target) for target in entries[key]] for key in self.keys}
+
+        if grams is None:
+            grams = {}
+            for position, key in enumerate(self.keys):
+                for gram in trigrams(key):
+                    grams.setdefault(gram, []).append(position)
+        self.grams = grams
+
+    @classmethod
+    def build(cls, champ_list: dict[str, str], item_list: dict[str, str]) -> "NameIndex":
+        """
+        Build a name index from the champion and item lists.
+
+        :param champ_list: Champion list (ID -> name).
+        :type champ_list: dict[str, str]
+
+        :param item_list: Item list (ID -> name).
+        :type item_list: dict[str, str]
+
+        :return: The name index.
+        :rtype: NameIndex
+        """
+        entries: dict[str, list[list[str]]] = {}
+        for kind, entry_list in (("champion", champ_list), ("item", item_list)):
+            for entry_id, name in entry_list.items():
+                for alias in name_aliases(entry_id, name):
+                    targets = entries.setdefault(alias, [])
+                    if [kind, entry_id] not in targets:
+                        targets.append([kind, entry_id])
+
+        return cls(entries)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "NameIndex":
+        """Creates a NameIndex from its JSON representation."""
+        return cls(data.get("entries", {}), data.get("grams"))
+
+    def targets(self) -> set[tuple[str, str]]:
+        """Returns every `(kind, id)` pair in the index."""
+        return {target for targets in self.entries.values() for target in targets}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the name index as a JSON-compatible dictionary."""
+        return {
+            "entries": {key: [list(target) for target in targets] for key, targets in self.entries.items()},
+            "grams": self.grams
+        }
+
+    def exact(self, name: str) -> list[tuple[str, str]]:
+        """
+        Look up a name or alias exactly (after normalization).
+
+        :param name: The name to look up.
+        :type name: str
+
+        :return: Matching `(kind, id)` pairs.
+        :rtype: list[tuple[str, str]]
+        """
+        return list(self.entries.get(normalize_name(name), []))
+
+    def prefix(self, name: str, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Look up names or aliases starting with the given prefix, shortest keys first.
+
+        :param name: The prefix to look up.
+        :type name: str
+
+        :param limit: The maximum number of results (defaults to `10`).
+        :type limit: int
+
+        :return: Matching `(kind, id)` pairs.
+        :rtype: list[tuple[str, str]]
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        matches = []
+        for position in range(bisect_left(self.keys, key), len(self.keys)):
+            if not self.keys[position].startswith(key):
+                break
+            matches.append(self.keys[position])
+
+        return self._collect(sorted(matches, key=len), limit)
+
+    def fuzzy(self, name: str, max_distance: int = 2, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Look up names or aliases within an edit distance of the given name, closest first.
+
+        :param name: The name to look up.
+        :type name: str
+
+        :param max_distance: The maximum edit distance (defaults to `2`).
+        :type max_distance: int
+
+        :param limit: The maximum number of results (defaults to `10`).
+        :type limit: int
+
+        :return: Matching `(kind, id)` pairs.
+        :rtype: list[tuple[str, str]]
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        # Each edit destroys at most three trigrams, so weaker candidates cannot match
+        query_grams = trigrams(key)
+        required = len(query_grams) - 3 * max_distance
+
+        counts = Counter(
+            position
+            for gram in query_grams
+            for position in self.grams.get(gram, ())
+        )
+        candidates = []
+        for position, count in counts.most_common():
+            if count < required:
+                break
+            candidate = self.keys[position]
+            distance = edit_distance(key, candidate, max_distance)
+            if distance <= max_distance:
+                candidates.append((distance, len(candidate), candidate))
+
+        return self._collect([candidate for *_, candidate in sorted(candidates)], limit)
+
+    def lookup(self, name: str, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Resolve a name using exact, then prefix, then typo-tolerant lookup.
+
+        :param name: The name to resolve.
+        :type name: str
+
+        :param limit: The maximum number of results (defaults to `10`).
+        :type limit: int
+
+        :return: Matching `(kind, id)` pairs from the first lookup with results.
+        :rtype: list[tuple[str, str]]
+        """
+        return self.exact(name) or self.prefix(name, limit) or self.fuzzy(name, limit=limit)
+
+    def _collect(self, keys: list[str], limit: int) -> list[tuple[str, str]]:
+        """Flatten the targets of the given keys, keeping order and dropping duplicates."""
+        results: dict[tuple[str, str], None] = {}
+        for key in keys:
+            for target in self.entries[key]:
+                results.setdefault(target)
+                if len(results) >= limit:
+                    return list(results)
+
+        return list(results)
+
+def check_name_index(filename: str, champ_list: dict[str, str], item_list: dict[str, str], version: str, update: bool = False) -> NameIndex:
+    """
+    Check if the name index file is correct and covers the champion and item lists, and rebuild if not.
+
+    :param filename: The name index file to read.
+    :type filename: str
+
+    :param champ_list: Champion list used to rebuild the index.
+    :type champ_list: dict[str, str]
+
+    :param item_list: Item list used to rebuild the index.
+    :type item_list: dict[str, str]
+
+    :param version: The game version.
+    :type version: str
+
+    :param update: Debug flag to force rebuild the name index (defaults to `False`).
+    :type update: bool
+
+    :return: The name index.
+    :rtype: NameIndex
+    """
+    index = NameIndex.from_json(utils.read_json(filename, {})) if not update else None
+
+    # Rebuild if the lists changed since the index was written (e.g. champions added by a retry)
+    expected = {("champion", champ_id) for champ_id in champ_list} | {("item", item_id) for item_id in item_list}
+    if index is None or not index.entries or index.targets() != expected:
+        logging.info(f"Building name index (version {version}).")
+        index = NameIndex.build(champ_list, item_list)
+        utils.write_json(filename, index.as_dict())
+
+    return index
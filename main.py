@@ -1,26 +1,44 @@
+import argparse
 import versions
 import items
 import champions
+import lookup
+import manifest
+import batch
+from constants import RESULT_CACHE_FILE
 
 def main() -> None:
-    CHAMP_NAME = "Ahri"
-    LEVEL = 18
+    parser = argparse.ArgumentParser(description="League Simulacrum")
+    parser.add_argument("--offline", action="store_true", help="use the newest complete local data without network access")
+    parser.add_argument("--verify", action="store_true", help="hash the data files in the background and mark corrupt ones for fetching")
+    parser.add_argument("--retry-failed", action="store_true", help="fetch champions that failed in the last ingestion again")
+    parser.add_argument("--scenarios", help="JSONL file of scenarios to evaluate, or - for stdin")
+    parser.add_argument("--output", default="-", help="output file, or - for stdout (defaults to stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="output format (defaults to jsonl)")
+    parser.add_argument("--processes", type=int, help="worker processes (defaults to one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="scenarios sent to a worker at a time")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    args = parser.parse_args()
 
-    BUILD = {
-        "3118",
-        "3089",
-        "3135",
-        "3020"
-    }
-
-    version = versions.check_version()
+    version = versions.check_version(offline=args.offline)
+    if version is None:
+        parser.exit(1, "No complete local game data found for offline mode.\n" if args.offline else "Failed to find a game version.\n")
     files = versions.update_filenames(version)
+    verifier = manifest.verify_async(version) if args.verify else None
 
     item_data = items.check_items(files["item_data"], version)
-    item_list = items.check_item_list(files["item_list"], files["item_data"], version)
+    item_list = items.check_item_list(files["item_list"], files["item_data"], version, item_data=item_data)
+
+    champ_data = champions.check_champs(files["champ_data"], version, retry_failed=args.retry_failed)
+    champ_list = champions.check_champ_list(files["champ_list"], files["champ_data"], version, champ_data=champ_data)
+
+    name_index = lookup.check_name_index(files["name_index"], champ_list, item_list, version)
+
+    if args.scenarios:
+        batch.run_file(version, args.scenarios, args.output, args.format, args.processes, args.chunk_size, None if args.no_cache else RESULT_CACHE_FILE)
 
-    champ_data = champions.check_champs(files["champ_data"], version)
-    champ_list = champions.check_champ_list(files["champ_list"], files["champ_data"], version)
+    if verifier:
+        verifier.join()
 
 if __name__ == "__main__":
     main()
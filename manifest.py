@@ -0,0 +1,276 @@
+# manifest.py
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Iterable
+import utils
+from constants import FILES, SCHEMA_VERSION, STORE
+
+"""
+This module records the data files of each game version in a small per-version manifest.
+
+Each artifact (e.g. `"item_data"`) is recorded with its size, modification time, SHA-256 hash, schema
+version and completeness when written. A file is then validated from the manifest and one `os.stat`; its
+content is only hashed when the modification time changed, or in a background `verify`.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+_lock = threading.Lock()
+
+def manifest_path(version: str, directory: str = ".") -> str:
+    """Path of the manifest of a game version."""
+    return os.path.join(directory, FILES["manifest"].format(version))
+
+def read_manifest(version: str, directory: str = ".") -> dict[str, Any]:
+    """
+    Read the manifest of a game version.
+
+    :param version: The game version.
+    :type version: str
+
+    :param directory: The data directory (defaults to the working directory).
+    :type directory: str
+
+    :return: The manifest, with an entry per artifact under `"artifacts"`.
+    :rtype: dict[str, Any]
+    """
+    path = manifest_path(version, directory)
+    manifest = utils.read_json(path) if os.path.isfile(path) else None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("artifacts"), dict):
+        return {"version": version, "artifacts": {}}
+    return manifest
+
+def write_manifest(manifest: dict[str, Any], directory: str = ".") -> bool:
+    """Atomically write the manifest of a game version."""
+    return utils.write_json(manifest_path(manifest["version"], directory), manifest, atomic=True)
+
+def file_hash(filename: str) -> str | None:
+    """
+    Hash a file in chunks.
+
+    :param filename: The file.
+    :type filename: str
+
+    :return: The SHA-256 hex digest if the file could be read, otherwise `None`.
+    :rtype: str | None
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(filename, "rb") as file:
+            while chunk := file.read(1 << 20):
+                digest.update(chunk)
+    except OSError as e:
+        logging.error(f"Failed to hash {filename}: {e}")
+        return None
+    return digest.hexdigest()
+
+def record(version: str, kind: str, filename: str, complete: bool = True) -> bool:
+    """
+    Record a written artifact in the manifest of its version.
+
+    :param version: The game version.
+    :type version: str
+
+    :param kind: The artifact, a `FILES` key (e.g. `"item_data"`).
+    :type kind: str
+
+    :param filename: The artifact file, relative to the data directory.
+    :type filename: str
+
+    :param complete: Whether the artifact holds all its data (defaults to `True`).
+    :type complete: bool, optional
+
+    :return: `True` if successful, otherwise `False`.
+    :rtype: bool
+    """
+    digest = file_hash(filename)
+    if digest is None:
+        return False
+
+    stat = os.stat(filename)
+    with _lock:
+        manifest = read_manifest(version)
+        manifest["artifacts"][kind] = {
+            "file": filename,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "schema": SCHEMA_VERSION,
+            "complete": complete,
+            "recorded": time.time()
+        }
+        return write_manifest(manifest)
+
+def validate(version: str, kind: str, filename: str, directory: str = ".", partial: bool = False) -> bool | None:
+    """
+    Validate an artifact against its manifest entry without reading it, unless its modification time changed.
+
+    :param version: The game version.
+    :type version: str
+
+    :param kind: The artifact, a `FILES` key (e.g. `"item_data"`).
+    :type kind: str
+
+    :param filename: The artifact file, relative to `directory`.
+    :type filename: str
+
+    :param directory: The data directory (defaults to the working directory).
+    :type directory: str
+
+    :param partial: Accept an intact artifact recorded as incomplete, e.g. champion data with some champions
+        missing (defaults to `False`).
+    :type partial: bool, optional
+
+    :return: `True` if valid, `False` if missing, empty, partial, corrupt, incomplete or of another schema,
+        and `None` if the artifact has no manifest entry.
+    :rtype: bool | None
+    """
+    entry = read_manifest(version, directory)["artifacts"].get(kind)
+    if entry is None:
+        return None
+
+    path = os.path.join(directory, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+
+    if entry.get("corrupt") or (not entry.get("complete") and not partial):
+        return False
+
+    if entry.get("schema") != SCHEMA_VERSION or stat.st_size != entry.get("size") or stat.st_size <= 2: # Empty JSON object or list
+        return False
+
+    if stat.st_mtime_ns != entry.get("mtime_ns"):
+        if file_hash(path) != entry.get("sha256"):
+            return False
+        with _lock:
+            manifest = read_manifest(version, directory)
+            manifest["artifacts"][kind]["mtime_ns"] = stat.st_mtime_ns
+            write_manifest(manifest, directory)
+
+    return True
+
+def read_artifact(version: str, kind: str, filename: str, value: Any = None, compact: bool = False) -> Any:
+    """
+    Read a JSON artifact if its manifest shows it is valid. Files written before manifests existed are read
+    and, if not empty, recorded.
+
+    :param version: The game version.
+    :type version: str
+
+    :param kind: The artifact, a `FILES` key (e.g. `"item_data"`).
+    :type kind: str
+
+    :param filename: The artifact file.
+    :type filename: str
+
+    :param value: A value to return if the artifact is invalid or missing (defaults to `None`).
+    :type value: Any, optional
+
+    :param compact: See `utils.read_json` (defaults to `False`).
+    :type compact: bool, optional
+
+    :return: The artifact data if valid, otherwise `value`.
+    :rtype: Any
+    """
+    state = validate(version, kind, filename)
+    if state is False:
+        logging.warning(f"Invalid or partial {kind} file {filename} (version {version}).")
+        return value
+
+    if not os.path.isfile(filename):
+        return value
+
+    data = utils.read_json(filename, value, compact=compact)
+    if state is None and data:
+        record(version, kind, filename)
+    return data
+
+def write_artifact(version: str, kind: str, filename: str, data: Any, complete: bool = True) -> bool:
+    """
+    Atomically write a JSON artifact and record it in the manifest. Empty data is recorded as incomplete.
+
+    :return: `True` if successful, otherwise `False`.
+    :rtype: bool
+    """
+    return utils.write_json(filename, data, atomic=True) and record(version, kind, filename, complete and bool(data))
+
+def is_complete(version: str, kinds: Iterable[str], directory: str = ".") -> bool:
+    """
+    Check whether artifacts of a version are valid, from the manifest and file metadata. Artifacts
+    without a manifest entry count as complete if their file is not empty.
+
+    :param version: The game version.
+    :type version: str
+
+    :param kinds: The artifacts, `FILES` keys.
+    :type kinds: Iterable[str]
+
+    :param directory: The data directory (defaults to the working directory).
+    :type directory: str
+
+    :return: `True` if every artifact is valid, otherwise `False`.
+    :rtype: bool
+    """
+    artifacts = read_manifest(version, directory)["artifacts"]
+    for kind in kinds:
+        filename = artifacts.get(kind, {}).get("file") or FILES[kind].format(version)
+        state = validate(version, kind, filename, directory)
+        if state is None:
+            path = os.path.join(directory, filename)
+            state = os.path.isfile(path) and os.path.getsize(path) > 2
+        if not state:
+            return False
+    return True
+
+def verify(version: str) -> list[str]:
+    """
+    Hash every recorded artifact of a version, and every stored object listed by artifacts kept in the
+    record store, marking those that no longer match as corrupt so they are fetched again.
+
+    :param version: The game version.
+    :type version: str
+
+    :return: The artifacts that failed verification.
+    :rtype: list[str]
+    """
+    import store # `store` imports this module
+
+    failed = {}
+    for kind, entry in read_manifest(version)["artifacts"].items():
+        filename = entry.get("file", "")
+        if file_hash(filename) != entry.get("sha256"):
+            failed[kind] = entry.get("sha256")
+        elif os.path.dirname(filename) == os.path.dirname(STORE["manifest"]):
+            corrupt = store.verify_objects(utils.read_json(filename, {}).values())
+            if corrupt:
+                logging.warning(f"{len(corrupt)} stored objects of {kind} do not match their hash (version {version}).")
+                failed[kind] = entry.get("sha256")
+
+    with _lock:
+        manifest = read_manifest(version)
+        entries = manifest["artifacts"]
+        # Skip artifacts rewritten while hashing
+        failed = [kind for kind, digest in failed.items() if kind in entries and entries[kind].get("sha256") == digest]
+        for kind in failed:
+            entries[kind]["complete"] = False
+            entries[kind]["corrupt"] = True
+        if failed:
+            write_manifest(manifest)
+
+    if failed:
+        logging.warning(f"Verification failed for {', '.join(failed)} (version {version}), will fetch again.")
+    else:
+        logging.info(f"Verified all data files (version {version}).")
+
+    return failed
+
+def verify_async(version: str) -> threading.Thread:
+    """Run `verify` on a background thread."""
+    thread = threading.Thread(target=verify, args=(version,), name="manifest-verify", daemon=True)
+    thread.start()
+    return thread
@@ -1,6 +1,64 @@
 # models.py
 from dataclasses import dataclass, asdict
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping
+import formulas
+
+# Data Dragon stat keys and the ChampionStats attributes they initialize
+DDRAGON_STATS: dict[str, str] = {
+    "hp": "health_base",
+    "hpperlevel": "health_level",
+    "hpregen": "health_regen_base",
+    "hpregenperlevel": "health_regen_level",
+    "armor": "armor_base",
+    "armorperlevel": "armor_level",
+    "spellblock": "magic_resist_base",
+    "spellblockperlevel": "magic_resist_level",
+    "attackspeedratio": "attack_speed_ratio",
+    "attackspeed": "attack_speed_base",
+    "attackspeedperlevel": "attack_speed_level",
+    "attackdamage": "attack_damage_base",
+    "attackdamageperlevel": "attack_damage_level",
+    "crit": "crit_chance",
+    "mp": "resource_base",
+    "mpperlevel": "resource_level",
+    "mpregen": "resource_regen_base",
+    "mpregenperlevel": "resource_regen_level",
+    "attackrange": "attack_range_base",
+    "movespeed": "move_speed_base",
+}
+
+# Community Dragon item stat keys (see `constants.STAT_MAP`) and the ChampionStats bonuses they add to
+ITEM_STATS: dict[str, str] = {
+    "mFlatMovementSpeedMod": "move_speed_bonus_flat",
+    "percentBaseMPRegenMod": "resource_regen_bonus_perc",
+    "mPercentBaseHPRegenMod": "health_regen_bonus_perc",
+    "mFlatHPRegenMod": "health_regen_bonus",
+    "mFlatHPPoolMod": "health_bonus",
+    "mFlatCritChanceMod": "crit_chance_bonus",
+    "mFlatMagicDamageMod": "ability_power",
+    "flatMPPoolMod": "resource_bonus",
+    "mFlatArmorMod": "armor_bonus",
+    "mFlatSpellBlockMod": "magic_resist_bonus",
+    "mFlatPhysicalDamageMod": "attack_damage_bonus",
+    "mPercentAttackSpeedMod": "attack_speed_bonus",
+    "mPercentLifeStealMod": "life_steal",
+    "mAbilityHasteMod": "ability_haste",
+    "PhysicalLethality": "ar_pen_flat",
+    "mPercentMovementSpeedMod": "move_speed_bonus_perc",
+    "mPercentHealingAmountMod": "heal_shield_power",
+    "mFlatMagicPenetrationMod": "mr_pen_flat",
+    "mFlatCritDamageMod": "crit_damage_bonus",
+    "mPercentArmorPenetrationMod": "ar_pen_perc",
+    "mPercentTenacityItemMod": "tenacity",
+    "mPercentMagicPenetrationMod": "mr_pen_perc",
+    "PercentOmnivampMod": "omni_vamp",
+    "mPercentSlowResistMod": "slow_resist",
+}
+
+# Bonuses that stack multiplicatively (1 - (1 - a) * (1 - b))
+MULTIPLICATIVE_STATS: set[str] = {"ar_pen_perc", "mr_pen_perc", "tenacity", "slow_resist"}
+
+BASE_CRIT_DAMAGE: float = 1.75
 
 def get_stat(stats: dict[str, Any], key: str, value: float = 0.0) -> float:
     """
@@ -46,67 +104,74 @@ class ChampionStats:
     move_speed_base: float
 
     # Derived attributes (not required in init)
-    health_bonus: float
-    health: float
-    health_current: float
-    health_missing: float
+    health_bonus: float = 0.0
+    health: float = 0.0
+    health_current: float = 0.0
+    health_missing: float = 0.0
 
-    health_regen_bonus: float
-    health_regen: float
+    health_regen_bonus: float = 0.0
+    health_regen_bonus_perc: float = 0.0
+    health_regen: float = 0.0
 
-    heal_shield_power: float
+    heal_shield_power: float = 0.0
 
-    armor_bonus: float
-    armor: float
+    armor_bonus: float = 0.0
+    armor: float = 0.0
 
-    magic_resist_bonus: float
-    magic_resist: float
+    magic_resist_bonus: float = 0.0
+    magic_resist: float = 0.0
 
-    tenacity: float
-    slow_resist: float
+    tenacity: float = 0.0
+    slow_resist: float = 0.0
 
-    attack_speed_bonus: float
-    attack_speed: float
+    attack_speed_bonus: float = 0.0
+    attack_speed: float = 0.0
 
-    attack_damage_bonus: float
-    attack_damage: float
+    attack_damage_bonus: float = 0.0
+    attack_damage: float = 0.0
 
-    ability_power: float
+    ability_power: float = 0.0
 
-    crit_damage: float
+    crit_chance_bonus: float = 0.0
+    crit_chance_total: float = 0.0
 
-    ar_red_flat: float
-    ar_red_perc: float
-    ar_pen_perc: float
-    ar_pen_flat: float
+    crit_damage_bonus: float = 0.0
+    crit_damage: float = BASE_CRIT_DAMAGE
 
-    mr_red_flat: float
-    mr_red_perc: float
-    mr_pen_perc: float
-    mr_pen_flat: float
+    ar_red_flat: float = 0.0
+    ar_red_perc: float = 0.0
+    ar_pen_perc: float = 0.0
+    ar_pen_flat: float = 0.0
 
-    life_steal: float
-    phys_vamp: float
-    omni_vamp: float
+    mr_red_flat: float = 0.0
+    mr_red_perc: float = 0.0
+    mr_pen_perc: float = 0.0
+    mr_pen_flat: float = 0.0
 
-    ability_haste_basic: float
-    ability_haste_ultim: float
-    ability_haste: float
+    life_steal: float = 0.0
+    phys_vamp: float = 0.0
+    omni_vamp: float = 0.0
 
-    resource_bonus: float
-    resource: float
-    resource_current: float
-    resource_missing: float
+    ability_haste_basic: float = 0.0
+    ability_haste_ultim: float = 0.0
+    ability_haste: float = 0.0
 
-    resource_regen_bonus: float
-    resource_regen: float
+    resource_bonus: float = 0.0
+    resource: float = 0.0
+    resource_current: float = 0.0
+    resource_missing: float = 0.0
 
-    attack_range_bonus: float
-    attack_range: float
+    resource_regen_bonus: float = 0.0
+    resource_regen_bonus_perc: float = 0.0
+    resource_regen: float = 0.0
 
-    move_speed_bonus_flat: float
-    move_speed_bonus_perc: float
-    move_speed_bonus_mult: float
+    attack_range_bonus: float = 0.0
+    attack_range: float = 0.0
+
+    move_speed_bonus_flat: float = 0.0
+    move_speed_bonus_perc: float = 0.0
+    move_speed_bonus_mult: float = 0.0
+    move_speed: float = 0.0
 
 @dataclass
 class Champion:
@@ -126,34 +191,80 @@ class Champion:
         TODO
         """
         stats = ChampionStats(
-            **{key: get_stat(champ_stats, key, 0.0) for key in [
-                "hp",
-                "hpperlevel",
-                "hpregen",
-                "hpregenperlevel",
-                "armor",
-                "armorperlevel",
-                "spellblock",
-                "spellblockperlevel",
-                "attackspeedratio",
-                "attackspeed",
-                "attackspeedperlevel",
-                "attackdamage",
-                "attackdamageperlevel",
-                "crit",
-                "mp",
-                "mpperlevel",
-                "mpregen",
-                "mpregenperlevel",
-                "attackrange",
-                "movespeed",
-            ]}
+            **{field: get_stat(champ_stats, key, 0.0) for key, field in DDRAGON_STATS.items()}
         )
         resource_type = champ_stats.get("partype", "")
-        range_type = champ_stats.get("rangeidentity", [])
+        range_type = list(champ_stats.get("rangeidentity", []))
         
-        return cls(name=champ_name, level=1, resource_type=resource_type, stats=stats)
+        champion = cls(name=champ_name, level=1, resource_type=resource_type, range_type=range_type, stats=stats)
+        champion.set_level(1)
+        return champion
     
+    def set_level(self, level: int) -> "Champion":
+        """
+        Sets the champion level and recomputes total stats from base, per-level and bonus values.
+        Current health and resource are restored to full.
+        """
+        stats = self.stats
+        self.level = level
+
+        stats.health = formulas.stat_growth(stats.health_base, stats.health_level, level) + stats.health_bonus
+        stats.health_regen = formulas.stat_growth(stats.health_regen_base, stats.health_regen_level, level) * (1 + stats.health_regen_bonus_perc) + stats.health_regen_bonus
+        stats.armor = formulas.stat_growth(stats.armor_base, stats.armor_level, level) + stats.armor_bonus
+        stats.magic_resist = formulas.stat_growth(stats.magic_resist_base, stats.magic_resist_level, level) + stats.magic_resist_bonus
+        stats.attack_damage = formulas.stat_growth(stats.attack_damage_base, stats.attack_damage_level, level) + stats.attack_damage_bonus
+        stats.resource = formulas.stat_growth(stats.resource_base, stats.resource_level, level) + stats.resource_bonus
+        stats.resource_regen = formulas.stat_growth(stats.resource_regen_base, stats.resource_regen_level, level) * (1 + stats.resource_regen_bonus_perc) + stats.resource_regen_bonus
+        stats.attack_range = stats.attack_range_base + stats.attack_range_bonus
+        stats.crit_chance_total = min(stats.crit_chance + stats.crit_chance_bonus, 1.0)
+        stats.crit_damage = BASE_CRIT_DAMAGE + stats.crit_damage_bonus
+        stats.move_speed = formulas.move_speed(
+            stats.move_speed_base,
+            stats.move_speed_bonus_flat,
+            stats.move_speed_bonus_perc,
+            stats.move_speed_bonus_mult,
+            0.0,
+            stats.slow_resist
+        )
+
+        # Attack speed growth is listed in percent and scales with the attack speed ratio
+        stats.attack_speed = formulas.attack_speed(
+            stats.attack_speed_base,
+            stats.attack_speed_level / 100,
+            level,
+            stats.attack_speed_ratio or stats.attack_speed_base,
+            stats.attack_speed_bonus
+        )
+
+        stats.health_current, stats.health_missing = stats.health, 0.0
+        stats.resource_current, stats.resource_missing = stats.resource, 0.0
+        return self
+
+    def apply_items(self, item_stats: Iterable[Mapping[str, Any]]) -> "Champion":
+        """
+        Replaces the item bonuses with the summed stats of the given items and recomputes total stats.
+
+        :param item_stats: The `stats` of each item in the build (Community Dragon stat keys).
+        :type item_stats: Iterable[Mapping[str, Any]]
+
+        :return: The champion, for chaining.
+        :rtype: Champion
+        """
+        bonuses = dict.fromkeys(ITEM_STATS.values(), 0.0)
+        for stats in item_stats:
+            for key, field in ITEM_STATS.items():
+                value = stats.get(key)
+                if not isinstance(value, (int, float)) or not value:
+                    continue
+                if field in MULTIPLICATIVE_STATS:
+                    bonuses[field] = 1 - (1 - bonuses[field]) * (1 - value)
+                else:
+                    bonuses[field] += value
+
+        for field, value in bonuses.items():
+            setattr(self.stats, field, value)
+        return self.set_level(self.level)
+
     def as_dict(self) -> dict[str, Any]:
         """Returns the champion data as a dictionary."""
         return asdict(self)
@@ -0,0 +1,272 @@
+# movement.py
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Iterable, Iterator
+import formulas
+from models import Champion
+
+"""
+This module simulates chasing and kiting between two champions on a line.
+
+The chaser walks straight at the target. A fleeing target runs straight away; a kiter stands still for each
+attack windup and walks away for the rest of the attack, without retreating past its attack range. Distances
+are center to center, and every phase has constant speeds, so times are solved exactly rather than stepped;
+each attack cycle closes the gap by the same amount, so the cycle a kiter is caught in is solved directly.
+Pairs are evaluated in plain Python, one kiter row at a time per scenario of speed bonuses and slows, with
+chasers sharing a movement speed and attack range evaluated once.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+WINDUP: float = 0.3 # Fraction of an attack spent winding up (Data Dragon has no per-champion windups)
+
+def chase_time(chaser_speed: float, chaser_range: float, target_speed: float, gap: float) -> float:
+    """
+    Time for a chaser to get a fleeing target in range.
+
+    :param chaser_speed: Chaser movement speed.
+    :type chaser_speed: float
+
+    :param chaser_range: Chaser attack range.
+    :type chaser_range: float
+
+    :param target_speed: Target movement speed.
+    :type target_speed: float
+
+    :param gap: Starting distance.
+    :type gap: float
+
+    :return: Seconds until the target is in range, `math.inf` if never.
+    :rtype: float
+    """
+    if gap <= chaser_range:
+        return 0.0
+    closing = chaser_speed - target_speed
+    return (gap - chaser_range) / closing if closing > 0 else math.inf
+
+def kite(kiter_speed: float, kiter_range: float, period: float, windup: float, chaser_speed: float, chaser_range: float, gap: float, duration: float) -> tuple[int, float]:
+    """
+    Kite a chaser: wait until it walks into range, then alternate standing attacks and walking away.
+
+    :param kiter_speed: Kiter movement speed.
+    :type kiter_speed: float
+
+    :param kiter_range: Kiter attack range.
+    :type kiter_range: float
+
+    :param period: Seconds per attack (`1 / attack_speed`).
+    :type period: float
+
+    :param windup: Seconds standing still before an attack lands.
+    :type windup: float
+
+    :param chaser_speed: Chaser movement speed.
+    :type chaser_speed: float
+
+    :param chaser_range: Chaser attack range.
+    :type chaser_range: float
+
+    :param gap: Starting distance.
+    :type gap: float
+
+    :param duration: Seconds simulated.
+    :type duration: float
+
+    :return: Attacks landed before the chaser gets the kiter in range, and when it does (`math.inf` if not
+        within `duration`).
+    :rtype: tuple[int, float]
+    """
+    if gap <= chaser_range:
+        return 0, 0.0
+
+    if chaser_speed <= 0:
+        if gap > kiter_range or duration < windup:
+            return 0, math.inf
+        return int((duration - windup) / period) + 1, math.inf
+
+    if kiter_range <= chaser_range:
+        caught = (gap - chaser_range) / chaser_speed
+        return 0, caught if caught <= duration else math.inf
+
+    # Hold position until the chaser walks into range
+    time = max(gap - kiter_range, 0.0) / chaser_speed
+    gap = min(gap, kiter_range)
+    closing = chaser_speed - kiter_speed
+    cycles = int((duration - windup - time) / period) + 1 if time + windup <= duration else 0
+
+    if cycles:
+        # Every attack cycle shrinks the gap by the same amount, so the first cycle the chaser reaches the
+        # kiter in (while it stands for the windup, or walks away) is solved directly
+        move = period - windup
+        shrink = chaser_speed * windup + closing * move
+        in_windup = first_cycle(gap - chaser_speed * windup - chaser_range, shrink)
+        in_move = first_cycle(gap - shrink - chaser_range, shrink) if closing > 0 else math.inf
+        cycle = min(in_windup, in_move)
+
+        if cycle < cycles:
+            start = time + cycle * period
+            gap -= cycle * shrink
+            if in_windup <= in_move:
+                return cycle, start + (gap - chaser_range) / chaser_speed
+            caught = start + windup + (gap - chaser_speed * windup - chaser_range) / closing
+            return cycle + 1, caught if caught <= duration else math.inf
+
+        autos = cycles
+        time += cycles * period
+        gap -= cycles * shrink if shrink > 0 else 0.0
+    else:
+        autos = 0
+
+    # Walk away for the rest of the window
+    if closing > 0 and time + (gap - chaser_range) / closing <= duration:
+        return autos, time + (gap - chaser_range) / closing
+    return autos, math.inf
+
+def first_cycle(excess: float, shrink: float) -> float:
+    """First cycle at which a gap `excess` beyond range, shrinking by `shrink` per cycle, closes (`math.inf` if never)."""
+    if excess <= 0:
+        return 0
+    if shrink <= 0:
+        return math.inf
+
+    cycle = math.ceil(excess / shrink)
+    if excess - cycle * shrink > 0: # Rounding
+        cycle += 1
+    elif cycle > 1 and excess - (cycle - 1) * shrink <= 0:
+        cycle -= 1
+    return cycle
+
+def mover_columns(champions: Iterable[Champion], flat: float = 0.0, percent: float = 0.0, slow: float = 0.0) -> dict[str, list[float]]:
+    """
+    Movement inputs of champions, with extra movement speed bonuses and a slow.
+
+    :param champions: The champions, with level and items applied.
+    :type champions: Iterable[Champion]
+
+    :param flat: Extra flat movement speed (defaults to `0.0`).
+    :type flat: float
+
+    :param percent: Extra percent movement speed, e.g. `0.1` for 10% (defaults to `0.0`).
+    :type percent: float
+
+    :param slow: Slow applied, reduced by each champion's slow resist (defaults to `0.0`).
+    :type slow: float
+
+    :return: `speed`, `range`, `period` and `windup` columns.
+    :rtype: dict[str, list[float]]
+    """
+    columns = {"speed": [], "range": [], "period": [], "windup": []}
+    for champion in champions:
+        s = champion.stats
+        period = 1 / s.attack_speed if s.attack_speed > 0 else math.inf
+        columns["speed"].append(formulas.move_speed(
+            s.move_speed_base,
+            s.move_speed_bonus_flat + flat,
+            s.move_speed_bonus_perc + percent,
+            s.move_speed_bonus_mult,
+            slow,
+            s.slow_resist
+        ))
+        columns["range"].append(s.attack_range)
+        columns["period"].append(period)
+        columns["windup"].append(period * WINDUP)
+
+    return columns
+
+def kite_row(kiter: int, kiters: dict[str, list[float]], chasers: dict[str, list[float]], gap: float, duration: float, index: list[int] | None = None) -> tuple[list[int], list[float | None], list[float | None]]:
+    """
+    Kite and chase results of one kiter against every chaser, with `index` mapping each champion to its
+    row of `chasers` if they were deduplicated.
+
+    :return: Attacks landed, time caught while kiting and time caught while fleeing (`None` if never).
+    :rtype: tuple[list[int], list[float | None], list[float | None]]
+    """
+    speed, attack_range = kiters["speed"][kiter], kiters["range"][kiter]
+    period, windup = kiters["period"][kiter], kiters["windup"][kiter]
+
+    autos, caught, chased = [], [], []
+    for chaser_speed, chaser_range in zip(chasers["speed"], chasers["range"]):
+        landed, time = kite(speed, attack_range, period, windup, chaser_speed, chaser_range, gap, duration)
+        flee = chase_time(chaser_speed, chaser_range, speed, gap)
+        autos.append(landed)
+        caught.append(None if math.isinf(time) else time)
+        chased.append(flee if flee <= duration else None)
+
+    if index is not None:
+        autos, caught, chased = [autos[i] for i in index], [caught[i] for i in index], [chased[i] for i in index]
+    return autos, caught, chased
+
+def kite_matrix(champ_data: dict[str, Any], champ_ids: Iterable[str] | None = None, level: int = 18, gap: float = 800.0, duration: float = 10.0, bonuses: Iterable[tuple[float, float]] = ((0.0, 0.0),), slows: Iterable[float] = (0.0,), processes: int | None = 1) -> Iterator[dict[str, Any]]:
+    """
+    Kite every champion against every other, for each combination of movement speed bonus and slow.
+
+    :param champ_data: Merged champion data.
+    :type champ_data: dict[str, Any]
+
+    :param champ_ids: Champions to analyse (defaults to all).
+    :type champ_ids: Iterable[str] | None, optional
+
+    :param level: Champion level (defaults to `18`).
+    :type level: int
+
+    :param gap: Starting distance (defaults to `800.0`).
+    :type gap: float
+
+    :param duration: Seconds simulated (defaults to `10.0`).
+    :type duration: float
+
+    :param bonuses: (flat, percent) movement speed bonuses given to both champions (defaults to none).
+    :type bonuses: Iterable[tuple[float, float]]
+
+    :param slows: Slows applied to the chaser (defaults to none).
+    :type slows: Iterable[float]
+
+    :param processes: Number of worker processes, `None` for one per CPU (defaults to `1`).
+    :type processes: int | None, optional
+
+    :return: One entry per combination with `champions` and matrices indexed [kiter][chaser]: `autos`
+        landed, `caught` time while kiting and `chased` time while fleeing (`None` if never).
+    :rtype: Iterator[dict[str, Any]]
+    """
+    champions = []
+    for champ_id in (champ_data if champ_ids is None else champ_ids):
+        records = champ_data.get(champ_id, {}).get("records_ddragon")
+        if not records:
+            logging.warning(f"Missing Data Dragon records for {champ_id}.")
+            continue
+        champions.append(Champion.from_json(champ_id, records).set_level(level))
+
+    slows = list(slows)
+    executor = ProcessPoolExecutor(max_workers=processes) if processes != 1 else None
+    try:
+        for flat, percent in bonuses:
+            kiters = mover_columns(champions, flat, percent)
+            for slow in slows:
+                chasers = mover_columns(champions, flat, percent, slow)
+
+                # Chasers with the same speed and range (e.g. base movement speed and melee range) share results
+                distinct = list(dict.fromkeys(zip(chasers["speed"], chasers["range"])))
+                index = None
+                if len(distinct) < len(champions):
+                    position = {chaser: i for i, chaser in enumerate(distinct)}
+                    index = [position[chaser] for chaser in zip(chasers["speed"], chasers["range"])]
+                    chasers = {"speed": [speed for speed, _ in distinct], "range": [attack_range for _, attack_range in distinct]}
+
+                run = partial(kite_row, kiters=kiters, chasers=chasers, gap=gap, duration=duration, index=index)
+                rows = range(len(champions))
+                results = list(executor.map(run, rows, chunksize=8) if executor else map(run, rows))
+                yield {
+                    "champions": [champion.name for champion in champions],
+                    "level": level,
+                    "flat": flat,
+                    "percent": percent,
+                    "slow": slow,
+                    "autos": [autos for autos, _, _ in results],
+                    "caught": [caught for _, caught, _ in results],
+                    "chased": [chased for _, _, chased in results]
+                }
+    finally:
+        if executor:
+            executor.shutdown()
@@ -0,0 +1,109 @@
+# projection.py
+import copy
+from typing import Any, Callable, Iterable, Iterator
+
+"""
+This module compiles declarative record schemas into projectors used by the `clean_*` functions.
+
+A schema is a dictionary with any of the following rules:
+    "fields": {output key: (path, default)} - copy (and rename or flatten) values in the given order,
+              where `path` is a source key or a tuple of nested keys.
+    "keep":   source keys copied unchanged when present.
+    "drop":   source keys removed.
+    "rest":   output key collecting every source key that is neither kept nor dropped.
+
+The compiled projector makes a single pass over each record.
+"""
+
+Projector = Callable[[dict[str, Any]], dict[str, Any]]
+
+def compile_field(path: str | tuple[str, ...], default: Any) -> Callable[[dict[str, Any]], Any]:
+    """
+    Compile a field rule into a getter.
+
+    :param path: A source key, or a tuple of nested source keys to flatten.
+    :type path: str | tuple[str, ...]
+
+    :param default: The value used if the path is missing; mutable defaults are copied per record.
+    :type default: Any
+
+    :return: A function returning the value at `path` of a record.
+    :rtype: Callable[[dict[str, Any]], Any]
+    """
+    make_default = (lambda: copy.copy(default)) if isinstance(default, (dict, list, set)) else (lambda: default)
+
+    if isinstance(path, str) or len(path) == 1:
+        key = path if isinstance(path, str) else path[0]
+
+        def get_key(record: dict[str, Any]) -> Any:
+            return record[key] if key in record else make_default()
+
+        return get_key
+
+    def get_path(record: dict[str, Any]) -> Any:
+        for key in path:
+            if not isinstance(record, dict) or key not in record:
+                return make_default()
+            record = record[key]
+        return record
+
+    return get_path
+
+def compile_projection(schema: dict[str, Any]) -> Projector:
+    """
+    Compile a declarative schema into a projector.
+
+    :param schema: The schema, see the module documentation.
+    :type schema: dict[str, Any]
+
+    :return: A function projecting a source record into an output record.
+    :rtype: Projector
+    """
+    fields = [
+        (output_key, compile_field(*rule))
+        for output_key, rule in schema.get("fields", {}).items()
+    ]
+    keep = frozenset(schema.get("keep", ()))
+    drop = frozenset(schema.get("drop", ()))
+    rest = schema.get("rest")
+
+    # Keys that are neither kept nor collected are skipped
+    actions = {key: "drop" for key in drop}
+    actions.update({key: "keep" for key in keep})
+    scan = bool(keep) or rest is not None
+
+    def project(record: dict[str, Any]) -> dict[str, Any]:
+        projected = {output_key: getter(record) for output_key, getter in fields}
+        if not scan:
+            return projected
+
+        collected = {}
+        for key, value in record.items():
+            action = actions.get(key)
+            if action == "keep":
+                projected[key] = value
+            elif action is None and rest is not None:
+                collected[key] = value
+
+        if rest is not None:
+            projected[rest] = collected
+        return projected
+
+    return project
+
+def project_records(projector: Projector, records: Iterable[tuple[str, dict[str, Any]]]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Apply a projector to streamed `(id, record)` pairs, such as `dict.items()`.
+
+    :param projector: The compiled projector.
+    :type projector: Projector
+
+    :param records: The source records.
+    :type records: Iterable[tuple[str, dict[str, Any]]]
+
+    :return: The projected records.
+    :rtype: Iterator[tuple[str, dict[str, Any]]]
+    """
+    for record_id, record in records:
+        if isinstance(record, dict):
+            yield record_id, projector(record)
@@ -0,0 +1,171 @@
+# recipes.py
+import logging
+from typing import Any
+from constants import RECIPE_VERSION, STAT_MAP
+
+"""
+This module builds the item recipe graph and precomputes gold values and gold efficiency.
+
+`build_recipe_graph` annotates every item with a `recipe` entry at ingestion, so the lookups below are
+plain dictionary reads.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+STAT_KEYS: tuple[str, ...] = tuple(dict.fromkeys(STAT_MAP.values()))
+
+def item_stats(item: dict[str, Any]) -> dict[str, float]:
+    """
+    Extract the non-zero `STAT_MAP` stats of an item.
+
+    :param item: Item data.
+    :type item: dict[str, Any]
+
+    :return: Mapping of Community Dragon stat key to value.
+    :rtype: dict[str, float]
+    """
+    stats = item.get("stats", {})
+    return {
+        key: float(stats[key])
+        for key in STAT_KEYS
+        if isinstance(stats.get(key), (int, float)) and stats[key]
+    }
+
+def stat_gold_values(item_data: dict[str, Any]) -> dict[str, float]:
+    """
+    Derive the gold value of one unit of each stat from the cheapest basic item granting only that stat
+    (e.g. Long Sword for attack damage). Stats without such an item (e.g. ability haste or lethality) are
+    valued from the cheapest item whose other stats are all valued, by the gold left after those stats.
+
+    :param item_data: Combined item data.
+    :type item_data: dict[str, Any]
+
+    :return: Mapping of Community Dragon stat key to gold per unit; stats that cannot be valued are omitted
+        and logged.
+    :rtype: dict[str, float]
+    """
+    basics: dict[str, tuple[float, float]] = {}
+    carriers: list[tuple[float, dict[str, float]]] = []
+    for item in item_data.values():
+        stats = item_stats(item)
+        gold = item.get("gold", -1)
+        if not stats or gold <= 0:
+            continue
+
+        carriers.append((gold, stats))
+        if item.get("from") or len(stats) != 1:
+            continue
+
+        (key, value), = stats.items()
+        if key not in basics or gold < basics[key][0]:
+            basics[key] = (gold, value)
+
+    values = {key: gold / value for key, (gold, value) in basics.items()}
+
+    # Each round values the stats that are the only unvalued stat of some item, so that the result does
+    # not depend on item order; a stat valued in one round can value others in the next
+    while True:
+        derived: dict[str, tuple[float, float]] = {}
+        for gold, stats in carriers:
+            unvalued = [key for key in stats if key not in values]
+            if len(unvalued) != 1:
+                continue
+
+            key = unvalued[0]
+            remaining = gold - sum(value * values[other] for other, value in stats.items() if other != key)
+            if remaining > 0 and (key not in derived or gold < derived[key][0]):
+                derived[key] = (gold, remaining / stats[key])
+
+        if not derived:
+            break
+        values.update((key, value) for key, (_, value) in derived.items())
+
+    unvalued = sorted({key for _, stats in carriers for key in stats} - values.keys())
+    if unvalued:
+        logging.warning(f"No gold value for {', '.join(unvalued)}; left out of gold efficiency.")
+
+    return values
+
+def build_recipe_graph(item_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Annotate every item with its recipe links, component costs, full build path, stat gold value and
+    gold efficiency, computed for all items in a single pass.
+
+    :param item_data: Combined item data.
+    :type item_data: dict[str, Any]
+
+    :return: The same item data, with a `recipe` entry added to each item.
+    :rtype: dict[str, Any]
+    """
+    if not isinstance(item_data, dict):
+        logging.warning("Invalid or empty item data received.")
+        return {}
+
+    gold_values = stat_gold_values(item_data)
+    build_paths: dict[str, list[str]] = {}
+
+    def resolve_path(item_id: str, visiting: frozenset[str] = frozenset()) -> list[str]:
+        if item_id in build_paths:
+            return build_paths[item_id]
+
+        components = [component for component in item_data[item_id].get("from", []) if component in item_data]
+        if not components or item_id in visiting:
+            path = [item_id]
+        else:
+            path = [leaf for component in components for leaf in resolve_path(component, visiting | {item_id})]
+
+        build_paths[item_id] = path
+        return path
+
+    for item_id, item in item_data.items():
+        components = [component for component in item.get("from", []) if component in item_data]
+        builds_into = [parent for parent in item.get("into", []) if parent in item_data]
+
+        gold = item.get("gold", -1)
+        components_gold = sum(item_data[component].get("gold", 0) for component in components)
+        stat_gold = sum(value * gold_values.get(key, 0.0) for key, value in item_stats(item).items())
+
+        item["recipe"] = {
+            "from": components,
+            "into": builds_into,
+            "components_gold": components_gold,
+            "combine_gold": gold - components_gold,
+            "build_path": resolve_path(item_id),
+            "stat_gold": stat_gold,
+            "gold_efficiency": stat_gold / gold if gold > 0 else None,
+            "version": RECIPE_VERSION
+        }
+
+    return item_data
+
+def is_current(item_data: dict[str, Any]) -> bool:
+    """Whether every item was annotated by this version of `build_recipe_graph`."""
+    return all(item.get("recipe", {}).get("version") == RECIPE_VERSION for item in item_data.values())
+
+def components(item_data: dict[str, Any], item_id: str) -> list[str]:
+    """Direct components of an item."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("from", [])
+
+def builds_into(item_data: dict[str, Any], item_id: str) -> list[str]:
+    """Items that an item builds into."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("into", [])
+
+def build_path(item_data: dict[str, Any], item_id: str) -> list[str]:
+    """Basic components needed to build an item, including repeats."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("build_path", [item_id])
+
+def components_gold(item_data: dict[str, Any], item_id: str) -> float:
+    """Total cost of an item's direct components."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("components_gold", 0)
+
+def combine_gold(item_data: dict[str, Any], item_id: str) -> float:
+    """Gold needed to combine an item once its components are owned."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("combine_gold", 0)
+
+def stat_gold(item_data: dict[str, Any], item_id: str) -> float:
+    """Gold value of an item's stats."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("stat_gold", 0.0)
+
+def gold_efficiency(item_data: dict[str, Any], item_id: str) -> float | None:
+    """Gold value of an item's stats divided by its total cost (`1.0` is 100% gold efficient)."""
+    return item_data.get(item_id, {}).get("recipe", {}).get("gold_efficiency")
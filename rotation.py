@@ -0,0 +1,264 @@
+# rotation.py
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from operator import le
+from typing import Any, Iterable, Iterator
+import formulas
+import spells
+import teamfight
+from models import Champion
+
+"""
+This module finds the damage-maximizing sequence of abilities and auto attacks over a time window.
+
+Time is split into ticks. A state is the current tick and the remaining cooldown (in ticks) of every
+ability, with cooldowns clamped to the ticks left in the window, since any cooldown outlasting the window
+is equivalent. States are expanded in time order, keeping only the most damaging way to reach each one,
+so every subproblem is solved once; the best rotation is traced back from the best final state.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+CAST_TIME: float = 0.25 # Seconds spent casting an ability
+
+AUTO_ATTACK, WAIT = "Auto", "Wait"
+
+@dataclass
+class Rotation:
+    """Best rotation over a time window."""
+    damage: float
+    window: float
+    sequence: list[tuple[float, str]]
+
+    @property
+    def dps(self) -> float:
+        return self.damage / self.window if self.window > 0 else 0.0
+
+def action_damage(champion: Champion, abilities: list[teamfight.Ability], armor: float = 0.0, magic_resist: float = 0.0) -> list[float]:
+    """
+    Post-mitigation damage of an auto attack (average, with crits) followed by each ability.
+
+    :param champion: The champion, with level and items applied.
+    :type champion: Champion
+
+    :param abilities: The abilities.
+    :type abilities: list[teamfight.Ability]
+
+    :param armor: Target armor (defaults to `0.0`).
+    :type armor: float
+
+    :param magic_resist: Target magic resist (defaults to `0.0`).
+    :type magic_resist: float
+
+    :return: Damage per action.
+    :rtype: list[float]
+    """
+    s = champion.stats
+    raw = [formulas.avg_damage_per_attack(s.attack_damage, s.crit_chance_total, s.crit_damage)]
+    raw += [ability.damage + ability.ap_ratio * s.ability_power + ability.bonus_ad_ratio * s.attack_damage_bonus for ability in abilities]
+    types = [teamfight.PHYSICAL] + [ability.damage_type for ability in abilities]
+
+    zeros = [0.0] * len(raw)
+    pen_perc = (s.ar_pen_perc, s.mr_pen_perc, 0.0)
+    pen_flat = (s.ar_pen_flat, s.mr_pen_flat, 0.0)
+    resists = (armor, magic_resist, 0.0)
+    return formulas.post_mitigation_damage(
+        raw,
+        types,
+        zeros,
+        zeros,
+        [pen_perc[kind] for kind in types],
+        [pen_flat[kind] for kind in types],
+        [resists[kind] for kind in types],
+        zeros,
+        zeros,
+        zeros,
+        zeros,
+        zeros
+    )
+
+def ticks(seconds: float, tick: float) -> int:
+    """Whole ticks needed to cover a duration (at least one)."""
+    return max(1, math.ceil(seconds / tick - 1e-9))
+
+def prune(layer: dict[tuple[int, ...], tuple]) -> dict[tuple[int, ...], tuple]:
+    """
+    Drop dominated states: those with no less cooldown on every ability and no more damage than another.
+
+    :param layer: Cooldown states of one tick and their best (damage, ...) entries.
+    :type layer: dict[tuple[int, ...], tuple]
+
+    :return: The non-dominated states.
+    :rtype: dict[tuple[int, ...], tuple]
+    """
+    kept = {}
+    for state, entry in sorted(layer.items(), key=lambda item: (-item[1][0], sum(item[0]))):
+        if not any(all(map(le, other, state)) for other in kept):
+            kept[state] = entry
+    return kept
+
+def optimize(champion: Champion, abilities: list[teamfight.Ability], window: float = 10.0, tick: float = 0.25, armor: float = 0.0, magic_resist: float = 0.0, haste: float | None = None) -> Rotation:
+    """
+    Find the damage-maximizing rotation. Every action deals its damage when it starts; abilities take
+    `CAST_TIME`, auto attacks one attack period and waiting one tick.
+
+    :param champion: The champion, with level and items applied.
+    :type champion: Champion
+
+    :param abilities: The abilities, e.g. from `teamfight.abilities_from_ddragon`.
+    :type abilities: list[teamfight.Ability]
+
+    :param window: Length of the window in seconds (defaults to `10.0`).
+    :type window: float
+
+    :param tick: Time resolution in seconds (defaults to `0.25`).
+    :type tick: float
+
+    :param armor: Target armor (defaults to `0.0`).
+    :type armor: float
+
+    :param magic_resist: Target magic resist (defaults to `0.0`).
+    :type magic_resist: float
+
+    :param haste: General ability haste replacing the champion's `ability_haste` (defaults to `None`).
+    :type haste: float | None, optional
+
+    :return: The best rotation.
+    :rtype: Rotation
+    """
+    s = champion.stats
+    general = s.ability_haste if haste is None else haste
+    steps = ticks(window, tick)
+
+    damage = action_damage(champion, abilities, armor, magic_resist)
+    names = [AUTO_ATTACK] + [ability.name or str(slot) for slot, ability in enumerate(abilities)]
+    cooldowns = [
+        ticks(formulas.ability_cooldown(ability.cooldown, general + (s.ability_haste_ultim if ability.ultimate else s.ability_haste_basic)), tick)
+        for ability in abilities
+    ]
+
+    # Actions: (name, damage, duration in ticks, ability index or -1)
+    actions = [(names[0], damage[0], ticks(1 / s.attack_speed, tick) if s.attack_speed > 0 else steps, -1)]
+    actions += [(names[slot + 1], damage[slot + 1], ticks(CAST_TIME, tick), slot) for slot in range(len(abilities)) if damage[slot + 1] > 0]
+    wait = len(actions)
+
+    # layers[t] maps a cooldown state to its best (damage, parent tick, parent state, action)
+    layers: list[dict[tuple[int, ...], tuple[float, int, tuple[int, ...] | None, int]]] = [{} for _ in range(steps)]
+    layers[0][(0,) * len(abilities)] = (0.0, -1, None, -1)
+    best = (0.0, -1, None, -1)
+
+    for t in range(steps):
+        for state, (value, *_) in prune(layers[t]).items():
+            # Wait one tick, or until an ability comes off cooldown
+            moves = [(action, gain, duration, slot) for action, (_, gain, duration, slot) in enumerate(actions) if slot < 0 or not state[slot]]
+            moves += [(wait, 0.0, delay, -1) for delay in set(state) | {1} if delay]
+
+            for action, gain, duration, slot in moves:
+                after = t + duration
+                total = value + gain
+                if after >= steps:
+                    if total > best[0]:
+                        best = (total, t, state, action)
+                    continue
+
+                remaining = steps - after
+                cooled = [min(cooldown - duration, remaining) if cooldown > duration else 0 for cooldown in state]
+                if slot >= 0:
+                    cooled[slot] = min(cooldowns[slot] - duration, remaining) if cooldowns[slot] > duration else 0
+                cooled = tuple(cooled)
+
+                known = layers[after].get(cooled)
+                if known is None or total > known[0]:
+                    layers[after][cooled] = (total, t, state, action)
+
+    sequence = []
+    _, t, state, action = best
+    while state is not None:
+        sequence.append((t * tick, actions[action][0] if action < wait else WAIT))
+        _, t, state, action = layers[t][state]
+    sequence.reverse()
+
+    return Rotation(damage=best[0], window=window, sequence=[step for step in sequence if step[1] != WAIT])
+
+def champion_rotations(champ_id: str, champ: dict[str, Any], levels: list[int], ranks: list[tuple[int, ...]], hastes: list[float], windows: list[float], spell_table: spells.SpellTable | None = None, **kwargs) -> list[dict[str, Any]]:
+    """Rotations of one champion for every level, rank, haste and window combination, with abilities from `spell_table` if given."""
+    records = champ.get("records_ddragon")
+    if not records:
+        logging.warning(f"Missing Data Dragon records for {champ_id}.")
+        return []
+
+    champion = Champion.from_json(champ_id, records)
+    spell_data = champ.get("spells_ddragon", {})
+    use_table = spell_table is not None and champ_id in spell_table.rows
+
+    results = []
+    for level in levels:
+        champion.set_level(level)
+        for rank in ranks:
+            abilities = spell_table.abilities(champ_id, rank) if use_table else teamfight.abilities_from_ddragon(spell_data, rank)
+            for haste in hastes:
+                for window in windows:
+                    rotation = optimize(champion, abilities, window, haste=haste, **kwargs)
+                    results.append({
+                        "champion": champ_id,
+                        "level": level,
+                        "ranks": list(rank),
+                        "haste": haste,
+                        "window": window,
+                        "damage": rotation.damage,
+                        "dps": rotation.dps,
+                        "sequence": rotation.sequence
+                    })
+
+    return results
+
+def rotation_table(champ_data: dict[str, Any], champ_ids: Iterable[str] | None = None, levels: Iterable[int] = (18,), ranks: Iterable[Iterable[int]] = ((5, 5, 5, 3),), hastes: Iterable[float] = (0.0,), windows: Iterable[float] = (10.0,), processes: int | None = 1, spell_table: spells.SpellTable | None = None, **kwargs) -> Iterator[dict[str, Any]]:
+    """
+    Compute best rotations across champions, levels, spell ranks, ability haste values and windows, e.g. a
+    short window for burst and a long one for sustained damage per second.
+
+    :param champ_data: Merged champion data.
+    :type champ_data: dict[str, Any]
+
+    :param champ_ids: Champions to analyse (defaults to all).
+    :type champ_ids: Iterable[str] | None, optional
+
+    :param levels: Champion levels (defaults to `(18,)`).
+    :type levels: Iterable[int]
+
+    :param ranks: Spell ranks in slot order (Q, W, E, R) (defaults to `((5, 5, 5, 3),)`).
+    :type ranks: Iterable[Iterable[int]]
+
+    :param hastes: General ability haste values (defaults to `(0.0,)`).
+    :type hastes: Iterable[float]
+
+    :param windows: Window lengths in seconds (defaults to `(10.0,)`).
+    :type windows: Iterable[float]
+
+    :param processes: Number of worker processes, `None` for one per CPU (defaults to `1`).
+    :type processes: int | None, optional
+
+    :param spell_table: Compiled spells of `champ_data` (defaults to compiling them once here).
+    :type spell_table: spells.SpellTable | None, optional
+
+    :param kwargs: Keyword arguments passed to `optimize` (`tick`, `armor`, `magic_resist`).
+
+    :return: One entry per combination with its `damage`, `dps` and `sequence` of (time, action).
+    :rtype: Iterator[dict[str, Any]]
+    """
+    champ_ids = list(champ_data if champ_ids is None else champ_ids)
+    spell_table = spells.SpellTable.from_champs(champ_data) if spell_table is None else spell_table
+    run = partial(champion_rotations, levels=list(levels), ranks=[tuple(rank) for rank in ranks], hastes=list(hastes), windows=list(windows), spell_table=spell_table, **kwargs)
+    champs = [champ_data.get(champ_id, {}) for champ_id in champ_ids]
+
+    if processes == 1:
+        for champ_id, champ in zip(champ_ids, champs):
+            yield from run(champ_id, champ)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for results in executor.map(run, champ_ids, champs, chunksize=4):
+            yield from results
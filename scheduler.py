@@ -0,0 +1,236 @@
+# scheduler.py
+import heapq
+import itertools
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlparse
+import requests
+from constants import HOST_LIMITS, PRIORITIES
+
+"""
+This module schedules all HTTP requests, per host.
+
+Each host has a token bucket limiting the request rate and an adaptive concurrency limit. Waiting requests
+are admitted in priority order (see `constants.PRIORITIES`), then first come, first served. The concurrency
+limit grows additively while responses are fast and successful, and is halved on errors and throttling;
+a `Retry-After` pauses the host and the throttled request is retried.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+THROTTLED_STATUSES: set[int] = {429, 503}
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens. Not thread-safe."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take a token if one is available.
+
+        :return: `0.0` if a token was taken, otherwise the seconds until one is available.
+        :rtype: float
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+class HostLimiter:
+    """Admits requests to one host by priority, within its rate and adaptive concurrency limits."""
+
+    def __init__(self, host: str, limits: dict[str, float] = HOST_LIMITS):
+        self.host = host
+        self.limits = limits
+        self.bucket = TokenBucket(limits["rate"], limits["burst"])
+        self.concurrency = float(limits["initial_concurrency"])
+        self.active = 0
+        self.latency = 0.0 # Moving average of successful requests
+        self.paused_until = 0.0
+        self.stats: dict[str, int] = {"requests": 0, "errors": 0, "throttled": 0}
+
+        self._condition = threading.Condition()
+        self._waiting: list[tuple[int, int]] = []
+        self._tickets = itertools.count()
+
+    def acquire(self, priority: int) -> None:
+        """
+        Block until a request of the given priority may start.
+
+        :param priority: The priority class value, lower first.
+        :type priority: int
+        """
+        with self._condition:
+            ticket = (priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] == ticket and self.active < int(self.concurrency):
+                        timeout = self.paused_until - time.monotonic()
+                        if timeout <= 0:
+                            timeout = self.bucket.take()
+                            if timeout == 0:
+                                break
+                    self._condition.wait(timeout)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+
+            heapq.heappop(self._waiting)
+            self.active += 1
+            self.stats["requests"] += 1
+            self._condition.notify_all()
+
+    def release(self, latency: float, success: bool, retry_after: float | None = None) -> None:
+        """
+        Finish a request and adapt the concurrency limit to its outcome.
+
+        :param latency: Duration of the request in seconds.
+        :type latency: float
+
+        :param success: Whether the request succeeded.
+        :type success: bool
+
+        :param retry_after: Seconds to pause the host after throttling, if any (defaults to `None`).
+        :type retry_after: float | None, optional
+        """
+        with self._condition:
+            self.active -= 1
+
+            if retry_after is not None:
+                self.stats["throttled"] += 1
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+            if not success:
+                self.stats["errors"] += 1
+                self.concurrency = max(self.limits["min_concurrency"], self.concurrency / 2)
+            else:
+                self.latency = latency if not self.latency else 0.8 * self.latency + 0.2 * latency
+                if self.latency > self.limits["target_latency"]:
+                    self.concurrency = max(self.limits["min_concurrency"], self.concurrency * 0.9)
+                else:
+                    self.concurrency = min(self.limits["max_concurrency"], self.concurrency + 1 / self.concurrency)
+
+            self._condition.notify_all()
+
+    def info(self) -> dict[str, Any]:
+        """Current limits and counters."""
+        with self._condition:
+            return {**self.stats, "concurrency": self.concurrency, "active": self.active, "waiting": len(self._waiting), "latency": self.latency}
+
+def retry_after_seconds(value: str | None, default: float) -> float:
+    """
+    Parse a `Retry-After` header, given either in seconds or as an HTTP date.
+
+    :param value: The header value.
+    :type value: str | None
+
+    :param default: Seconds to use if the header is missing or invalid.
+    :type default: float
+
+    :return: Seconds to wait.
+    :rtype: float
+    """
+    if not value:
+        return default
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+class Scheduler:
+    """Routes requests through one `HostLimiter` per host."""
+
+    def __init__(self, limits: dict[str, float] = HOST_LIMITS):
+        self.limits = limits
+        self.hosts: dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> HostLimiter:
+        """The limiter of a host, created on first use."""
+        with self._lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostLimiter(host, self.limits)
+            return self.hosts[host]
+
+    def request(self, method: str, url: str, priority: str = "bulk", **kwargs) -> requests.Response:
+        """
+        Send a request once its host admits it, retrying throttled requests after their `Retry-After`.
+
+        :param method: The HTTP method, e.g. `"GET"`.
+        :type method: str
+
+        :param url: The URL.
+        :type url: str
+
+        :param priority: A `constants.PRIORITIES` class (defaults to `"bulk"`).
+        :type priority: str
+
+        :param kwargs: Keyword arguments passed to `requests.request`.
+
+        :return: The last response.
+        :rtype: requests.Response
+
+        :raises requests.RequestException: If the request fails.
+        """
+        limiter = self.limiter(urlparse(url).netloc)
+        level = PRIORITIES.get(priority, max(PRIORITIES.values()))
+
+        for attempt in range(int(self.limits["retries"]) + 1):
+            limiter.acquire(level)
+            start = time.monotonic()
+            try:
+                response = requests.request(method, url, **kwargs)
+            except BaseException:
+                limiter.release(time.monotonic() - start, False)
+                raise
+
+            latency = time.monotonic() - start
+            if response.status_code in THROTTLED_STATUSES:
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"), 2.0 ** attempt)
+                limiter.release(latency, False, retry_after)
+                logging.warning(f"Throttled by {limiter.host} ({response.status_code}), retrying in {retry_after:.1f}s.")
+                continue
+
+            limiter.release(latency, response.status_code < 500)
+            return response
+
+        return response
+
+    def info(self) -> dict[str, dict[str, Any]]:
+        """Limits and counters of every host."""
+        with self._lock:
+            hosts = list(self.hosts.values())
+        return {limiter.host: limiter.info() for limiter in hosts}
+
+_scheduler = Scheduler()
+
+def request(method: str, url: str, priority: str = "bulk", **kwargs) -> requests.Response:
+    """Send a request through the shared scheduler, see `Scheduler.request`."""
+    return _scheduler.request(method, url, priority, **kwargs)
+
+def info() -> dict[str, dict[str, Any]]:
+    """Limits and counters of every host of the shared scheduler."""
+    return _scheduler.info()
@@ -0,0 +1,163 @@
+# sensitivity.py
+import logging
+from typing import Any, Callable, Iterable
+import formulas
+from constants import STAT_MAP
+from models import Champion, ITEM_STATS
+
+"""
+This module computes the marginal value of each item stat for champions, levels and builds.
+
+Every scenario (champion, level, build) is expanded into one baseline row plus one row per stat with that
+stat increased by one step, for the stats that feed an objective; every other stat has a gain of zero. The
+rows are laid out as columns and each objective is evaluated over all of them in a single finite-difference
+pass, in plain Python.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# One name per distinct Community Dragon stat key, e.g. "mFlatPhysicalDamageMod" -> "AttackDamage"
+STAT_NAMES: dict[str, str] = {}
+for stat_name, stat_key in STAT_MAP.items():
+    STAT_NAMES.setdefault(stat_key, stat_name)
+
+# Fractional stats are stepped by one percentage point, others by one point
+PERCENT_FIELDS: set[str] = {
+    "attack_speed_bonus", "crit_chance_bonus", "crit_damage_bonus", "life_steal", "omni_vamp",
+    "move_speed_bonus_perc", "heal_shield_power", "ar_pen_perc", "mr_pen_perc", "tenacity", "slow_resist",
+    "health_regen_bonus_perc", "resource_regen_bonus_perc",
+}
+
+# Bonus fields read by `stat_columns`; other stats leave every objective unchanged
+COLUMN_FIELDS: frozenset[str] = frozenset({
+    "attack_damage_bonus", "attack_speed_bonus", "crit_chance_bonus", "crit_damage_bonus", "health_bonus",
+    "armor_bonus", "magic_resist_bonus",
+})
+
+def dps(columns: dict[str, list[float]]) -> list[float]:
+    """Average auto attack damage per second."""
+    return [
+        formulas.avg_damage_per_attack(ad, crit, crit_mod) * attack_speed
+        for ad, crit, crit_mod, attack_speed in zip(columns["attack_damage"], columns["crit_chance"], columns["crit_damage"], columns["attack_speed"])
+    ]
+
+def ehp(columns: dict[str, list[float]]) -> list[float]:
+    """Effective health against physical damage."""
+    return [formulas.effective_health(health, armor) for health, armor in zip(columns["health"], columns["armor"])]
+
+def ehp_magic(columns: dict[str, list[float]]) -> list[float]:
+    """Effective health against magic damage."""
+    return [formulas.effective_health(health, mr) for health, mr in zip(columns["health"], columns["magic_resist"])]
+
+OBJECTIVES: dict[str, Callable[[dict[str, list[float]]], list[float]]] = {
+    "dps": dps,
+    "ehp": ehp,
+    "ehp_magic": ehp_magic,
+}
+
+def stat_step(stat_key: str) -> float:
+    """Step used to perturb a Community Dragon stat key."""
+    return 0.01 if ITEM_STATS.get(stat_key) in PERCENT_FIELDS else 1.0
+
+def stat_columns(champion: Champion, deltas: Iterable[dict[str, float]], columns: dict[str, list[float]]) -> None:
+    """
+    Append the objective inputs of a champion with each set of bonus deltas applied.
+
+    :param champion: The champion, with level and items applied.
+    :type champion: Champion
+
+    :param deltas: Bonus field -> delta, one mapping per row.
+    :type deltas: Iterable[dict[str, float]]
+
+    :param columns: Columns to append to.
+    :type columns: dict[str, list[float]]
+    """
+    s = champion.stats
+    for delta in deltas:
+        columns["attack_damage"].append(s.attack_damage + delta.get("attack_damage_bonus", 0.0))
+        columns["attack_speed"].append(formulas.attack_speed(
+            s.attack_speed_base,
+            s.attack_speed_level / 100,
+            champion.level,
+            s.attack_speed_ratio or s.attack_speed_base,
+            s.attack_speed_bonus + delta.get("attack_speed_bonus", 0.0)
+        ))
+        columns["crit_chance"].append(min(s.crit_chance + s.crit_chance_bonus + delta.get("crit_chance_bonus", 0.0), 1.0))
+        columns["crit_damage"].append(s.crit_damage + delta.get("crit_damage_bonus", 0.0))
+        columns["health"].append(s.health + delta.get("health_bonus", 0.0))
+        columns["armor"].append(s.armor + delta.get("armor_bonus", 0.0))
+        columns["magic_resist"].append(s.magic_resist + delta.get("magic_resist_bonus", 0.0))
+
+def stat_sensitivity(champ_data: dict[str, Any], item_data: dict[str, Any], champ_ids: Iterable[str], levels: Iterable[int], builds: Iterable[Iterable[str]], objectives: Iterable[str] = ("dps", "ehp")) -> list[dict[str, Any]]:
+    """
+    Compute the gain in each objective from one step of every `STAT_MAP` stat.
+
+    :param champ_data: Merged champion data.
+    :type champ_data: dict[str, Any]
+
+    :param item_data: Combined item data.
+    :type item_data: dict[str, Any]
+
+    :param champ_ids: Champions to analyse.
+    :type champ_ids: Iterable[str]
+
+    :param levels: Champion levels to analyse.
+    :type levels: Iterable[int]
+
+    :param builds: Candidate builds, each a collection of item IDs.
+    :type builds: Iterable[Iterable[str]]
+
+    :param objectives: Names from `OBJECTIVES` (defaults to `("dps", "ehp")`).
+    :type objectives: Iterable[str]
+
+    :return: One entry per scenario with the `base` objective values and the `gains` per stat name
+        (stat steps are in `steps`).
+    :rtype: list[dict[str, Any]]
+    """
+    levels, objectives = list(levels), list(objectives)
+    builds = [sorted(set(build)) for build in builds]
+    stat_keys = list(STAT_NAMES)
+    steps = {key: stat_step(key) for key in stat_keys}
+    varied = [key for key in stat_keys if ITEM_STATS.get(key) in COLUMN_FIELDS]
+    offsets = {key: offset for offset, key in enumerate(varied, 1)}
+    deltas = [{}] + [{ITEM_STATS[key]: steps[key]} for key in varied]
+
+    scenarios = []
+    columns: dict[str, list[float]] = {key: [] for key in ("attack_damage", "attack_speed", "crit_chance", "crit_damage", "health", "armor", "magic_resist")}
+    for champ_id in champ_ids:
+        records = champ_data.get(champ_id, {}).get("records_ddragon")
+        if not records:
+            logging.warning(f"Missing Data Dragon records for {champ_id}.")
+            continue
+
+        champion = Champion.from_json(champ_id, records)
+        for build in builds:
+            champion.apply_items(item_data.get(item_id, {}).get("stats", {}) for item_id in build)
+            for level in levels:
+                champion.set_level(level)
+                stat_columns(champion, deltas, columns)
+                scenarios.append((champ_id, level, build))
+
+    # Rows are laid out as (scenario, baseline + one per varied stat)
+    values = {objective: OBJECTIVES[objective](columns) for objective in objectives}
+    width = len(deltas)
+
+    results = []
+    for index, (champ_id, level, build) in enumerate(scenarios):
+        row = index * width
+        results.append({
+            "champion": champ_id,
+            "level": level,
+            "build": build,
+            "base": {objective: values[objective][row] for objective in objectives},
+            "gains": {
+                objective: {
+                    STAT_NAMES[key]: values[objective][row + offsets[key]] - values[objective][row] if key in offsets else 0.0
+                    for key in stat_keys
+                }
+                for objective in objectives
+            },
+            "steps": {STAT_NAMES[key]: steps[key] for key in stat_keys}
+        })
+
+    return results
@@ -0,0 +1,195 @@
+# server.py
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+import evaluate
+import versions
+from cache import ResultCache, result_key
+from constants import RESULT_CACHE_FILE, SERVER_IDLE_TIMEOUT
+
+"""
+This module serves champion, build and duel queries over HTTP/JSON from a warm in-memory snapshot.
+
+Endpoints:
+    GET  /health                                      - loaded game version and result cache statistics
+    GET  /stats?champion=Ahri&level=11&build=3089,3020 - stats at level
+    POST /build  {"champion", "level", "build"}       - build evaluation
+    POST /duel   {"first": {...}, "second": {...}}    - duel result
+    POST /reload {"version"}                          - load a version in the background and swap it in
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+class QueryService:
+    """Holds the current snapshot and swaps in new versions without interrupting queries."""
+
+    def __init__(self, snapshot: evaluate.Snapshot, cache: ResultCache | None = None):
+        self.snapshot = snapshot
+        self.cache = cache
+        self._reload_lock = threading.Lock()
+
+    def reload(self, version: str) -> bool:
+        """
+        Load a game version and swap it in once fully loaded. Queries keep using the previous snapshot
+        until then, and in-flight queries finish on the snapshot they started with.
+
+        :param version: The game version.
+        :type version: str
+
+        :return: `True` if the version was loaded, `False` if a reload is already running or the version could
+            not be loaded completely, in which case the previous snapshot is kept.
+        :rtype: bool
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        try:
+            snapshot = evaluate.Snapshot.load(version)
+            self.snapshot = snapshot # Atomic reference swap
+            logging.info(f"Now serving version {version}.")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to load version {version}: {e}")
+            return False
+        finally:
+            self._reload_lock.release()
+
+    def cached(self, snapshot: evaluate.Snapshot, operation: str, champion: str, level: int, build: list[str], function) -> dict[str, Any]:
+        """Answer a champion, level and build query through the result cache."""
+        champ_id = snapshot.resolve(champion, "champion")
+        item_ids = evaluate.normalize_build(snapshot.resolve(item, "item") for item in build)
+        if not self.cache:
+            return function(snapshot, champ_id, level, item_ids)
+
+        key = result_key(snapshot.version, operation, champ_id, level, item_ids)
+        return self.cache.get_or_compute(key, lambda: function(snapshot, champ_id, level, item_ids), snapshot.version)
+
+    def handle(self, method: str, path: str, query: dict[str, Any], body: dict[str, Any]) -> tuple[int, dict[str, Any]]:
+        """
+        Answer a request.
+
+        :return: The HTTP status and JSON response.
+        :rtype: tuple[int, dict[str, Any]]
+        """
+        snapshot = self.snapshot
+
+        if method == "GET" and path == "/health":
+            return 200, {"version": snapshot.version, "cache": self.cache.info() if self.cache else None}
+
+        if method == "GET" and path == "/stats":
+            build = [item for item in query.get("build", "").split(",") if item]
+            return 200, self.cached(snapshot, "stats", query["champion"], int(query.get("level", 1)), build, evaluate.stats_at_level)
+
+        if method == "POST" and path == "/build":
+            return 200, self.cached(snapshot, "build", body["champion"], int(body.get("level", 1)), body.get("build", []), evaluate.evaluate_build)
+
+        if method == "POST" and path == "/duel":
+            first, second = evaluate.normalize_fighter(snapshot, body["first"]), evaluate.normalize_fighter(snapshot, body["second"])
+            max_time = float(body.get("max_time", 60.0))
+            if not self.cache:
+                return 200, evaluate.duel(snapshot, first, second, max_time)
+
+            key = result_key(snapshot.version, "duel", first["champion"], first["level"], first["build"], second, ranks=first["ranks"], max_time=max_time)
+            return 200, self.cache.get_or_compute(key, lambda: evaluate.duel(snapshot, first, second, max_time), snapshot.version)
+
+        if method == "POST" and path == "/reload":
+            version = body["version"]
+            threading.Thread(target=self.reload, args=(version,), name="snapshot-reload", daemon=True).start()
+            return 202, {"version": snapshot.version, "loading": version}
+
+        return 404, {"error": f"Unknown endpoint: {method} {path}"}
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server answering requests on a fixed pool of worker threads."""
+
+    def __init__(self, address: tuple[str, int], handler: type[BaseHTTPRequestHandler], service: QueryService, workers: int = 8):
+        super().__init__(address, handler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query")
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """JSON request handler delegating to the server's `QueryService`."""
+    protocol_version = "HTTP/1.1"
+    timeout = SERVER_IDLE_TIMEOUT # Close idle keep-alive connections so they release their pool thread
+
+    def do_GET(self) -> None:
+        self._respond("GET")
+
+    def do_POST(self) -> None:
+        self._respond("POST")
+
+    def _respond(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length)) if length else {}
+            status, response = self.server.service.handle(method, url.path, query, body)
+        except KeyError as e:
+            status, response = 400, {"error": f"Missing or unknown value: {e.args[0]}"}
+        except (ValueError, TypeError) as e:
+            status, response = 400, {"error": str(e)}
+        except Exception as e:
+            logging.error(f"Failed to answer {method} {self.path}: {e}")
+            status, response = 500, {"error": "Internal error"}
+
+        payload = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        logging.debug(format % args)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="League Simulacrum query service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--version", help="game version to serve (defaults to the latest)")
+    parser.add_argument("--offline", action="store_true", help="use the newest complete local data without network access")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+    args = parser.parse_args()
+
+    version = args.version or versions.check_version(offline=args.offline)
+    if version is None:
+        parser.exit(1, "No complete local game data found for offline mode.\n" if args.offline else "Failed to find a game version.\n")
+    cache = None if args.no_cache else ResultCache(RESULT_CACHE_FILE)
+    service = QueryService(evaluate.Snapshot.load(version), cache)
+
+    server = PooledHTTPServer((args.host, args.port), QueryHandler, service, args.workers)
+    logging.info(f"Serving version {version} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if cache:
+            cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# spells.py
+import logging
+import math
+from array import array
+from typing import Any, Iterable
+import manifest
+import teamfight
+
+"""
+This module compiles the Data Dragon spells of every champion into a dense per-rank spell table.
+
+Cooldown, cost and range are `array("d")` columns indexed by (champion, slot, rank), and effect values by
+(champion, slot, effect, rank), so a lookup is one array read and a slice gives every champion at once.
+Ranks past a spell's last value repeat it, and missing values are NaN.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+SLOTS: tuple[str, ...] = teamfight.SLOTS
+FIELDS: tuple[str, ...] = ("cooldown", "cost", "range")
+
+def rank_values(values: Any, ranks: int) -> list[float]:
+    """Per-rank values of a Data Dragon array, padded with its last value (or NaN if empty)."""
+    values = [float(value) if isinstance(value, (int, float)) else math.nan for value in values or []]
+    if not values:
+        return [math.nan] * ranks
+    return (values + [values[-1]] * ranks)[:ranks]
+
+class SpellTable:
+    """Dense per-rank spell values of the whole roster."""
+
+    def __init__(self, ids: list[str], names: list[list[str]], ranks: int, effects: int, maxrank: array, columns: dict[str, array], effect: array):
+        self.ids = ids
+        self.names = names
+        self.ranks = ranks
+        self.effects = effects
+        self.maxrank = maxrank
+        self.columns = columns
+        self.effect = effect
+        self.rows = {champ_id: row for row, champ_id in enumerate(ids)}
+
+    @classmethod
+    def from_champs(cls, champ_data: dict[str, Any]) -> "SpellTable":
+        """
+        Compile a table from `champions.check_champs` output.
+
+        :param champ_data: Merged champion data.
+        :type champ_data: dict[str, Any]
+
+        :return: The table.
+        :rtype: SpellTable
+        """
+        ids, slot_spells = [], []
+        for champ_id, champ in champ_data.items():
+            spells = [(spell_id, spell) for spell_id, spell in champ.get("spells_ddragon", {}).items() if spell_id != "passive"][:len(SLOTS)]
+            ids.append(champ_id)
+            slot_spells.append(([spell_id for spell_id, _ in spells], [spell for _, spell in spells] + [{}] * (len(SLOTS) - len(spells))))
+
+        every_spell = [spell for _, spells in slot_spells for spell in spells]
+        ranks = max([spell.get("maxrank", 0) for spell in every_spell] + [len(spell.get(field) or []) for spell in every_spell for field in FIELDS] + [1])
+        effects = max([len(spell.get("effect") or []) for spell in every_spell] + [1])
+
+        names, maxrank = [], array("B")
+        columns = {field: array("d") for field in FIELDS}
+        effect = array("d")
+        for spell_ids, spells in slot_spells:
+            names.append(spell_ids)
+            for spell in spells:
+                maxrank.append(min(int(spell.get("maxrank", 0)), 255))
+                for field in FIELDS:
+                    columns[field].extend(rank_values(spell.get(field), ranks))
+
+                spell_effects = list(spell.get("effect") or [])
+                for index in range(effects):
+                    effect.extend(rank_values(spell_effects[index] if index < len(spell_effects) else None, ranks))
+
+        return cls(ids, names, ranks, effects, maxrank, columns, effect)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "SpellTable":
+        """Load a table written by `as_dict` (`None` values are read back as NaN)."""
+        to_array = lambda values: array("d", (math.nan if value is None else value for value in values))
+        return cls(
+            data["champions"],
+            data["names"],
+            data["ranks"],
+            data["effects"],
+            array("B", data["maxrank"]),
+            {field: to_array(data[field]) for field in FIELDS},
+            to_array(data["effect"])
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-compatible form of the table (NaN is written as `None`)."""
+        to_list = lambda values: [None if math.isnan(value) else value for value in values]
+        return {
+            "champions": self.ids,
+            "names": self.names,
+            "slots": list(SLOTS),
+            "ranks": self.ranks,
+            "effects": self.effects,
+            "maxrank": list(self.maxrank),
+            **{field: to_list(self.columns[field]) for field in FIELDS},
+            "effect": to_list(self.effect)
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index(self, row: int, slot: int, rank: int) -> int:
+        """Position of (champion row, slot, rank) in a field column; ranks start at `1`."""
+        return (row * len(SLOTS) + slot) * self.ranks + min(max(rank, 1), self.ranks) - 1
+
+    def value(self, field: str, champ_id: str, slot: int, rank: int) -> float:
+        """
+        Cooldown, cost or range of a spell at a rank.
+
+        :param field: One of `FIELDS`.
+        :type field: str
+
+        :param champ_id: The champion ID.
+        :type champ_id: str
+
+        :param slot: The spell slot (`0` to `3` for Q, W, E, R).
+        :type slot: int
+
+        :param rank: The spell rank, starting at `1`.
+        :type rank: int
+
+        :return: The value, or NaN if missing.
+        :rtype: float
+        """
+        return self.columns[field][self.index(self.rows[champ_id], slot, rank)]
+
+    def effect_value(self, champ_id: str, slot: int, effect: int, rank: int) -> float:
+        """Value of a spell's Data Dragon effect array (`effect` indexes the arrays) at a rank."""
+        row_slot = self.rows[champ_id] * len(SLOTS) + slot
+        return self.effect[(row_slot * self.effects + effect) * self.ranks + min(max(rank, 1), self.ranks) - 1]
+
+    def column(self, field: str, slot: int, rank: int) -> array:
+        """Cooldown, cost or range of one slot and rank for every champion, in row order."""
+        step = len(SLOTS) * self.ranks
+        return self.columns[field][self.index(0, slot, rank)::step]
+
+    def effect_column(self, slot: int, effect: int, rank: int) -> array:
+        """One effect value of one slot and rank for every champion, in row order."""
+        step = len(SLOTS) * self.effects * self.ranks
+        return self.effect[(slot * self.effects + effect) * self.ranks + min(max(rank, 1), self.ranks) - 1::step]
+
+    def abilities(self, champ_id: str, ranks: Iterable[int], damage_type: int = teamfight.MAGIC) -> list[teamfight.Ability]:
+        """
+        Abilities of a champion, as `teamfight.abilities_from_ddragon` builds them from raw spell data.
+
+        :param champ_id: The champion ID.
+        :type champ_id: str
+
+        :param ranks: Rank of each spell in slot order (Q, W, E, R); rank `0` skips the spell.
+        :type ranks: Iterable[int]
+
+        :param damage_type: Damage type of every ability (defaults to `MAGIC`).
+        :type damage_type: int
+
+        :return: The abilities.
+        :rtype: list[teamfight.Ability]
+        """
+        row = self.rows[champ_id]
+        abilities = []
+        for slot, rank in enumerate(ranks):
+            if slot >= len(SLOTS) or rank <= 0 or slot >= len(self.names[row]):
+                continue
+
+            damage = self.effect_value(champ_id, slot, 1, rank) if self.effects > 1 else math.nan
+            cooldown = self.value("cooldown", champ_id, slot, rank)
+            abilities.append(teamfight.Ability(
+                damage=0.0 if math.isnan(damage) else damage,
+                cooldown=10.0 if math.isnan(cooldown) else cooldown,
+                damage_type=damage_type,
+                ultimate=slot == 3,
+                name=SLOTS[slot]
+            ))
+
+        return abilities
+
+def check_spell_table(filename: str, version: str, champ_data: dict[str, Any], update: bool = False) -> SpellTable:
+    """
+    Check if the spell table file is correct, and rebuild it if not.
+
+    :param filename: The spell table file.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param champ_data: Merged champion data used to rebuild the table.
+    :type champ_data: dict[str, Any]
+
+    :param update: Debug flag to force rebuild the spell table (defaults to `False`).
+    :type update: bool
+
+    :return: The spell table.
+    :rtype: SpellTable
+    """
+    table_data = manifest.read_artifact(version, "spell_table", filename, {}) if not update else {}
+
+    if table_data:
+        return SpellTable.from_json(table_data)
+
+    logging.info(f"Building spell table (version {version}).")
+    table = SpellTable.from_champs(champ_data)
+    manifest.write_artifact(version, "spell_table", filename, table.as_dict())
+    return table
@@ -0,0 +1,292 @@
+# statarrays.py
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Iterable
+import manifest
+import recipes
+from constants import RECIPE_VERSION
+from models import Champion, DDRAGON_STATS
+from tables import ChampionTable, LEVEL_STATS
+
+"""
+This module writes and memory-maps a per-version binary file of precomputed stat arrays.
+
+The file holds champion base and growth stats, level-scaled champion stats for levels 1-18 and item stat
+vectors. Worker processes open it read-only with `mmap`, so the operating system shares the pages between
+them and lookups return zero-copy `memoryview` slices; champions with items applied are created from it
+without reading the champion or item JSON.
+
+Layout (little-endian): a fixed header, a JSON metadata block (row and column names, champion resource and
+range types, item gold), then the base, level and item arrays, each aligned to 8 bytes.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+MAGIC = b"LSSTATS2"
+HEADER = struct.Struct("<8s1s7xQQQQQQQQ") # magic, typecode, 4 x (offset, length) for metadata, base, level, item
+LEVELS: tuple[int, ...] = tuple(range(1, 19))
+LEVEL_COLUMNS: tuple[str, ...] = (*LEVEL_STATS, "attackspeed")
+
+def align(offset: int) -> int:
+    """Round an offset up to a multiple of 8 bytes."""
+    return (offset + 7) & ~7
+
+def write_stat_arrays(filename: str, version: str, champ_data: dict[str, Any], item_data: dict[str, Any], typecode: str = "d") -> bool:
+    """
+    Precompute stat arrays and write them to a binary file.
+
+    :param filename: The file to write to.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param champ_data: Merged champion data.
+    :type champ_data: dict[str, Any]
+
+    :param item_data: Combined item data.
+    :type item_data: dict[str, Any]
+
+    :param typecode: `"d"` for float64 or `"f"` for float32, which halves the size (defaults to `"d"`).
+    :type typecode: str
+
+    :return: `True` if successful, otherwise `False`.
+    :rtype: bool
+    """
+    if typecode not in ("d", "f"):
+        logging.error(f"Unsupported stat array typecode: {typecode}")
+        return False
+
+    table = ChampionTable.from_champs(champ_data)
+    base_columns = [table.columns[key] for key in DDRAGON_STATS]
+    base = array(typecode, (column[row] for row in range(len(table)) for column in base_columns))
+
+    # Row-major (champion, level, stat)
+    level_columns = {level: [table.column(key, level) for key in LEVEL_COLUMNS] for level in LEVELS}
+    levels = array(typecode, (
+        column[row]
+        for row in range(len(table))
+        for level in LEVELS
+        for column in level_columns[level]
+    ))
+
+    item_ids = list(item_data)
+    items = array(typecode)
+    for item_id in item_ids:
+        stats = recipes.item_stats(item_data[item_id])
+        items.extend(stats.get(key, 0.0) for key in recipes.STAT_KEYS)
+
+    metadata = json.dumps({
+        "version": version,
+        "recipe_version": RECIPE_VERSION,
+        "champions": table.ids,
+        "partype": table.column("partype"),
+        "rangeidentity": [value.split("|") if value else [] for value in table.column("rangeidentity")],
+        "base_stats": list(DDRAGON_STATS),
+        "levels": list(LEVELS),
+        "level_stats": list(LEVEL_COLUMNS),
+        "items": item_ids,
+        "item_gold": [item_data[item_id].get("gold", 0) for item_id in item_ids],
+        "item_stat_gold": [recipes.stat_gold(item_data, item_id) for item_id in item_ids],
+        "item_stats": list(recipes.STAT_KEYS)
+    }).encode("utf-8")
+
+    blocks = [metadata, base.tobytes(), levels.tobytes(), items.tobytes()]
+    offsets, offset = [], align(HEADER.size)
+    for block in blocks:
+        offsets.extend((offset, len(block)))
+        offset = align(offset + len(block))
+
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(temp_filename, "wb") as file:
+            file.write(HEADER.pack(MAGIC, typecode.encode("ascii"), *offsets))
+            for block, block_offset in zip(blocks, offsets[::2]):
+                file.seek(block_offset)
+                file.write(block)
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        logging.error(f"Failed to write {filename}: {e}")
+        return False
+
+    return manifest.record(version, "stat_arrays", filename)
+
+class StatArrays:
+    """Read-only, memory-mapped view of a stat array file."""
+
+    def __init__(self, filename: str):
+        """
+        Memory-map a stat array file.
+
+        :param filename: The file written by `write_stat_arrays`.
+        :type filename: str
+
+        :raises ValueError: If the file is not a stat array file.
+        """
+        with open(filename, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, typecode, *offsets = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a stat array file: {filename}")
+
+        self.typecode = typecode.decode("ascii")
+        buffer = memoryview(self._mmap)
+        blocks = [buffer[offset:offset + length] for offset, length in zip(offsets[::2], offsets[1::2])]
+
+        self.metadata = json.loads(bytes(blocks[0]))
+        self.version: str = self.metadata["version"]
+        self.champions = {champ_id: row for row, champ_id in enumerate(self.metadata["champions"])}
+        self.items = {item_id: row for row, item_id in enumerate(self.metadata["items"])}
+        self.base_stats = {key: column for column, key in enumerate(self.metadata["base_stats"])}
+        self.level_stats = {key: column for column, key in enumerate(self.metadata["level_stats"])}
+        self.item_stats = {key: column for column, key in enumerate(self.metadata["item_stats"])}
+
+        self.base = blocks[1].cast(self.typecode)
+        self.levels = blocks[2].cast(self.typecode)
+        self.item_vectors = blocks[3].cast(self.typecode)
+        self._views = [buffer, *blocks, self.base, self.levels, self.item_vectors]
+
+    def champion_base(self, champ_id: str) -> memoryview:
+        """Base and growth stats of a champion, ordered as `base_stats`."""
+        width = len(self.base_stats)
+        row = self.champions[champ_id]
+        return self.base[row * width:(row + 1) * width]
+
+    def champion_level(self, champ_id: str, level: int) -> memoryview:
+        """Level-scaled stats of a champion, ordered as `level_stats`."""
+        width = len(self.level_stats)
+        start = (self.champions[champ_id] * len(LEVELS) + level - 1) * width
+        return self.levels[start:start + width]
+
+    def champion_stat(self, champ_id: str, key: str, level: int | None = None) -> float:
+        """A single base stat, or a level-scaled stat if `level` is given."""
+        if level is None:
+            return self.champion_base(champ_id)[self.base_stats[key]]
+        return self.champion_level(champ_id, level)[self.level_stats[key]]
+
+    def item_vector(self, item_id: str) -> memoryview:
+        """Stat vector of an item, ordered as `item_stats`."""
+        width = len(self.item_stats)
+        row = self.items[item_id]
+        return self.item_vectors[row * width:(row + 1) * width]
+
+    def item_stat_values(self, item_id: str) -> dict[str, float]:
+        """Non-zero stats of an item, as `recipes.item_stats`."""
+        return {key: value for key, value in zip(self.item_stats, self.item_vector(item_id)) if value}
+
+    def item_gold(self, item_id: str) -> float:
+        """Total cost of an item."""
+        return self.metadata["item_gold"][self.items[item_id]]
+
+    def item_stat_gold(self, item_id: str) -> float:
+        """Gold value of an item's stats, as `recipes.stat_gold`."""
+        return self.metadata["item_stat_gold"][self.items[item_id]]
+
+    def champion(self, champ_id: str, level: int = 1, item_ids: Iterable[str] = ()) -> Champion:
+        """
+        Create a champion from its base stats, at a level with items applied.
+
+        :param champ_id: The champion ID.
+        :type champ_id: str
+
+        :param level: The champion level (defaults to `1`).
+        :type level: int
+
+        :param item_ids: Item IDs of the build (defaults to none).
+        :type item_ids: Iterable[str]
+
+        :return: The champion.
+        :rtype: Champion
+        """
+        row = self.champions[champ_id]
+        champ_stats = {
+            "stats": dict(zip(self.base_stats, self.champion_base(champ_id))),
+            "partype": self.metadata["partype"][row],
+            "rangeidentity": self.metadata["rangeidentity"][row]
+        }
+        champion = Champion.from_json(champ_id, champ_stats)
+        champion.level = level
+        return champion.apply_items(self.item_stat_values(item_id) for item_id in item_ids)
+
+    def close(self) -> None:
+        """Release all views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "StatArrays":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+def check_stat_arrays(filename: str, version: str, champ_data: dict[str, Any], item_data: dict[str, Any], typecode: str = "d", update: bool = False) -> StatArrays | None:
+    """
+    Check if the stat array file is correct, and rebuild if not.
+
+    :param filename: The stat array file to open.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param champ_data: Merged champion data used to rebuild the file.
+    :type champ_data: dict[str, Any]
+
+    :param item_data: Combined item data used to rebuild the file.
+    :type item_data: dict[str, Any]
+
+    :param typecode: `"d"` for float64 or `"f"` for float32 (defaults to `"d"`).
+    :type typecode: str
+
+    :param update: Debug flag to force rebuild the stat array file (defaults to `False`).
+    :type update: bool
+
+    :return: The memory-mapped stat arrays if successful, otherwise `None`.
+    :rtype: StatArrays | None
+    """
+    stat_arrays = open_stat_arrays(filename, version, typecode) if not update else None
+    if stat_arrays is not None:
+        return stat_arrays
+
+    logging.info(f"Building stat arrays (version {version}).")
+    if not write_stat_arrays(filename, version, champ_data, item_data, typecode):
+        return None
+    return open_stat_arrays(filename, version, typecode)
+
+def open_stat_arrays(filename: str, version: str, typecode: str | None = None) -> StatArrays | None:
+    """
+    Open a stat array file if the manifest shows it is valid, without rebuilding it.
+
+    :param filename: The stat array file.
+    :type filename: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param typecode: Required typecode, `None` for either (defaults to `None`).
+    :type typecode: str | None, optional
+
+    :return: The memory-mapped stat arrays if valid, otherwise `None`.
+    :rtype: StatArrays | None
+    """
+    if not manifest.validate(version, "stat_arrays", filename):
+        return None
+
+    try:
+        stat_arrays = StatArrays(filename)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logging.error(f"Invalid stat array file {filename}: {e}")
+        return None
+
+    if stat_arrays.version == version and stat_arrays.metadata.get("recipe_version") == RECIPE_VERSION and typecode in (None, stat_arrays.typecode):
+        return stat_arrays
+    stat_arrays.close()
+    return None
@@ -0,0 +1,315 @@
+# store.py
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Iterable
+import manifest
+import utils
+from constants import STORE
+
+"""
+This module provides a content-addressed store for champion and item records across game versions.
+
+Each record produced by `merge_champs`/`merge_items` is hashed and written once under its hash. A version
+is a manifest of ID -> hash, so unchanged records are shared between versions on disk and in memory.
+The store is the primary copy of champion and item data: `write_version` records the version's store
+manifest as its artifact in the per-version manifest, and no full data file is written.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+def canonical_json(record: Any) -> bytes:
+    """
+    Serialize a record to canonical JSON (sorted keys, no whitespace).
+
+    :param record: JSON-compatible data.
+    :type record: Any
+
+    :return: The canonical UTF-8 encoded JSON.
+    :rtype: bytes
+    """
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def record_hash(record: Any) -> str:
+    """
+    Hash a record by its canonical JSON.
+
+    :param record: JSON-compatible data.
+    :type record: Any
+
+    :return: The SHA-256 hex digest.
+    :rtype: str
+    """
+    return hashlib.sha256(canonical_json(record)).hexdigest()
+
+def object_path(digest: str) -> str:
+    """Path of the stored object with the given hash."""
+    return os.path.join(STORE["objects"], digest[:2], f"{digest}.json")
+
+def manifest_path(kind: str, version: str) -> str:
+    """Path of the manifest of the given kind (e.g. `"champ"` or `"item"`) and game version."""
+    return STORE["manifest"].format(version, kind)
+
+def put_object(record: Any) -> str | None:
+    """
+    Store a record under its hash, skipping the write if it is already stored.
+
+    :param record: JSON-compatible data.
+    :type record: Any
+
+    :return: The record hash if successful, otherwise `None`.
+    :rtype: str | None
+    """
+    payload = canonical_json(record)
+    digest = hashlib.sha256(payload).hexdigest()
+    path = object_path(digest)
+    if os.path.exists(path):
+        return digest
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(payload)
+        os.replace(temp_path, path)
+        return digest
+    except OSError as e:
+        logging.error(f"Failed to store object {digest}: {e}")
+        return None
+
+def get_object(digest: str, cache: dict[str, Any] | None = None, compactor: utils.JSONCompactor | None = None) -> Any:
+    """
+    Load a stored record by hash.
+
+    :param digest: The record hash.
+    :type digest: str
+
+    :param cache: Records already loaded, keyed by hash (defaults to `None`).
+    :type cache: dict[str, Any] | None, optional
+
+    :param compactor: Load in compact mode with this shared compactor, see `utils.read_json` (defaults to `None`).
+    :type compactor: utils.JSONCompactor | None, optional
+
+    :return: The record if found and it matches its hash, otherwise `None`.
+    :rtype: Any
+    """
+    if cache is not None and digest in cache:
+        return cache[digest]
+
+    path = object_path(digest)
+    try:
+        with open(path, "rb") as file:
+            payload = file.read()
+    except OSError as e:
+        logging.error(f"Failed to read stored object {digest}: {e}")
+        return None
+
+    # Objects are stored as their canonical JSON, so the file hash is the record hash
+    if hashlib.sha256(payload).hexdigest() != digest:
+        logging.error(f"Stored object {digest} does not match its hash.")
+        return None
+
+    try:
+        record = json.loads(payload, object_pairs_hook=compactor.object_pairs) if compactor else json.loads(payload)
+    except json.JSONDecodeError:
+        logging.error(f"Invalid JSON format in {path}")
+        return None
+
+    if cache is not None:
+        cache[digest] = record
+    return record
+
+def verify_objects(digests: Iterable[str]) -> list[str]:
+    """
+    Hash stored objects against their digests.
+
+    :param digests: The record hashes, e.g. the values of a manifest.
+    :type digests: Iterable[str]
+
+    :return: The hashes whose object is missing or does not match.
+    :rtype: list[str]
+    """
+    return [digest for digest in dict.fromkeys(digests) if manifest.file_hash(object_path(digest)) != digest]
+
+def put_version(kind: str, version: str, records: dict[str, Any]) -> dict[str, str]:
+    """
+    Store all records of a game version and write its manifest.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param records: Mapping of ID to record, as produced by `merge_champs`/`merge_items`.
+    :type records: dict[str, Any]
+
+    :return: The manifest (ID -> hash), or an empty dictionary if unsuccessful.
+    :rtype: dict[str, str]
+    """
+    manifest = {}
+    for record_id, record in records.items():
+        digest = put_object(record)
+        if digest is None:
+            return {}
+        manifest[record_id] = digest
+
+    path = manifest_path(kind, version)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if not utils.write_json(path, manifest, atomic=True):
+        return {}
+
+    logging.info(f"Stored {len(manifest)} {kind} records (version {version}).")
+    return manifest
+
+def write_version(kind: str, version: str, artifact: str, records: dict[str, Any], complete: bool = True) -> bool:
+    """
+    Store all records of a game version as its primary data and record them in the per-version manifest.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param artifact: The artifact recorded in the per-version manifest, a `FILES` key (e.g. `"item_data"`).
+    :type artifact: str
+
+    :param records: Mapping of ID to record.
+    :type records: dict[str, Any]
+
+    :param complete: Whether the records are all the data of the version (defaults to `True`).
+    :type complete: bool, optional
+
+    :return: `True` if successful, otherwise `False` (including when `records` is empty).
+    :rtype: bool
+    """
+    if not records or not put_version(kind, version, records):
+        return False
+    return manifest.record(version, artifact, manifest_path(kind, version), complete)
+
+def read_version(kind: str, version: str, artifact: str, compact: bool = False, partial: bool = False) -> dict[str, Any] | None:
+    """
+    Load all records of a game version written by `write_version`, if the per-version manifest shows them valid.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param artifact: The artifact in the per-version manifest, a `FILES` key (e.g. `"item_data"`).
+    :type artifact: str
+
+    :param compact: Load in compact mode, see `utils.read_json` (defaults to `False`).
+    :type compact: bool, optional
+
+    :param partial: Load records written as incomplete, see `manifest.validate` (defaults to `False`).
+    :type partial: bool, optional
+
+    :return: Mapping of ID to record; an empty dictionary if invalid or incomplete, and `None` if the
+        artifact is not kept in the store (e.g. a data file written before the store was primary).
+    :rtype: dict[str, Any] | None
+    """
+    path = manifest_path(kind, version)
+    entry = manifest.read_manifest(version)["artifacts"].get(artifact)
+    if entry is None or entry.get("file") != path:
+        return None
+
+    if not manifest.validate(version, artifact, path, partial=partial):
+        logging.warning(f"Invalid or partial stored {kind} data (version {version}).")
+        return {}
+
+    # Identical records are shared only when loaded read-only
+    cache = {} if compact else None
+    compactor = utils.JSONCompactor() if compact else None
+    digests = read_manifest(kind, version)
+    records = {record_id: get_object(digest, cache, compactor) for record_id, digest in digests.items()}
+    missing = [record_id for record_id, record in records.items() if record is None]
+    if missing:
+        logging.warning(f"Missing {len(missing)} stored {kind} records (version {version}).")
+        return {}
+
+    return records
+
+def read_manifest(kind: str, version: str) -> dict[str, str]:
+    """
+    Read the manifest of a game version.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param version: The game version.
+    :type version: str
+
+    :return: The manifest (ID -> hash), or an empty dictionary if missing.
+    :rtype: dict[str, str]
+    """
+    return utils.read_json(manifest_path(kind, version), {})
+
+def get_version(kind: str, version: str, cache: dict[str, Any] | None = None) -> dict[str, Any]:
+    """
+    Load all records of a game version.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param version: The game version.
+    :type version: str
+
+    :param cache: Records already loaded, keyed by hash (defaults to `None`).
+    :type cache: dict[str, Any] | None, optional
+
+    :return: Mapping of ID to record.
+    :rtype: dict[str, Any]
+    """
+    records = {}
+    for record_id, digest in read_manifest(kind, version).items():
+        record = get_object(digest, cache)
+        if record is None:
+            logging.warning(f"Missing stored {kind} record {record_id} (version {version}).")
+            continue
+        records[record_id] = record
+
+    return records
+
+def load_versions(kind: str, versions: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """
+    Load the records of several game versions, reading each distinct record only once.
+    Records unchanged between versions are the same object, so they must not be mutated.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param versions: The game versions.
+    :type versions: Iterable[str]
+
+    :return: Mapping of game version to its records.
+    :rtype: dict[str, dict[str, Any]]
+    """
+    cache: dict[str, Any] = {}
+    return {version: get_version(kind, version, cache) for version in versions}
+
+def list_versions(kind: str, directory: str = ".") -> list[str]:
+    """
+    List the stored game versions of a record kind.
+
+    :param kind: The record kind (e.g. `"champ"` or `"item"`).
+    :type kind: str
+
+    :param directory: The data directory (defaults to the working directory).
+    :type directory: str
+
+    :return: The stored game versions.
+    :rtype: list[str]
+    """
+    directory = os.path.join(directory, os.path.dirname(STORE["manifest"]))
+    suffix = os.path.basename(STORE["manifest"]).format("", kind)
+
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+
+    return [name[:-len(suffix)] for name in names if name.endswith(suffix)]
@@ -0,0 +1,231 @@
+# tables.py
+import logging
+import operator
+from array import array
+from typing import Any, Callable, Iterable, Iterator
+import formulas
+from models import Champion, DDRAGON_STATS
+
+"""
+This module provides a columnar view of the whole champion roster.
+
+Numeric stats are stored in contiguous `array("d")` columns and categorical columns as `array("H")`
+codes into a per-column dictionary, so filters compare plain numbers. Rows are champion positions;
+`Champion` objects are only created on demand.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Stats that grow with level, as (base column, per-level column)
+LEVEL_STATS: dict[str, str] = {
+    "hp": "hpperlevel",
+    "hpregen": "hpregenperlevel",
+    "armor": "armorperlevel",
+    "spellblock": "spellblockperlevel",
+    "attackdamage": "attackdamageperlevel",
+    "mp": "mpperlevel",
+    "mpregen": "mpregenperlevel",
+}
+
+CATEGORY_COLUMNS: tuple[str, ...] = ("partype", "rangeidentity")
+
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+class ChampionTable:
+    """Columnar champion roster with vectorized filters and projections."""
+
+    def __init__(self, ids: list[str], names: list[str], columns: dict[str, array], categories: dict[str, list[str]], codes: dict[str, array]):
+        self.ids = ids
+        self.names = names
+        self.columns = columns
+        self.categories = categories
+        self.codes = codes
+        self.rows = {champ_id: row for row, champ_id in enumerate(ids)}
+        self._level_columns: dict[tuple[str, int], array] = {}
+
+    @classmethod
+    def from_champs(cls, champ_data: dict[str, Any]) -> "ChampionTable":
+        """
+        Load a table in bulk from `champions.check_champs` output.
+
+        :param champ_data: Merged champion data.
+        :type champ_data: dict[str, Any]
+
+        :return: The champion table.
+        :rtype: ChampionTable
+        """
+        ids, names = [], []
+        columns = {key: array("d") for key in DDRAGON_STATS}
+        categories: dict[str, list[str]] = {column: [] for column in CATEGORY_COLUMNS}
+        lookup: dict[str, dict[str, int]] = {column: {} for column in CATEGORY_COLUMNS}
+        codes = {column: array("H") for column in CATEGORY_COLUMNS}
+
+        for champ_id, subdata in champ_data.items():
+            records = subdata.get("records_ddragon", {}) if isinstance(subdata, dict) else {}
+            if not records:
+                logging.warning(f"Missing Data Dragon records for {champ_id}.")
+                continue
+
+            ids.append(champ_id)
+            names.append(records.get("name", champ_id))
+
+            stats = records.get("stats", {})
+            for key, column in columns.items():
+                column.append(float(stats.get(key, 0.0)))
+
+            values = {
+                "partype": records.get("partype", ""),
+                "rangeidentity": "|".join(sorted(records.get("rangeidentity", [])))
+            }
+            for column, value in values.items():
+                if value not in lookup[column]:
+                    lookup[column][value] = len(categories[column])
+                    categories[column].append(value)
+                codes[column].append(lookup[column][value])
+
+        return cls(ids, names, columns, categories, codes)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def all_rows(self) -> list[int]:
+        """All row positions."""
+        return list(range(len(self.ids)))
+
+    def column(self, key: str, level: int | None = None) -> array | list[str]:
+        """
+        Get a numeric column, scaled to a level if given, or a decoded categorical column.
+
+        :param key: The Data Dragon stat key (e.g. `"attackdamage"`) or categorical column.
+        :type key: str
+
+        :param level: Champion level used for stats that grow with level (defaults to `None`).
+        :type level: int | None, optional
+
+        :return: The column values for all rows.
+        :rtype: array | list[str]
+        """
+        if key in self.codes:
+            dictionary = self.categories[key]
+            return [dictionary[code] for code in self.codes[key]]
+
+        if level is None or (key not in LEVEL_STATS and key != "attackspeed"):
+            return self.columns[key]
+
+        cache_key = (key, level)
+        if cache_key not in self._level_columns:
+            base = self.columns[key]
+            if key == "attackspeed":
+                growth = self.columns["attackspeedperlevel"]
+                ratio = self.columns["attackspeedratio"]
+                values = (
+                    formulas.attack_speed(b, g / 100, level, r or b, 0)
+                    for b, g, r in zip(base, growth, ratio)
+                )
+            else:
+                growth = self.columns[LEVEL_STATS[key]]
+                values = (formulas.stat_growth(b, g, level) for b, g in zip(base, growth))
+            self._level_columns[cache_key] = array("d", values)
+
+        return self._level_columns[cache_key]
+
+    def where(self, conditions: Iterable[tuple[str, str, Any]], level: int | None = None, rows: Iterable[int] | None = None) -> list[int]:
+        """
+        Filter rows by conditions, each narrowing the rows kept by the previous one.
+
+        Numeric conditions use `"<"`, `"<="`, `">"`, `">="`, `"=="` or `"!="`. Categorical conditions
+        use `"=="`, `"!="`, `"in"` (value is a collection) or `"has"` (e.g. `("rangeidentity", "has", "Ranged")`).
+
+        :param conditions: `(column, operator, value)` conditions.
+        :type conditions: Iterable[tuple[str, str, Any]]
+
+        :param level: Champion level used for stats that grow with level (defaults to `None`).
+        :type level: int | None, optional
+
+        :param rows: Rows to filter (defaults to all rows).
+        :type rows: Iterable[int] | None, optional
+
+        :return: Matching row positions.
+        :rtype: list[int]
+        """
+        selected = self.all_rows() if rows is None else list(rows)
+
+        for key, op, value in conditions:
+            if key in self.codes:
+                matching = self._matching_codes(key, op, value)
+                codes = self.codes[key]
+                selected = [row for row in selected if codes[row] in matching]
+            else:
+                compare = OPERATORS[op]
+                column = self.column(key, level)
+                selected = [row for row in selected if compare(column[row], value)]
+
+        return selected
+
+    def project(self, keys: Iterable[str], rows: Iterable[int] | None = None, level: int | None = None) -> dict[str, list[Any]]:
+        """
+        Select columns for the given rows.
+
+        :param keys: Columns to include; `"id"` and `"name"` are also available.
+        :type keys: Iterable[str]
+
+        :param rows: Rows to include (defaults to all rows).
+        :type rows: Iterable[int] | None, optional
+
+        :param level: Champion level used for stats that grow with level (defaults to `None`).
+        :type level: int | None, optional
+
+        :return: Mapping of column to values, in row order.
+        :rtype: dict[str, list[Any]]
+        """
+        rows = self.all_rows() if rows is None else list(rows)
+        sources = {"id": self.ids, "name": self.names}
+
+        projected = {}
+        for key in keys:
+            column = sources[key] if key in sources else self.column(key, level)
+            projected[key] = [column[row] for row in rows]
+        return projected
+
+    def champion(self, row: int, level: int = 1) -> Champion:
+        """
+        Materialize a `Champion` for a row.
+
+        :param row: The row position.
+        :type row: int
+
+        :param level: The champion level (defaults to `1`).
+        :type level: int
+
+        :return: The champion at the given level.
+        :rtype: Champion
+        """
+        champ_stats = {
+            "stats": {key: column[row] for key, column in self.columns.items()},
+            "partype": self.categories["partype"][self.codes["partype"][row]],
+            "rangeidentity": [value for value in self.categories["rangeidentity"][self.codes["rangeidentity"][row]].split("|") if value]
+        }
+        return Champion.from_json(self.ids[row], champ_stats).set_level(level)
+
+    def champions(self, rows: Iterable[int], level: int = 1) -> Iterator[Champion]:
+        """Materialize `Champion` objects for the given rows."""
+        for row in rows:
+            yield self.champion(row, level)
+
+    def _matching_codes(self, key: str, op: str, value: Any) -> set[int]:
+        """Encode a categorical condition as the set of matching codes."""
+        dictionary = self.categories[key]
+        tests: dict[str, Callable[[str], bool]] = {
+            "==": lambda entry: entry == value,
+            "!=": lambda entry: entry != value,
+            "in": lambda entry: entry in value,
+            "has": lambda entry: value in entry.split("|"),
+        }
+        return {code for code, entry in enumerate(dictionary) if tests[op](entry)}
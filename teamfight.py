@@ -0,0 +1,261 @@
+# teamfight.py
+import logging
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Iterable, Iterator
+import formulas
+from models import Champion
+
+"""
+This module simulates 5v5 team fights between champions with builds.
+
+State is kept as parallel lists (one entry per champion, and one per action: each champion's auto attack
+and abilities). Since stats are fixed during a fight, every action is mitigated against every enemy once,
+in a single `formulas.post_mitigation_damage` call. Actions wait in one bucket per tick; on every tick all
+due actions are resolved together, with targets chosen first and damage read from the precomputed table.
+Actions aimed at a champion killed earlier in the same tick are held to the next tick instead of counting
+as overkill damage.
+"""
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+PHYSICAL, MAGIC, TRUE = formulas.PHYSICAL_DAMAGE, formulas.MAGIC_DAMAGE, formulas.TRUE_DAMAGE
+
+POLICIES: tuple[str, ...] = ("first", "lowest_health", "highest_damage", "random")
+
+SLOTS: tuple[str, ...] = ("Q", "W", "E", "R")
+
+@dataclass
+class Ability:
+    """Damage of a single ability cast."""
+    damage: float = 0.0
+    ap_ratio: float = 0.0
+    bonus_ad_ratio: float = 0.0
+    cooldown: float = 10.0
+    damage_type: int = MAGIC
+    ultimate: bool = False
+    name: str = ""
+
+@dataclass
+class Fighter:
+    """A champion (with level and items applied) taking part in a fight."""
+    champion: Champion
+    abilities: list[Ability] = field(default_factory=list)
+    policy: str = "first"
+
+@dataclass
+class FightResult:
+    """Outcome of a fight."""
+    winner: int | None
+    duration: float
+    health: list[float]
+    damage_dealt: list[float]
+
+def abilities_from_ddragon(spells: dict[str, Any], ranks: Iterable[int], damage_type: int = MAGIC) -> list[Ability]:
+    """
+    Approximate abilities from Data Dragon spell data, using the first effect array as base damage.
+
+    :param spells: The `spells_ddragon` data of a champion.
+    :type spells: dict[str, Any]
+
+    :param ranks: Rank of each spell in slot order (Q, W, E, R); rank `0` skips the spell.
+    :type ranks: Iterable[int]
+
+    :param damage_type: Damage type of every ability (defaults to `MAGIC`).
+    :type damage_type: int
+
+    :return: The abilities.
+    :rtype: list[Ability]
+    """
+    slots = [spell for spell_id, spell in spells.items() if spell_id != "passive"]
+
+    abilities = []
+    for slot, (spell, rank) in enumerate(zip(slots, ranks)):
+        if rank <= 0:
+            continue
+
+        effect = spell.get("effect") or []
+        damage = effect[1] if len(effect) > 1 and effect[1] else []
+        cooldown = spell.get("cooldown") or []
+        abilities.append(Ability(
+            damage=float(damage[min(rank, len(damage)) - 1]) if damage else 0.0,
+            cooldown=float(cooldown[min(rank, len(cooldown)) - 1]) if cooldown else 10.0,
+            damage_type=damage_type,
+            ultimate=slot == 3,
+            name=SLOTS[slot] if slot < len(SLOTS) else str(slot)
+        ))
+
+    return abilities
+
+def simulate(fighters: list[Fighter], tick: float = 0.1, max_time: float = 60.0, seed: int | None = None) -> FightResult:
+    """
+    Simulate a team fight. The first half of `fighters` is team 0 and the second half is team 1.
+
+    :param fighters: The fighters (e.g. ten for a 5v5).
+    :type fighters: list[Fighter]
+
+    :param tick: Length of a tick in seconds; actions due within a tick resolve together (defaults to `0.1`).
+    :type tick: float
+
+    :param max_time: Time limit in seconds (defaults to `60.0`).
+    :type max_time: float
+
+    :param seed: Seed for the `"random"` target policy (defaults to `None`).
+    :type seed: int | None, optional
+
+    :return: The winning team (`None` on a draw or timeout), duration, remaining health and damage dealt.
+    :rtype: FightResult
+    """
+    rng = random.Random(seed)
+    count = len(fighters)
+    team = [0 if unit < count // 2 else 1 for unit in range(count)]
+    stats = [fighter.champion.stats for fighter in fighters]
+
+    # Champion columns
+    health = [s.health for s in stats]
+    resist_base = ([s.armor - s.armor_bonus for s in stats], [s.magic_resist - s.magic_resist_bonus for s in stats])
+    resist_bonus = ([s.armor_bonus for s in stats], [s.magic_resist_bonus for s in stats])
+    policy = [fighter.policy for fighter in fighters]
+    damage_dealt = [0.0] * count
+
+    # Action columns: one auto attack per champion, followed by every ability
+    owner, base, ap_ratio, bonus_ad_ratio, damage_type, interval = [], [], [], [], [], []
+    for unit, (fighter, s) in enumerate(zip(fighters, stats)):
+        owner.append(unit)
+        base.append(s.attack_damage * (1 + s.crit_chance_total * (s.crit_damage - 1)))
+        ap_ratio.append(0.0)
+        bonus_ad_ratio.append(0.0)
+        damage_type.append(PHYSICAL)
+        interval.append(1 / s.attack_speed if s.attack_speed > 0 else max_time)
+
+        for ability in fighter.abilities:
+            haste = s.ability_haste + (s.ability_haste_ultim if ability.ultimate else s.ability_haste_basic)
+            owner.append(unit)
+            base.append(ability.damage)
+            ap_ratio.append(ability.ap_ratio)
+            bonus_ad_ratio.append(ability.bonus_ad_ratio)
+            damage_type.append(ability.damage_type)
+            interval.append(formulas.ability_cooldown(ability.cooldown, haste))
+
+    ap = [stats[unit].ability_power for unit in owner]
+    bonus_ad = [stats[unit].attack_damage_bonus for unit in owner]
+    raw_damage = [b + a * p + r * d for b, a, p, r, d in zip(base, ap_ratio, ap, bonus_ad_ratio, bonus_ad)]
+    pen_perc = [(stats[unit].ar_pen_perc, stats[unit].mr_pen_perc, 0.0) for unit in owner]
+    pen_flat = [(stats[unit].ar_pen_flat, stats[unit].mr_pen_flat, 0.0) for unit in owner]
+
+    # Stats do not change during a fight, so every action is mitigated against every enemy up front
+    pairs = [(action, victim) for action in range(len(owner)) for victim in range(count) if team[victim] != team[owner[action]]]
+    types = [damage_type[action] for action, _ in pairs]
+    zeros = [0.0] * len(pairs)
+    damage = formulas.post_mitigation_damage(
+        [raw_damage[action] for action, _ in pairs],
+        types,
+        zeros,
+        zeros,
+        [pen_perc[action][kind] for (action, _), kind in zip(pairs, types)],
+        [pen_flat[action][kind] for (action, _), kind in zip(pairs, types)],
+        [0.0 if kind == TRUE else resist_base[kind][victim] for (_, victim), kind in zip(pairs, types)],
+        [0.0 if kind == TRUE else resist_bonus[kind][victim] for (_, victim), kind in zip(pairs, types)],
+        zeros,
+        zeros,
+        zeros,
+        zeros
+    )
+    hit = [[0.0] * count for _ in owner]
+    for (action, victim), amount in zip(pairs, damage):
+        hit[action][victim] = amount
+
+    # Actions wait in one bucket per tick (tick `slot` is at `slot * tick` seconds); due times are kept exact
+    last = math.floor(max_time / tick + 1e-9)
+    buckets: list[list[tuple[float, int]]] = [[] for _ in range(last + 1)]
+    buckets[0] = [(0.0, action) for action in range(len(owner))]
+
+    enemy_side = [1 - side for side in team]
+    living = [[unit for unit in range(count) if team[unit] == side and health[unit] > 0] for side in (0, 1)]
+
+    slot, time = 0, 0.0
+    while living[0] and living[1]:
+
+        # Skip idle ticks; the fight times out when nothing is due before `max_time`
+        while slot <= last and not buckets[slot]:
+            slot += 1
+        if slot > last:
+            time = max_time
+            break
+        time = slot * tick
+
+        # Resolve every action due this tick; actions of champions killed in earlier ticks are dropped
+        due = [entry for entry in buckets[slot] if health[owner[entry[1]]] > 0]
+        buckets[slot] = []
+
+        # Target selection for every champion acting this tick
+        target = {}
+        for _, action in due:
+            unit = owner[action]
+            if unit in target:
+                continue
+            enemies = living[enemy_side[unit]]
+            if policy[unit] == "lowest_health":
+                target[unit] = min(enemies, key=health.__getitem__)
+            elif policy[unit] == "highest_damage":
+                target[unit] = max(enemies, key=damage_dealt.__getitem__)
+            elif policy[unit] == "random":
+                target[unit] = rng.choice(enemies)
+            else:
+                target[unit] = enemies[0]
+
+        killed = False
+        for due_time, action in due:
+            unit = owner[action]
+            victim = target[unit]
+            if health[victim] <= 0:
+                # The target was killed earlier this tick: retarget next tick rather than count overkill
+                next_slot = slot + 1
+            else:
+                amount = hit[action][victim]
+                health[victim] -= amount
+                damage_dealt[unit] += amount
+                killed = killed or health[victim] <= 0
+                due_time += interval[action]
+                next_slot = max(slot + 1, math.ceil(due_time / tick - 1e-9))
+            if next_slot <= last:
+                buckets[next_slot].append((due_time, action))
+
+        if killed:
+            living = [[unit for unit in side if health[unit] > 0] for side in living]
+
+    alive_teams = {team[unit] for unit in range(count) if health[unit] > 0}
+    winner = next(iter(alive_teams)) if len(alive_teams) == 1 else None
+    return FightResult(winner=winner, duration=time, health=[max(h, 0.0) for h in health], damage_dealt=damage_dealt)
+
+def simulate_many(fights: Iterable[list[Fighter]], processes: int | None = None, chunksize: int = 64, **kwargs) -> Iterator[FightResult]:
+    """
+    Simulate many fights, in parallel across a process pool when `processes` is not `1`.
+
+    One process simulates about 1,000 to 1,600 fights per second (measured for 5v5 fights with four
+    abilities per champion), so reaching thousands of fights per second relies on several processes.
+
+    :param fights: The fights, each a list of fighters as for `simulate`.
+    :type fights: Iterable[list[Fighter]]
+
+    :param processes: Number of worker processes, `None` for one per CPU (defaults to `None`).
+    :type processes: int | None, optional
+
+    :param chunksize: Fights sent to a worker at a time (defaults to `64`).
+    :type chunksize: int
+
+    :param kwargs: Keyword arguments passed to `simulate`.
+
+    :return: The fight results, in order.
+    :rtype: Iterator[FightResult]
+    """
+    if processes == 1:
+        for fighters in fights:
+            yield simulate(fighters, **kwargs)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield from executor.map(partial(simulate, **kwargs), fights, chunksize=chunksize)
@@ -0,0 +1,56 @@
+# test_diff.py
+import json
+import os
+import tempfile
+import diff
+import utils
+
+ITEM = {
+    "stats": {"FlatPhysicalDamageMod": 40},
+    "mDataValues": [{"mName": "Damage", "mValues": [10, 20, 30]}, {"mName": "Cooldown", "mValues": [8]}],
+    "mItemCalculations": {"Damage": {"mFormulaParts": [{"mDataValue": "Damage"}]}}
+}
+
+def compact(data):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "data.json")
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        return utils.read_json(filename, compact=True)
+
+def test_identical_records_have_no_changes():
+    assert diff.diff_records(ITEM, json.loads(json.dumps(ITEM)), diff.ITEM_SCOPES) == []
+
+def test_compact_data_matches_plain_data():
+    assert diff.diff_data({"1001": compact(ITEM)}, {"1001": ITEM}, diff.ITEM_SCOPES)["changed"] == {}
+
+def test_changes_are_reported_at_their_path():
+    new = json.loads(json.dumps(ITEM))
+    new["mDataValues"][0]["mValues"][2] = 35
+    new["stats"]["FlatMagicDamageMod"] = 10
+
+    changes = diff.diff_records(compact(ITEM), new, diff.ITEM_SCOPES)
+    assert changes == [
+        {"path": ["stats", "FlatMagicDamageMod"], "change": "added", "old": None, "new": 10},
+        {"path": ["mDataValues", 0, "mValues", 2], "change": "changed", "old": 30, "new": 35}
+    ]
+
+def test_cleaned_data_values_are_diffed_by_name():
+    old = {**ITEM, "mDataValues": {"Damage": 30, "Cooldown": 8, "MoveSpeed": 25}}
+    new = {**ITEM, "mDataValues": {"Damage": 30, "Cooldown": 6, "Slow": 0.2}}
+
+    changes = diff.diff_records(compact(old), new, diff.ITEM_SCOPES)
+    assert changes == [
+        {"path": ["mDataValues", "Cooldown"], "change": "changed", "old": 8, "new": 6},
+        {"path": ["mDataValues", "MoveSpeed"], "change": "removed", "old": 25, "new": None},
+        {"path": ["mDataValues", "Slow"], "change": "added", "old": None, "new": 0.2}
+    ]
+
+def test_equal_subtrees_are_skipped_by_hash():
+    class Uncomparable(dict):
+        def __eq__(self, other):
+            raise AssertionError("Equal subtrees must not be compared deeply")
+
+    old = {**ITEM, "mItemCalculations": Uncomparable(ITEM["mItemCalculations"])}
+    new = {**ITEM, "mItemCalculations": Uncomparable(ITEM["mItemCalculations"]), "stats": {"FlatPhysicalDamageMod": 45}}
+    assert [change["path"] for change in diff.diff_records(old, new, diff.ITEM_SCOPES)] == [["stats", "FlatPhysicalDamageMod"]]
@@ -0,0 +1,50 @@
+# test_formulas.py
+import itertools
+import random
+import formulas
+
+PHYSICAL, MAGIC, TRUE = formulas.PHYSICAL_DAMAGE, formulas.MAGIC_DAMAGE, formulas.TRUE_DAMAGE
+
+def columns(hits):
+    return [list(column) for column in zip(*hits)]
+
+def assert_matches_scalar(hits):
+    assert formulas.post_mitigation_damage(*columns(hits)) == [formulas.mitigated_damage(*hit) for hit in hits]
+
+def test_kernel_matches_scalar_on_edge_cases():
+    # raw, type, flat_red, perc_red, perc_pen, flat_pen, base, bonus, amp, perc_dr, flat_dr, shield
+    assert_matches_scalar([
+        (100.0, PHYSICAL, 0.0, 0.0, 0.0, 0.0, 100.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (100.0, MAGIC, 0.0, 0.0, 0.0, 0.0, -30.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        (100.0, TRUE, 20.0, 0.3, 0.4, 18.0, 200.0, 50.0, 0.0, 0.0, 0.0, 0.0),
+        (250.0, PHYSICAL, 20.0, 0.3, 0.35, 18.0, 80.0, 40.0, 0.1, 0.2, 15.0, 0.0),
+        (250.0, PHYSICAL, 30.0, 0.0, 0.0, 0.0, -10.0, 5.0, 0.0, 0.0, 0.0, 0.0),
+        (50.0, MAGIC, 0.0, 0.0, 0.0, 60.0, 30.0, 10.0, 0.0, 0.0, 0.0, 0.0),
+        (40.0, MAGIC, 0.0, 0.0, 0.0, 0.0, 30.0, 10.0, 0.0, 0.0, 50.0, 0.0),
+        (300.0, PHYSICAL, 0.0, 0.0, 0.0, 0.0, 60.0, 20.0, 0.0, 0.0, 0.0, 120.0),
+        (30.0, PHYSICAL, 0.0, 0.0, 0.0, 0.0, 60.0, 20.0, 0.0, 0.0, 0.0, 120.0),
+    ])
+
+def test_kernel_matches_scalar_on_random_hits():
+    rng = random.Random(7)
+    targets = [(rng.uniform(-40, 250), rng.uniform(0, 150)) for _ in range(6)]
+    attackers = [(rng.choice([0.0, 10.0]), rng.choice([0.0, 0.3]), rng.choice([0.0, 0.35]), rng.choice([0.0, 18.0])) for _ in range(6)]
+    extras = [(rng.choice([0.0, 0.1]), rng.choice([0.0, 0.2]), rng.choice([0.0, 15.0]), rng.choice([0.0, 60.0])) for _ in range(4)]
+
+    # Mostly repeated attacker and target combinations
+    repeated = [
+        (rng.uniform(0, 500), rng.choice((PHYSICAL, MAGIC, TRUE)), *rng.choice(attackers), *rng.choice(targets), *extras[0])
+        for _ in range(500)
+    ]
+    # Every combination distinct
+    distinct = [
+        (rng.uniform(0, 500), rng.choice((PHYSICAL, MAGIC, TRUE)), *rng.choice(attackers), rng.uniform(-40, 250), rng.uniform(0, 150), *extra)
+        for extra in itertools.islice(itertools.cycle(extras), 500)
+    ]
+
+    assert_matches_scalar(repeated)
+    assert_matches_scalar(distinct)
+    assert_matches_scalar(repeated + distinct)
+
+def test_empty_kernel():
+    assert formulas.post_mitigation_damage(*[[] for _ in range(12)]) == []
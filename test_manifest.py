@@ -0,0 +1,94 @@
+# test_manifest.py
+import os
+import pytest
+import manifest
+import store
+import utils
+from constants import FILES
+
+VERSION = "14.1.1"
+KIND = "item_list"
+FILENAME = FILES[KIND].format(VERSION)
+DATA = {"1001": "Boots", "3006": "Berserker's Greaves"}
+
+@pytest.fixture(autouse=True)
+def data_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+def rewrite(data):
+    utils.write_json(FILENAME, data)
+
+def test_valid_artifact():
+    assert manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    assert manifest.validate(VERSION, KIND, FILENAME) is True
+    assert manifest.read_artifact(VERSION, KIND, FILENAME) == DATA
+    assert manifest.is_complete(VERSION, (KIND,))
+
+def test_missing_artifact():
+    assert manifest.validate(VERSION, KIND, FILENAME) is None
+    assert manifest.read_artifact(VERSION, KIND, FILENAME, {}) == {}
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    os.remove(FILENAME)
+    assert manifest.validate(VERSION, KIND, FILENAME) is False
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+def test_partial_artifact():
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    rewrite({"1001": "Boots"})
+    assert manifest.validate(VERSION, KIND, FILENAME) is False
+    assert manifest.read_artifact(VERSION, KIND, FILENAME, {}) == {}
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+def test_corrupted_artifact():
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    size = os.path.getsize(FILENAME)
+    rewrite({"1001": "Boats", "3006": "Berserker's Greaves"})
+    assert os.path.getsize(FILENAME) == size
+    assert manifest.validate(VERSION, KIND, FILENAME) is False
+
+def test_verify_marks_corrupted_artifact():
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    mtime_ns = os.stat(FILENAME).st_mtime_ns
+    rewrite({"1001": "Boats", "3006": "Berserker's Greaves"})
+    os.utime(FILENAME, ns=(mtime_ns, mtime_ns))
+    assert manifest.validate(VERSION, KIND, FILENAME) is True # Not hashed while the size and modification time match
+
+    assert manifest.verify(VERSION) == [KIND]
+    assert manifest.validate(VERSION, KIND, FILENAME) is False
+    assert manifest.validate(VERSION, KIND, FILENAME, partial=True) is False
+
+def test_incomplete_artifact():
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA, complete=False)
+    assert manifest.validate(VERSION, KIND, FILENAME) is False
+    assert manifest.validate(VERSION, KIND, FILENAME, partial=True) is True
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+    manifest.write_artifact(VERSION, KIND, FILENAME, DATA)
+    assert manifest.is_complete(VERSION, (KIND,))
+
+def test_empty_artifact_is_not_complete():
+    manifest.write_artifact(VERSION, KIND, FILENAME, {})
+    assert manifest.read_manifest(VERSION)["artifacts"][KIND]["complete"] is False
+    assert manifest.validate(VERSION, KIND, FILENAME, partial=True) is False
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+def test_unrecorded_artifact():
+    rewrite({})
+    assert not manifest.is_complete(VERSION, (KIND,))
+
+    rewrite(DATA)
+    assert manifest.is_complete(VERSION, (KIND,))
+    assert manifest.read_artifact(VERSION, KIND, FILENAME) == DATA
+    assert manifest.validate(VERSION, KIND, FILENAME) is True
+
+def test_verify_marks_artifact_with_corrupted_stored_object():
+    records = {"1001": {"stats": {"mFlatMovementSpeedMod": 25}}, "3006": {"stats": {"mPercentAttackSpeedMod": 0.35}}}
+    assert store.write_version("item", VERSION, "item_data", records)
+    assert manifest.verify(VERSION) == []
+
+    with open(store.object_path(store.record_hash(records["3006"])), "wb") as file:
+        file.write(store.canonical_json({"stats": {"mPercentAttackSpeedMod": 0.25}}))
+    assert manifest.verify(VERSION) == ["item_data"]
+    assert store.read_version("item", VERSION, "item_data") == {}
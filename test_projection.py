@@ -0,0 +1,98 @@
+# test_projection.py
+import champions
+import items
+from constants import REMOVE_KEYS, SAVE_KEYS
+
+DDRAGON_ITEMS = {
+    "data": {
+        "1001": {"name": "Boots", "description": "<stats>25 Move Speed</stats>", "gold": {"total": 300, "purchasable": True}, "tags": ["Boots"], "maps": {"11": True}, "into": ["3006"]},
+        "3006": {"name": "Berserker's Greaves", "gold": {"total": 1100, "purchasable": True}, "tags": ["Boots", "AttackSpeed"], "maps": {"11": True}, "from": ["1001", "1042"]},
+        "2055": {"name": "Control Ward", "gold": {"total": 75, "purchasable": True}, "tags": ["Trinket"], "maps": {"11": True}},
+        "3599": {"name": "Kalista's Black Spear", "gold": {"purchasable": False}, "tags": ["Consumable"], "maps": {"11": True}, "requiredChampion": "Kalista"},
+        "1042": {"name": "Dagger", "gold": {}, "tags": ["AttackSpeed"], "maps": {"11": True}, "inStore": True}
+    }
+}
+
+CDRAGON_ITEMS = {
+    "Items/1001": {
+        "mItemDataClient": {"mTooltipData": {"mLists": {"Stats": {"elements": [{"type": "MoveSpeed"}]}}}},
+        "mFlatMovementSpeedMod": 25,
+        "mDataValues": [{"mName": "MoveSpeed", "mValue": 25}],
+        "mEffectAmount": [0, 0, 0],
+        "requiredItemLinks": ["Items/3006"],
+        "ShopOrderPriority": 1
+    },
+    "Items/3006": {"mPercentAttackSpeedMod": 0.35, "mItemCalculations": {"AS": {}}, "mEffectByLevelAmount": {"1": 0}},
+    "Version": "14.1"
+}
+
+DDRAGON_CHAMPS = {
+    "data": {
+        "Annie": {"key": "1", "name": "Annie", "partype": "Mana", "stats": {"hp": 560, "movespeed": 335}, "tags": ["Mage"]},
+        "Zed": {"key": "238", "name": "Zed", "stats": {"hp": 654}}
+    }
+}
+
+CDRAGON_CHAMP = {
+    "Characters/Annie/CharacterRecords/Root": {"purchaseIdentities": ["Ranged"], "attackSpeedRatio": 0.625, "spellNames": ["AnnieQ"], "mAbilities": ["A"]},
+    "Characters/Annie/Spells/AnnieQ": {"mSpell": {"cooldownTime": [4]}}
+}
+
+# The hand-written `clean_*` bodies replaced by projections (item recipes add `from` and `into`)
+
+def baseline_ddragon_item(subdata):
+    return {
+        "name": subdata.get("name", ""),
+        "description": subdata.get("description", ""),
+        "gold": subdata.get("gold", {}).get("total", -1),
+        "tags": subdata.get("tags", []),
+        "from": subdata.get("from", []),
+        "into": subdata.get("into", [])
+    }
+
+def baseline_cdragon_item(subdata):
+    base_keys = set(subdata.keys()).intersection(SAVE_KEYS)
+    stat_keys = set(subdata.keys()).difference(REMOVE_KEYS).difference(SAVE_KEYS)
+    item = {key: subdata[key] for key in base_keys}
+    item["stats"] = {key: subdata[key] for key in stat_keys}
+    return item
+
+def test_ddragon_items_match_baseline():
+    cleaned = items.clean_ddragon_items(DDRAGON_ITEMS)
+    assert list(cleaned) == ["1001", "3006", "1042"]
+    assert cleaned == {item_id: baseline_ddragon_item(DDRAGON_ITEMS["data"][item_id]) for item_id in cleaned}
+
+def test_cdragon_items_match_baseline():
+    cleaned = items.clean_cdragon_items(CDRAGON_ITEMS)
+    assert cleaned["Items/3006"] == baseline_cdragon_item(CDRAGON_ITEMS["Items/3006"])
+
+    boots = baseline_cdragon_item(CDRAGON_ITEMS["Items/1001"])
+    boots.pop("mItemDataClient")
+    boots.pop("mEffectAmount")
+    boots["stats"]["mFlatMovementSpeedMod"] = 25
+    boots["mDataValues"] = {"MoveSpeed": 25}
+    assert cleaned["Items/1001"] == boots
+    assert "Version" not in cleaned
+
+def test_ddragon_champs_match_baseline():
+    assert champions.clean_ddragon_champs(DDRAGON_CHAMPS) == {
+        name: {
+            "key": subdata.get("key", ""),
+            "name": subdata.get("name", ""),
+            "partype": subdata.get("partype", ""),
+            "stats": subdata.get("stats", {})
+        }
+        for name, subdata in DDRAGON_CHAMPS["data"].items()
+    }
+
+def test_cdragon_champ_matches_baseline():
+    records_stats, records_spells, spells = champions.clean_cdragon_champ(CDRAGON_CHAMP, "Annie")
+    records = CDRAGON_CHAMP["Characters/Annie/CharacterRecords/Root"]
+    assert records_stats == {"rangeidentity": records["purchaseIdentities"], "attackspeedratio": records["attackSpeedRatio"]}
+    assert records_spells == {"spellNames": records["spellNames"], "mAbilities": records["mAbilities"]}
+    assert spells == {"AnnieQ": CDRAGON_CHAMP["Characters/Annie/Spells/AnnieQ"]}
+
+def test_missing_fields_get_fresh_defaults():
+    first, second = items.clean_ddragon_items({"data": {"1": {"tags": ["A"], "maps": {"11": True}, "inStore": True}, "2": {"tags": ["B"], "maps": {"11": True}, "inStore": True}}}).values()
+    assert first["from"] == [] and first["from"] is not second["from"]
+    assert champions.clean_cdragon_champ({}, "Annie") == ({}, {}, {})
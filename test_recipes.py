@@ -0,0 +1,35 @@
+# test_recipes.py
+import pytest
+import recipes
+
+ITEM_DATA = {
+    "1036": {"gold": 350, "stats": {"mFlatPhysicalDamageMod": 10}},
+    "1028": {"gold": 400, "stats": {"mFlatHPPoolMod": 150}},
+    "3067": {"gold": 800, "from": ["1028"], "stats": {"mFlatHPPoolMod": 200, "mAbilityHasteMod": 10}},
+    "3134": {"gold": 1000, "from": ["1036", "1036"], "stats": {"mFlatPhysicalDamageMod": 20, "PhysicalLethality": 10}},
+    "6692": {"gold": 3200, "stats": {"mFlatPhysicalDamageMod": 60, "PhysicalLethality": 18, "mAbilityHasteMod": 15}},
+    "4000": {"gold": 1200, "stats": {"PercentOmnivampMod": 0.1, "mFlatMagicDamageMod": 40}}
+}
+
+def test_stats_without_a_basic_item_are_valued_from_the_cheapest_carrier():
+    values = recipes.stat_gold_values(ITEM_DATA)
+    assert values["mFlatPhysicalDamageMod"] == pytest.approx(35)
+    assert values["mFlatHPPoolMod"] == pytest.approx(400 / 150)
+    assert values["mAbilityHasteMod"] == pytest.approx((800 - 200 * 400 / 150) / 10)
+    assert values["PhysicalLethality"] == pytest.approx((1000 - 20 * 35) / 10)
+
+def test_stats_that_cannot_be_valued_are_left_out(caplog):
+    values = recipes.stat_gold_values(ITEM_DATA)
+    assert "PercentOmnivampMod" not in values and "mFlatMagicDamageMod" not in values
+    assert "PercentOmnivampMod, mFlatMagicDamageMod" in caplog.text
+
+    item_data = recipes.build_recipe_graph(ITEM_DATA)
+    assert recipes.stat_gold(item_data, "4000") == 0.0
+    assert recipes.stat_gold(item_data, "3134") == pytest.approx(1000)
+
+def test_outdated_recipes_are_detected():
+    item_data = recipes.build_recipe_graph({item_id: dict(item) for item_id, item in ITEM_DATA.items()})
+    assert recipes.is_current(item_data)
+
+    item_data["1036"]["recipe"]["version"] -= 1
+    assert not recipes.is_current(item_data)
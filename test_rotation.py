@@ -0,0 +1,69 @@
+# test_rotation.py
+import random
+from functools import lru_cache
+import formulas
+import rotation
+import teamfight
+from models import Champion
+
+RECORDS = {
+    "partype": "Mana",
+    "rangeidentity": ["Ranged"],
+    "stats": {
+        "hp": 600, "hpperlevel": 100, "hpregen": 8, "hpregenperlevel": 0.8, "armor": 30, "armorperlevel": 4.5,
+        "spellblock": 30, "spellblockperlevel": 1.3, "attackspeedratio": 0.625, "attackspeed": 0.65,
+        "attackspeedperlevel": 2.5, "attackdamage": 60, "attackdamageperlevel": 3, "crit": 0, "mp": 300,
+        "mpperlevel": 40, "mpregen": 8, "mpregenperlevel": 0.8, "attackrange": 550, "movespeed": 330
+    }
+}
+
+def champion(level):
+    return Champion.from_json("Caster", RECORDS).set_level(level)
+
+def brute_force(champion, abilities, window, tick, haste, armor=0.0, magic_resist=0.0):
+    """Best damage over every sequence of actions, one tick at a time."""
+    s = champion.stats
+    damage = rotation.action_damage(champion, abilities, armor, magic_resist)
+    steps = rotation.ticks(window, tick)
+    cooldowns = [
+        rotation.ticks(formulas.ability_cooldown(ability.cooldown, haste + (s.ability_haste_ultim if ability.ultimate else s.ability_haste_basic)), tick)
+        for ability in abilities
+    ]
+    # (damage, duration in ticks, ability index or -1), including waiting one tick
+    actions = [(damage[0], rotation.ticks(1 / s.attack_speed, tick), -1), (0.0, 1, -1)]
+    actions += [(damage[slot + 1], rotation.ticks(rotation.CAST_TIME, tick), slot) for slot in range(len(abilities))]
+
+    @lru_cache(maxsize=None)
+    def best(t, ready):
+        if t >= steps:
+            return 0.0
+        return max(
+            gain + best(t + duration, tuple(t + cooldowns[slot] if i == slot else at for i, at in enumerate(ready)))
+            for gain, duration, slot in actions
+            if slot < 0 or ready[slot] <= t
+        )
+
+    return best(0, (0,) * len(abilities))
+
+def test_optimize_matches_brute_force():
+    rng = random.Random(3)
+    for _ in range(15):
+        abilities = [
+            teamfight.Ability(damage=rng.uniform(0, 200), cooldown=rng.uniform(0.5, 4), damage_type=rng.choice((teamfight.PHYSICAL, teamfight.MAGIC)), name=name)
+            for name in "QWE"
+        ]
+        abilities.append(teamfight.Ability(damage=rng.uniform(100, 400), cooldown=rng.uniform(2, 5), ultimate=True, name="R"))
+        level, haste, window = rng.randint(1, 18), rng.choice((0.0, 30.0, 80.0)), rng.choice((2.0, 2.5, 3.0))
+        armor, magic_resist = rng.uniform(0, 100), rng.uniform(0, 100)
+
+        best = rotation.optimize(champion(level), abilities, window, tick=0.25, armor=armor, magic_resist=magic_resist, haste=haste)
+        assert abs(best.damage - brute_force(champion(level), abilities, window, 0.25, haste, armor, magic_resist)) < 1e-6
+
+def test_sequence_adds_up_to_damage():
+    abilities = [teamfight.Ability(damage=120, cooldown=2, name="Q"), teamfight.Ability(damage=300, cooldown=8, ultimate=True, name="R")]
+    best = rotation.optimize(champion(11), abilities, window=6.0)
+    damage = dict(zip([rotation.AUTO_ATTACK, "Q", "R"], rotation.action_damage(champion(11), abilities)))
+
+    assert abs(sum(damage[action] for _, action in best.sequence) - best.damage) < 1e-6
+    assert [action for _, action in best.sequence].count("R") == 1
+    assert [time for time, _ in best.sequence] == sorted(time for time, _ in best.sequence)
@@ -0,0 +1,77 @@
+# test_statarrays.py
+import pytest
+import recipes
+import statarrays
+from models import Champion
+
+VERSION = "14.1.1"
+FILENAME = "14.1.1_Stat_Arrays.bin"
+
+STATS = {
+    "hp": 600, "hpperlevel": 100, "hpregen": 8, "hpregenperlevel": 0.8, "armor": 30, "armorperlevel": 4.5,
+    "spellblock": 30, "spellblockperlevel": 1.3, "attackspeedratio": 0.625, "attackspeed": 0.65,
+    "attackspeedperlevel": 2.5, "attackdamage": 60, "attackdamageperlevel": 3, "crit": 0, "mp": 300,
+    "mpperlevel": 40, "mpregen": 8, "mpregenperlevel": 0.8, "attackrange": 175, "movespeed": 340
+}
+
+CHAMP_DATA = {
+    "Garen": {"records_ddragon": {"name": "Garen", "partype": "None", "rangeidentity": ["Melee"], "stats": STATS}},
+    "Ashe": {"records_ddragon": {"name": "Ashe", "partype": "Mana", "rangeidentity": ["Ranged"], "stats": {**STATS, "hp": 610.5, "attackspeedratio": 0.658, "attackrange": 600}}}
+}
+
+ITEM_DATA = recipes.build_recipe_graph({
+    "1036": {"gold": 350, "stats": {"mFlatPhysicalDamageMod": 10}},
+    "1042": {"gold": 300, "stats": {"mPercentAttackSpeedMod": 0.12}},
+    "3031": {"gold": 3400, "from": ["1036"], "stats": {"mFlatPhysicalDamageMod": 65, "mFlatCritChanceMod": 0.25, "mFlatCritDamageMod": 0.4}},
+    "3036": {"gold": 3000, "stats": {"mFlatPhysicalDamageMod": 35, "mPercentArmorPenetrationMod": 0.3, "mFlatCritChanceMod": 0.25}},
+    "3035": {"gold": 1450, "stats": {"mFlatPhysicalDamageMod": 20, "mPercentArmorPenetrationMod": 0.18}},
+    "2055": {"gold": 75, "stats": {}}
+})
+
+@pytest.fixture(autouse=True)
+def data_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+def expected(champ_id, level, item_ids):
+    champion = Champion.from_json(champ_id, CHAMP_DATA[champ_id]["records_ddragon"]).set_level(level)
+    return champion.apply_items(ITEM_DATA[item_id]["stats"] for item_id in item_ids)
+
+def test_mapped_champions_match_json_champions():
+    with statarrays.check_stat_arrays(FILENAME, VERSION, CHAMP_DATA, ITEM_DATA) as stat_arrays:
+        for champ_id in CHAMP_DATA:
+            for level in (1, 7, 18):
+                for item_ids in ([], ["1036"], ["3031", "3036", "3035"], ["2055", "1042"]):
+                    assert stat_arrays.champion(champ_id, level, item_ids) == expected(champ_id, level, item_ids)
+
+def test_mapped_level_and_item_stats():
+    with statarrays.check_stat_arrays(FILENAME, VERSION, CHAMP_DATA, ITEM_DATA) as stat_arrays:
+        for level in range(1, 19):
+            stats = expected("Ashe", level, []).stats
+            assert stat_arrays.champion_stat("Ashe", "hp", level) == stats.health
+            assert stat_arrays.champion_stat("Ashe", "armor", level) == stats.armor
+            assert stat_arrays.champion_stat("Ashe", "attackdamage", level) == stats.attack_damage
+            assert stat_arrays.champion_stat("Ashe", "attackspeed", level) == stats.attack_speed
+
+        for item_id, item in ITEM_DATA.items():
+            assert stat_arrays.item_stat_values(item_id) == recipes.item_stats(item)
+            assert stat_arrays.item_gold(item_id) == item["gold"]
+            assert stat_arrays.item_stat_gold(item_id) == recipes.stat_gold(ITEM_DATA, item_id)
+
+def test_float32_arrays_are_close():
+    with statarrays.check_stat_arrays(FILENAME, VERSION, CHAMP_DATA, ITEM_DATA, typecode="f") as stat_arrays:
+        mapped = stat_arrays.champion("Ashe", 18, ["3031", "3036"]).stats
+        stats = expected("Ashe", 18, ["3031", "3036"]).stats
+        assert mapped.health == pytest.approx(stats.health, rel=1e-6)
+        assert mapped.attack_speed == pytest.approx(stats.attack_speed, rel=1e-6)
+        assert mapped.ar_pen_perc == pytest.approx(stats.ar_pen_perc, rel=1e-6)
+
+def test_stale_or_corrupted_file_is_rebuilt():
+    statarrays.check_stat_arrays(FILENAME, VERSION, CHAMP_DATA, ITEM_DATA).close()
+    assert statarrays.open_stat_arrays(FILENAME, "14.2.1") is None
+
+    with open(FILENAME, "r+b") as file:
+        file.write(b"XXXXXXXX")
+    assert statarrays.open_stat_arrays(FILENAME, VERSION) is None
+
+    with statarrays.check_stat_arrays(FILENAME, VERSION, CHAMP_DATA, ITEM_DATA) as stat_arrays:
+        assert stat_arrays.champion("Garen", 18) == expected("Garen", 18, [])
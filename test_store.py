@@ -0,0 +1,25 @@
+# test_store.py
+import pytest
+import store
+
+RECORD = {"stats": {"FlatPhysicalDamageMod": 40}, "mDataValues": {"Damage": 30}}
+
+@pytest.fixture(autouse=True)
+def data_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+def test_stored_object_round_trips():
+    digest = store.put_object(RECORD)
+    assert digest == store.record_hash(RECORD)
+    assert store.get_object(digest) == RECORD
+    assert store.verify_objects([digest, digest]) == []
+
+def test_corrupted_object_is_rejected():
+    digest = store.put_object(RECORD)
+    with open(store.object_path(digest), "wb") as file:
+        file.write(store.canonical_json({**RECORD, "stats": {"FlatPhysicalDamageMod": 45}}))
+
+    cache = {}
+    assert store.get_object(digest, cache) is None
+    assert cache == {}
+    assert store.verify_objects([digest, store.record_hash({})]) == [digest, store.record_hash({})]
@@ -0,0 +1,48 @@
+# test_teamfight.py
+import teamfight
+from models import Champion
+
+RECORDS = {
+    "partype": "Mana",
+    "rangeidentity": ["Melee"],
+    "stats": {
+        "hp": 600, "hpperlevel": 100, "hpregen": 8, "hpregenperlevel": 0.8, "armor": 30, "armorperlevel": 4.5,
+        "spellblock": 30, "spellblockperlevel": 1.3, "attackspeedratio": 0.625, "attackspeed": 0.65,
+        "attackspeedperlevel": 2.5, "attackdamage": 60, "attackdamageperlevel": 3, "crit": 0, "mp": 300,
+        "mpperlevel": 40, "mpregen": 8, "mpregenperlevel": 0.8, "attackrange": 175, "movespeed": 340
+    }
+}
+
+def fighter(abilities=(), policy="first", attack_damage_bonus=0.0):
+    champion = Champion.from_json("Mirror", RECORDS)
+    champion.stats.attack_damage_bonus = attack_damage_bonus
+    return teamfight.Fighter(champion.set_level(9), list(abilities), policy)
+
+def test_mirror_duel_ends_in_a_draw():
+    result = teamfight.simulate([fighter(), fighter()])
+    assert result.winner is None
+    assert result.health == [0.0, 0.0]
+    assert result.damage_dealt[0] == result.damage_dealt[1] > 0
+
+def test_mirror_team_fight_ends_in_a_draw():
+    abilities = [teamfight.Ability(damage=80, cooldown=6), teamfight.Ability(damage=300, cooldown=60, ultimate=True)]
+    for policy in ("first", "lowest_health", "highest_damage"):
+        result = teamfight.simulate([fighter(abilities, policy) for _ in range(10)])
+        assert result.winner is None
+        assert result.health == [0.0] * 10
+
+def test_random_targets_finish_a_mirror_team_fight():
+    for seed in range(20):
+        result = teamfight.simulate([fighter(policy="random") for _ in range(10)], seed=seed)
+        assert result.duration < 60.0
+
+def test_stronger_team_wins():
+    result = teamfight.simulate([fighter(attack_damage_bonus=40)] + [fighter()])
+    assert result.winner == 0
+    assert result.health[0] > 0 and result.health[1] == 0.0
+
+def test_actions_on_a_target_killed_this_tick_are_dropped():
+    result = teamfight.simulate([fighter(), fighter(attack_damage_bonus=5000), fighter(attack_damage_bonus=5000)])
+    assert result.winner == 1
+    assert result.duration == 0.0
+    assert result.damage_dealt[1] > 0 and result.damage_dealt[2] == 0.0
@@ -1,20 +1,81 @@
 # utils.py
 import json
 import logging
+import os
+import sys
+import threading
 from typing import Any
 from urllib.parse import urlparse
 
 import requests
+import scheduler
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-def check_url(url: str) -> bool:
+class FrozenDict(dict):
+    """Immutable, hashable dictionary used to share repeated small JSON objects."""
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.items()))
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _immutable
+
+class JSONCompactor:
+    """
+    Interns keys and short strings, and shares repeated scalars and small structures while loading JSON.
+    Arrays become tuples and small objects with immutable values become shared `FrozenDict` instances.
+    """
+    SHARED_SIZE = 16
+    INTERN_LENGTH = 64
+    IMMUTABLE = (str, int, float, bool, type(None), tuple, FrozenDict)
+
+    def __init__(self):
+        self.shared: dict[tuple, Any] = {}
+
+    def share(self, value: tuple | FrozenDict, items: tuple) -> tuple | FrozenDict:
+        """Return the shared instance of a small structure whose items are all shared or immutable."""
+        if not all(isinstance(item, self.IMMUTABLE) for item in items):
+            return value
+
+        # Items are already shared instances, so identity distinguishes e.g. `1` from `1.0`
+        return self.shared.setdefault((type(value), *(id(item) for item in items)), value)
+
+    def value(self, value: Any) -> Any:
+        """Return the shared representation of a decoded value."""
+        if isinstance(value, str):
+            return sys.intern(value) if len(value) <= self.INTERN_LENGTH else value
+        if isinstance(value, (int, float)):
+            return self.shared.setdefault((type(value), value), value)
+        if isinstance(value, list):
+            value = tuple(self.value(item) for item in value)
+            return self.share(value, value) if len(value) <= self.SHARED_SIZE else value
+        return value
+
+    def object_pairs(self, pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+        """`object_pairs_hook` for `json.load`."""
+        pairs = [(sys.intern(key), self.value(value)) for key, value in pairs]
+        if len(pairs) > self.SHARED_SIZE or not all(isinstance(value, self.IMMUTABLE) for _, value in pairs):
+            return dict(pairs)
+
+        keys_and_values = tuple(item for pair in pairs for item in pair)
+        return self.share(FrozenDict(pairs), keys_and_values)
+
+def check_url(url: str, priority: str = "version") -> bool:
     """
     Validate that the URL is syntactically valid and returns a successful HTTP response.
 
     :param url: The URL to check.
     :type url: str
 
+    :param priority: Request priority class, see `constants.PRIORITIES` (defaults to `"version"`).
+    :type priority: str, optional
+
     :return: `True` if the URL is valid and returns a status code below `400`, otherwise `False`.
     :rtype: bool
     """
@@ -23,12 +84,12 @@ def check_url(url: str) -> bool:
         return False
     
     try:
-        response = requests.head(url, allow_redirects=True, timeout=10)
+        response = scheduler.request("HEAD", url, priority, allow_redirects=True, timeout=10)
         return response.status_code < 400
     except requests.RequestException:
         return False
 
-def fetch_json(url: str, value: Any = None) -> dict[str, Any] | Any:
+def fetch_json(url: str, value: Any = None, priority: str = "bulk") -> dict[str, Any] | Any:
     """
     Fetch JSON data from a URL.
     
@@ -37,12 +98,15 @@ def fetch_json(url: str, value: Any = None) -> dict[str, Any] | Any:
 
     :param value: A value to return if the `response` request is unsuccessful (defaults to `None`).
     :type value: Any, optional
+
+    :param priority: Request priority class, see `constants.PRIORITIES` (defaults to `"bulk"`).
+    :type priority: str, optional
     
     :return: JSON data if the `response` request is successful, otherwise `value`.
     :rtype: dict[str, Any] | Any
     """
     try:
-        response = requests.get(url, timeout=10)
+        response = scheduler.request("GET", url, priority, timeout=10)
         response.raise_for_status()
         return response.json()
     except (requests.exceptions.JSONDecodeError, ValueError):
@@ -52,7 +116,7 @@ def fetch_json(url: str, value: Any = None) -> dict[str, Any] | Any:
     
     return value
 
-def read_json(filename: str, value: Any = None) -> dict[str, Any] | Any:
+def read_json(filename: str, value: Any = None, compact: bool = False, compactor: JSONCompactor | None = None) -> dict[str, Any] | Any:
     """
     Read JSON data from a file.
 
@@ -62,6 +126,14 @@ def read_json(filename: str, value: Any = None) -> dict[str, Any] | Any:
     :param value: A value to return if unsuccessful (defaults to `None`).
     :type value: Any, optional
 
+    :param compact: Intern keys and share repeated values as immutable tuples and `FrozenDict` to
+        reduce memory; small objects and all arrays are then read-only (defaults to `False`).
+    :type compact: bool, optional
+
+    :param compactor: Compactor shared across files when `compact` is set, e.g. the records of a version
+        (defaults to a new one per file).
+    :type compactor: JSONCompactor | None, optional
+
     :return: JSON data if the successful, otherwise `value`.
     :rtype: dict[str, Any] | Any
     """
@@ -70,6 +142,8 @@ def read_json(filename: str, value: Any = None) -> dict[str, Any] | Any:
     
     try:
         with open(filename, "r", encoding="utf-8") as file:
+            if compact:
+                return json.load(file, object_pairs_hook=(compactor or JSONCompactor()).object_pairs)
             return json.load(file)
     except FileNotFoundError:
         logging.error(f"File not found: {filename}")
@@ -78,7 +152,7 @@ def read_json(filename: str, value: Any = None) -> dict[str, Any] | Any:
     
     return value
 
-def write_json(filename: str, data: dict[str, Any]) -> bool:
+def write_json(filename: str, data: dict[str, Any], atomic: bool = False) -> bool:
     """
     Write JSON data to a file.
     
@@ -88,18 +162,30 @@ def write_json(filename: str, data: dict[str, Any]) -> bool:
     :param data: JSON-compatible data to write.
     :type data: dict[str, Any]
 
+    :param atomic: Write to a temporary file, flush it to disk and rename it over `filename`, so the file is
+        either fully written or unchanged (defaults to `False`).
+    :type atomic: bool, optional
+
     :return: `True` if the operation was succesful, otherwise `False`.
     :rtype: bool
     """
     if not filename.endswith(".json"):
         filename += ".json"
     
+    path = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp" if atomic else filename
     try:
-        with open(filename, "w", encoding="utf-8") as file:
+        with open(path, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=4)
-            return True
+            if atomic:
+                file.flush()
+                os.fsync(file.fileno())
+        if atomic:
+            os.replace(path, filename)
+        return True
     except (OSError, TypeError) as e:
         logging.error(f"Failed to write {filename}: {e}")
+        if atomic and os.path.exists(path):
+            os.remove(path)
         return False
 
 def update_json_key(filename: str, data: dict[str, Any]) -> bool:
@@ -1,7 +1,13 @@
 # versions.py
 import logging
+import os
+import threading
+import time
+from typing import Any
+import manifest
+import store
 import utils
-from constants import LINKS, FILES
+from constants import LINKS, FILES, VERSION_CACHE_FILE, VERSION_CACHE_TTL
 
 """
 This modules provides utility functions for data processing.
@@ -33,7 +39,7 @@ def fetch_version() -> str | None:
     url = LINKS["realm_version"]
 
     try:
-        response = utils.fetch_json(url, {})
+        response = utils.fetch_json(url, {}, priority="version")
         return response.get("v")
     except Exception as e:
         logging.error(f"Error fetching version from {url}: {e}")
@@ -49,7 +55,7 @@ def fetch_versions() -> list[str] | None:
     url = LINKS["backup_versions"]
 
     try:
-        response = utils.fetch_json(url, [])
+        response = utils.fetch_json(url, [], priority="version")
         return response
     except Exception as e:
         logging.error(f"Error fetching versions from {url}: {e}")
@@ -77,21 +83,21 @@ def validate_version_urls(version: str) -> bool:
 
     return all(utils.check_url(url) for url in urls)
 
-def check_version() -> str | None:
+def resolve_version() -> str | None:
     """
-    Find the latest available game version for all data types.
+    Find the latest available game version for all data types from the network.
 
     :return: The latest available game version if successful, otherwise `None`.
     :rtype: str | None
     """
     latest_version = fetch_version()
-    
-    if validate_version_urls(latest_version):
+
+    if latest_version and validate_version_urls(latest_version):
         return latest_version
     
     logging.info(f"Latest game version {latest_version} not available for all data, rolling back now.")
 
-    version_list = fetch_versions()
+    version_list = fetch_versions() or []
     for version in version_list:
         if version == latest_version:
             continue
@@ -102,3 +108,130 @@ def check_version() -> str | None:
         logging.info(f"Game version {version} not available for all data, checking previous now.")
 
     return None # No valid version found
+
+def version_key(version: str) -> tuple[int, ...]:
+    """
+    Convert a game version into a sortable key.
+
+    :param version: The game version (e.g. `"14.23.1"`).
+    :type version: str
+
+    :return: The numeric parts of the version, or an empty tuple if the version is malformed.
+    :rtype: tuple[int, ...]
+    """
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except (AttributeError, ValueError):
+        return ()
+
+def find_local_version(directory: str = ".") -> str | None:
+    """
+    Find the newest game version with complete item and champion data on disk, according to its manifest.
+
+    :param directory: The directory to search (defaults to the working directory).
+    :type directory: str
+
+    :return: The newest locally complete game version if found, otherwise `None`.
+    :rtype: str | None
+    """
+    suffix = FILES["champ_data"].format("")
+
+    try:
+        candidates = {name[:-len(suffix)] for name in os.listdir(directory) if name.endswith(suffix)}
+    except OSError as e:
+        logging.error(f"Failed to list {directory}: {e}")
+        return None
+    candidates.update(store.list_versions("champ", directory))
+
+    for version in sorted(candidates, key=version_key, reverse=True):
+        if not version_key(version):
+            continue
+
+        if manifest.is_complete(version, ("item_data", "champ_data"), directory):
+            return version
+    
+    return None
+
+def read_version_cache(filename: str = VERSION_CACHE_FILE) -> dict[str, Any]:
+    """
+    Read the resolved version cache.
+
+    :param filename: The version cache file (defaults to `VERSION_CACHE_FILE`).
+    :type filename: str
+
+    :return: The cached version record, or an empty dictionary if missing or invalid.
+    :rtype: dict[str, Any]
+    """
+    if not os.path.isfile(filename):
+        return {}
+    
+    cache = utils.read_json(filename, {})
+    if not isinstance(cache, dict) or not cache.get("version") or not cache.get("valid"):
+        return {}
+    
+    return cache
+
+def refresh_version_cache(filename: str = VERSION_CACHE_FILE) -> str | None:
+    """
+    Resolve the game version from the network and persist it with its validation result.
+    The existing cache is left untouched if no valid version is found.
+
+    :param filename: The version cache file (defaults to `VERSION_CACHE_FILE`).
+    :type filename: str
+
+    :return: The resolved game version if successful, otherwise `None`.
+    :rtype: str | None
+    """
+    version = resolve_version()
+    if version is None:
+        logging.warning("Failed to resolve a valid game version, keeping cached version.")
+        return None
+    
+    # Atomic, since the refresh runs on a daemon thread that may be stopped at interpreter exit
+    utils.write_json(filename, {
+        "version": version,
+        "valid": True,
+        "checked": time.time()
+    }, atomic=True)
+    return version
+
+def check_version(offline: bool = False, ttl: float = VERSION_CACHE_TTL, filename: str = VERSION_CACHE_FILE) -> str | None:
+    """
+    Find the latest available game version for all data types.
+    
+    A fresh cached version is returned without touching the network. A stale cached version is
+    returned immediately while the cache is refreshed in a background thread. In offline mode the
+    newest complete local snapshot is used directly.
+
+    :param offline: Skip the network and use the newest complete local snapshot (defaults to `False`).
+    :type offline: bool
+
+    :param ttl: Seconds before a cached version is considered stale (defaults to `VERSION_CACHE_TTL`).
+    :type ttl: float
+
+    :param filename: The version cache file (defaults to `VERSION_CACHE_FILE`).
+    :type filename: str
+
+    :return: The latest available game version if successful, otherwise `None`.
+    :rtype: str | None
+    """
+    if offline:
+        version = find_local_version()
+        if version is None:
+            logging.error("Offline mode requested but no complete local data was found.")
+        return version
+
+    cache = read_version_cache(filename)
+    if cache:
+        age = time.time() - float(cache.get("checked", 0))
+        if age > ttl:
+            logging.info(f"Cached game version {cache['version']} is stale, refreshing in the background.")
+            threading.Thread(target=refresh_version_cache, args=(filename,), name="version-refresh", daemon=True).start()
+        return cache["version"]
+
+    version = refresh_version_cache(filename)
+    if version is None:
+        version = find_local_version()
+        logging.warning(f"Falling back to local game version {version}.")
+    
+    return version